@@ -0,0 +1,95 @@
+"""Local language detector(src.translate.lang_detect)와 기존 방식(한글 여부 + Google detect)의 정확도/latency 비교
+
+Usage (repo root에서 실행):
+    python -m benchmarks.bench_lang_detect            # local detector만
+    python -m benchmarks.bench_lang_detect --remote   # 기존 Google detect 방식도 측정(network 필요)
+"""
+import argparse
+import time
+from pathlib import Path
+
+from src.translate.lang_detect import lang_detector
+from src.translate.utils import isKoreanIncluded
+
+EVAL_FILE = Path("benchmarks/data/lang_detect_eval.tsv")
+
+
+def load_eval_set(file_path: Path = EVAL_FILE) -> list[tuple[str, str]]:
+    with open(file_path, "r", encoding="utf-8") as file:
+        return [tuple(line.rstrip("\n").split("\t", 1)) for line in file if line.strip()]
+
+
+def detect_with_google(text: str, char_num_to_check: int = 30) -> str:
+    """user-003 이전의 Translator.identify_lang 과 같은 방식"""
+    from googletrans import Translator as GoogleTrans
+
+    chars_prefix = text[:char_num_to_check]
+    if isKoreanIncluded(chars_prefix):
+        return "ko"
+    return GoogleTrans().detect(chars_prefix).lang
+
+
+def bench_local(eval_set: list[tuple[str, str]], repeat: int) -> None:
+    lang_detector.detect("warm up")  # n-gram 모델 lazy loading
+
+    min_confidence = lang_detector.config.min_confidence
+    n_correct, n_confident, n_confident_correct = 0, 0, 0
+    errors = []
+    for lang, text in eval_set:
+        result = lang_detector.detect(text)
+        n_correct += result.lang == lang
+        if result.confidence >= min_confidence:
+            n_confident += 1
+            n_confident_correct += result.lang == lang
+        if result.lang != lang:
+            errors.append((lang, result.lang, round(result.confidence, 2), text))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text in eval_set:
+            lang_detector.detect(text)
+    elapsed_us = (time.perf_counter() - start) / (repeat * len(eval_set)) * 1e6
+
+    print("[local detector]")
+    print(f"- accuracy             : {n_correct / len(eval_set):.3f} ({n_correct}/{len(eval_set)})")
+    print(
+        f"- confident(>={min_confidence}) rate : {n_confident / len(eval_set):.3f}, "
+        + f"accuracy: {n_confident_correct / max(n_confident, 1):.3f}"
+    )
+    print(f"- remote fallback rate : {1 - n_confident / len(eval_set):.3f}")
+    print(f"- latency              : {elapsed_us:.1f} us/call")
+    for error in errors:
+        print(f"  x expected={error[0]:<6} got={str(error[1]):<6} conf={error[2]:<5} {error[3]}")
+
+
+def bench_remote(eval_set: list[tuple[str, str]]) -> None:
+    n_correct, n_failed = 0, 0
+    latencies = []
+    for lang, text in eval_set:
+        start = time.perf_counter()
+        try:
+            detected = detect_with_google(text)
+        except Exception:
+            n_failed += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        # Google은 zh-CN/zh-TW, he를 각각 zh-CN, iw 등으로 리턴하기도 함
+        n_correct += detected.lower() == lang.lower() or (lang == "he" and detected == "iw")
+
+    print("[isKoreanIncluded + Google detect]")
+    print(f"- accuracy : {n_correct / len(eval_set):.3f} ({n_correct}/{len(eval_set)}), failed: {n_failed}")
+    if latencies:
+        latencies.sort()
+        print(f"- latency  : p50 {latencies[len(latencies) // 2] * 1e3:.1f} ms, max {latencies[-1] * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--remote", action="store_true", help="Google detect 방식도 측정(network 필요)")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    eval_set = load_eval_set()
+    bench_local(eval_set, repeat=args.repeat)
+    if args.remote:
+        bench_remote(eval_set)
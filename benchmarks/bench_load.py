@@ -0,0 +1,205 @@
+"""/translate 부하 테스트. concurrency 단계마다 처리량(req/s)과 latency p50/p95/p99를 측정
+요청 경로(admission, cache, rate limit, fallback 등)의 성능이 나빠졌는지 offline으로 확인하기 위함
+
+- --spawn: mock upstream(benchmarks.mock_upstream)과 API server를 subprocess로 띄우고, API server가 mock으로 요청하도록 함
+    번역 결과 저장소는 임시 파일을 쓰고, 나머지 설정은 기본값 그대로 사용(실제 server와 같은 요청 경로를 측정)
+    API key당 rate limit, remote 언어 감지(Google detect)를 빼고 측정하려면 --no-ratelimit, --no-remote-detect
+- 이미 떠 있는 server를 측정하려면 --url 만 줌
+- 요청마다 text 끝에 번호를 붙여 cache에 없는 text로 만듦. --cache-hit-ratio 비율만큼은 같은 text를 보냄
+
+Usage (repo root에서 실행):
+    python -m benchmarks.bench_load --spawn --backend papago --concurrency 1,8,32,64 --duration 10
+    python -m benchmarks.bench_load --spawn --mock-args="--latency-ms 200 --error-rate 0.05" --json result.json
+    python -m benchmarks.bench_load --spawn --no-ratelimit --no-remote-detect --concurrency 64,128
+"""
+import argparse
+import asyncio
+import math
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import httpx
+import orjson
+
+SAMPLE_TEXT = (
+    "Attention is all you need. The dominant sequence transduction models are based on complex recurrent "
+    "or convolutional neural networks that include an encoder and a decoder."
+)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """nearest-rank percentile. sorted_values는 오름차순 정렬된 값"""
+    if not sorted_values:
+        return float("nan")
+    # rank = ceil(q * n). 0.1 * 30 = 3.0000000000000004 같은 부동소수점 오차로 한 칸 밀리지 않도록 반올림 후 올림
+    idx = min(max(math.ceil(round(q * len(sorted_values), 9)) - 1, 0), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+def build_body(backend: str, src_text: str) -> dict:
+    client_info = {"translator_type": backend, "api_key": "bench-key", "secret_key": "bench-secret"}
+    user_option = {"main_tgt_lang": "ko", "sub_tgt_lang": "en", "translator_client_info": client_info}
+    if backend == "auto":
+        user_option["translator_client_infos"] = [
+            {"translator_type": translator_type, "api_key": "bench-key", "secret_key": "bench-secret"}
+            for translator_type in ("papago", "deepl")
+        ]
+    return {"translate_request": {"src_text": src_text}, "user_option": user_option}
+
+
+async def run_level(
+    client: httpx.AsyncClient, args: argparse.Namespace, concurrency: int, counter: Iterator[int]
+) -> dict:
+    """concurrency개의 worker가 duration(초) 동안 쉬지 않고 요청(closed loop)"""
+    latencies: list[float] = []
+    # JSON으로 저장할 수 있도록 str key. "0"은 timeout, 연결 실패 등, "200_failed"는 200이지만 번역문이 없는 응답
+    status_codes: dict[str, int] = {}
+    deadline = time.perf_counter() + args.duration
+
+    async def _worker():
+        while time.perf_counter() < deadline:
+            seq = next(counter)
+            # seq마다 cache_hit_ratio씩 쌓아서 1을 넘을 때 같은 text를 보냄(hit 요청이 고르게 섞이도록)
+            if int((seq + 1) * args.cache_hit_ratio) > int(seq * args.cache_hit_ratio):
+                src_text = SAMPLE_TEXT
+            else:
+                src_text = f"{SAMPLE_TEXT} ({seq})"
+            start = time.perf_counter()
+            try:
+                response = await client.post("/translate", json=build_body(args.backend, src_text))
+                status_code = str(response.status_code)
+                if status_code == "200" and response.json().get("text") is None:  # fallback 없이 실패한 경우
+                    status_code = "200_failed"
+            except Exception:
+                status_code = "0"
+            latencies.append(time.perf_counter() - start)
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": sum(count for status_code, count in status_codes.items() if status_code != "200"),
+        "status_codes": status_codes,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else float("nan"),
+    }
+
+
+async def wait_ready(url: str, path: str = "/health", timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(path)
+                return
+            except Exception:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} is not ready in {timeout}s")
+
+
+@contextmanager
+def spawn_servers(args: argparse.Namespace) -> Iterator[str]:
+    """mock upstream과 API server를 띄우고 API server 주소를 리턴. 끝나면 둘 다 종료"""
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    api_url = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = {
+            **os.environ,
+            "SPOT_UPSTREAM_PAPAGO_URL": f"{mock_url}/v1/papago/n2mt",
+            "SPOT_UPSTREAM_DEEPL_URL": f"{mock_url}/v2/translate",
+            "SPOT_UPSTREAM_DEEPL_GLOSSARY_URL": f"{mock_url}/v2/glossaries",
+            "SPOT_UPSTREAM_GOOGLE_URL": f"{mock_url}/language/translate/v2",
+            "SPOT_STORE_PATH": os.path.join(tmp_dir, "translation_memory.sqlite3"),
+            "SPOT_LOG_LEVEL": "CRITICAL",
+            "SPOT_LOG_FILENAME": os.path.join(tmp_dir, "log"),
+        }
+        if args.no_ratelimit:
+            env["SPOT_RATELIMIT_ENABLED"] = "false"
+        if args.no_remote_detect:
+            env["SPOT_LANG_DETECT_REMOTE_FALLBACK"] = "false"
+        mock_cmd = [sys.executable, "-m", "benchmarks.mock_upstream", "--port", str(args.mock_port)]
+        api_cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"]
+        processes = [
+            subprocess.Popen(mock_cmd + shlex.split(args.mock_args), env=env),
+            subprocess.Popen(api_cmd, env=env),
+        ]
+        try:
+            asyncio.run(wait_ready(mock_url, "/_mock/stats"))
+            yield api_url
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+
+
+async def main(args: argparse.Namespace, url: str):
+    await wait_ready(url)
+    counter = iter(range(sys.maxsize))
+    timeout = httpx.Timeout(args.timeout)
+    results = []
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+        if args.warmup > 0:
+            await run_level(client, argparse.Namespace(**{**vars(args), "duration": args.warmup}), 1, counter)
+
+        print(
+            f"backend={args.backend} duration={args.duration}s cache_hit_ratio={args.cache_hit_ratio} "
+            f"no_ratelimit={args.no_ratelimit} no_remote_detect={args.no_remote_detect}"
+        )
+        print(f"{'conc':>5} {'reqs':>7} {'errors':>7} {'req/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+        for concurrency in args.concurrency:
+            result = await run_level(client, args, concurrency, counter)
+            results.append(result)
+            print(
+                f"{concurrency:>5} {result['requests']:>7} {result['errors']:>7} {result['rps']:>9.1f} "
+                f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+            )
+            if result["errors"]:
+                print(f"      status codes: {result['status_codes']}")
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="측정할 API server(--spawn이면 무시)")
+    parser.add_argument("--spawn", action="store_true", help="mock upstream과 API server를 띄워서 측정")
+    parser.add_argument("--port", type=int, default=8000, help="--spawn일 때 API server port")
+    parser.add_argument("--mock-port", type=int, default=8001, help="--spawn일 때 mock upstream port")
+    parser.add_argument("--mock-args", default="", help="--spawn일 때 mock upstream에 넘길 option")
+    parser.add_argument("--no-ratelimit", action="store_true", help="--spawn일 때 API key당 rate limit을 끔")
+    parser.add_argument("--no-remote-detect", action="store_true", help="--spawn일 때 remote 언어 감지를 끔")
+    parser.add_argument("--backend", default="papago", choices=["papago", "deepl", "google", "auto"])
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(",")], default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="concurrency 단계마다 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 warm-up 시간(초)")
+    parser.add_argument("--cache-hit-ratio", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 1건의 timeout(초)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 파일")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.spawn:
+        with spawn_servers(args) as url:
+            results = asyncio.run(main(args, url))
+    else:
+        results = asyncio.run(main(args, args.url))
+
+    if args.json:
+        with open(args.json, "wb") as file:
+            file.write(orjson.dumps({"args": vars(args), "results": results}, option=orjson.OPT_INDENT_2))
@@ -0,0 +1,100 @@
+"""backend 요청마다 남기던 debug/error log의 비용 microbenchmark
+- 기존: logger.debug(gen_log_text(data)), logger.error(gen_log_text(response.__dict__))
+    (varname.argname으로 호출한 곳의 frame/bytecode를 살펴보고, level과 관계없이 문자열을 만듦)
+- 변경: log_fields(level, message, **fields)
+    (level이 꺼져 있으면 바로 리턴. 문자열은 formatter에서 만듦)
+
+varname은 더 이상 의존성이 아니므로, 설치되어 있을 때만 기존 방식과 비교함
+
+Usage (repo root에서 실행):
+    python -m benchmarks.bench_logging [--number 20000]
+"""
+import argparse
+import logging
+import timeit
+
+from src.common.base import log_fields, logger
+
+
+def legacy_gen_log_text(*vars, title=None):
+    """src.common.base.gen_log_text (제거됨)"""
+    from varname import argname
+
+    try:
+        var_names = argname(vars)  # varname 0.6.x
+    except TypeError:
+        var_names = argname("*vars")  # varname 0.8 이상
+
+    name_space = 10
+    value_space = 50
+
+    text = f"<{title}>\n" if title is not None else ""
+    for idx, var_tuple in enumerate(zip(var_names, vars)):
+        if isinstance(var_tuple[1], str):
+            text += (
+                f"{var_tuple[0]:<{name_space}}: {var_tuple[1]:<{value_space}}"
+                if idx == 0
+                else f" \n>> {var_tuple[0]:<{name_space}}: {var_tuple[1]:<{value_space}}"
+            )
+        else:
+            text += (
+                f"{var_tuple[0]:<{name_space}}: {var_tuple[1]}"
+                if idx == 0
+                else f" \n>> {var_tuple[0]:<{name_space}}: {var_tuple[1]}"
+            )
+    return f"{text}"
+
+
+class FakeResponse:
+    """httpx.Response의 __dict__ 크기와 비슷한 객체"""
+
+    def __init__(self):
+        self.status_code = 429
+        self.text = '{"errorMessage": "Rate limit exceeded.", "errorCode": "010"}'
+        self.headers = {"content-type": "application/json", "retry-after": "1", "x-request-id": "a" * 32}
+        self.request = {"method": "POST", "url": "https://openapi.naver.com/v1/papago/n2mt"}
+        self.http_version = "HTTP/1.1"
+        self.reason_phrase = "Too Many Requests"
+        self.elapsed = 0.123
+
+
+def legacy_request(data: dict, response: FakeResponse):
+    logger.debug(legacy_gen_log_text(data))
+    logger.error(legacy_gen_log_text(response.__dict__))
+
+
+def new_request(data: dict, response: FakeResponse):
+    log_fields(logging.DEBUG, "Papago API request", **data)
+    log_fields(logging.ERROR, "Papago API error", status_code=response.status_code, body=response.text)
+
+
+def bench(func, number: int) -> float:
+    """요청(debug 1번 + error 1번) 1개당 평균 시간(us)"""
+    data = {"text": "Attention is all you need. " * 4, "source": "en", "target": "ko"}
+    response = FakeResponse()
+    return timeit.timeit(lambda: func(data, response), number=number) / number * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    try:
+        import varname  # noqa: F401
+
+        funcs = [("gen_log_text", legacy_request), ("log_fields  ", new_request)]
+    except ImportError:
+        print("varname is not installed. Measure log_fields only")
+        funcs = [("log_fields  ", new_request)]
+
+    # 출력 비용(handler)은 빼고 log를 만드는 비용만 비교
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.NullHandler())
+
+    for level_name, level in [("DEBUG, ERROR enabled", logging.DEBUG), ("all disabled(CRITICAL)", logging.CRITICAL)]:
+        logger.setLevel(level)
+        print(f"[{level_name}]")
+        for label, func in funcs:
+            print(f"- {label}: {bench(func, args.number):8.2f} us/request")
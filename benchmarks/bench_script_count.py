@@ -0,0 +1,77 @@
+"""문자 체계 판별(src.translate.utils) microbenchmark
+- 기존 isKoreanIncluded(글자마다 int("0x...", 16) 10번 호출)와 regex 기반 isKoreanIncluded
+- 글자마다 bisect로 범위를 찾던 count_scripts와 table + str.translate 기반 count_scripts
+
+Usage (repo root에서 실행):
+    python -m benchmarks.bench_script_count [--number 2000]
+"""
+import argparse
+import timeit
+from bisect import bisect_right
+from collections import Counter
+
+from benchmarks.bench_lang_detect import load_eval_set
+from src.translate.utils import SCRIPT_RANGES, count_scripts, isKoreanIncluded
+
+_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+
+def legacy_is_korean_included(text):
+    for i in text:
+        if (
+            ord(i) > int("0x1100", 16)
+            and ord(i) < int("0x11ff", 16)
+            or ord(i) > int("0x3131", 16)
+            and ord(i) < int("0x318e", 16)
+            or ord(i) > int("0xa960", 16)
+            and ord(i) < int("0xa97c", 16)
+            or ord(i) > int("0xac00", 16)
+            and ord(i) < int("0xd7a3", 16)
+            or ord(i) > int("0xd7b0", 16)
+            and ord(i) < int("0xd7fb", 16)
+        ):
+            return True
+    return False
+
+
+def legacy_count_scripts(text: str) -> Counter:
+    counts = Counter()
+    for char in text:
+        code_point = ord(char)
+        idx = bisect_right(_RANGE_STARTS, code_point) - 1
+        if idx >= 0 and code_point <= SCRIPT_RANGES[idx][1]:
+            counts[SCRIPT_RANGES[idx][2]] += 1
+    return counts
+
+
+def make_inputs() -> dict[str, list[str]]:
+    eval_texts = [text for _, text in load_eval_set()]
+    return {
+        "eval set prefix(30)": [text[:30] for text in eval_texts],
+        "eval set prefix(60)": [text[:60] for text in eval_texts],
+        "English paragraph(2k)": [" ".join(text for lang, text in load_eval_set() if lang == "en")[:2000]],
+        "Korean paragraph(2k)": [" ".join(text for lang, text in load_eval_set() if lang == "ko")[:2000]],
+    }
+
+
+def bench(func, texts: list[str], number: int) -> float:
+    """text 1개당 평균 시간(us)"""
+    return timeit.timeit(lambda: [func(text) for text in texts], number=number) / (number * len(texts)) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, texts in make_inputs().items():
+        for text in texts:
+            assert legacy_count_scripts(text) == count_scripts(text), text
+        number = max(args.number // max(sum(map(len, texts)) // 1000, 1), 10)
+        print(f"[{name}] {len(texts)} texts")
+        for label, legacy_func, new_func in [
+            ("isKoreanIncluded", legacy_is_korean_included, isKoreanIncluded),
+            ("count_scripts   ", legacy_count_scripts, count_scripts),
+        ]:
+            legacy_us, new_us = bench(legacy_func, texts, number), bench(new_func, texts, number)
+            print(f"- {label}: {legacy_us:8.2f} us -> {new_us:7.2f} us (x{legacy_us / new_us:.1f})")
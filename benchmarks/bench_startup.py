@@ -0,0 +1,84 @@
+"""worker 시작 시간 측정. 새 python process에서 매번 측정(import cache가 없는 상태)
+- import: `import main` 에 걸린 시간. fastapi, httpx 등 외부 package는 미리 import 해두고 이 repo의 module만 측정
+    (외부 package의 import 시간은 변경과 관계없이 크고 편차도 커서 비교를 어렵게 함)
+- first request: import 뒤 첫 번역 요청이 쓰는 data(지원 언어 표, base 용어집, 언어 감지 모델)를 처음 불러오는 시간
+- googletrans: 첫 요청까지 googletrans가 import 되었는지(Google API를 쓰지 않으면 import 하지 않아야 함)
+
+data snapshot(src.translate.snapshot)이 있을 때와 없을 때(SPOT_SNAPSHOT_ENABLED=false)를 비교함
+
+Usage (repo root에서 실행):
+    python -m src.translate.snapshot build
+    python -m benchmarks.bench_startup [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+import orjson
+
+MEASURE_CODE = """
+import sys, time
+import orjson
+import fastapi, fastapi.responses, httpx, starlette.middleware.base, uvicorn  # noqa: F401
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+from src.common.models import TranslatorType
+from src.translate.glossary import glossary_registry
+from src.translate.lang_detect import lang_detector
+from src.translate.lang_index import lang_index
+
+lang_index.supports(TranslatorType.papago, "en", "ko")
+glossary_registry.get()
+lang_detector.detect("Attention is all you need")
+ready = time.perf_counter()
+print(orjson.dumps({
+    "import": imported - start,
+    "first_request": ready - imported,
+    "googletrans": "googletrans" in sys.modules,
+}).decode())
+"""
+
+
+def run_once(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE_CODE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return orjson.loads(output.strip().splitlines()[-1])
+
+
+def summarize(results: list[dict]) -> dict:
+    return {
+        "import_ms": statistics.median(result["import"] for result in results) * 1000,
+        "first_request_ms": statistics.median(result["first_request"] for result in results) * 1000,
+        "googletrans_imported": any(result["googletrans"] for result in results),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    base_env = {**os.environ, "SPOT_LOG_LEVEL": "WARNING"}
+    modes = {
+        "snapshot": base_env,
+        "data files": {**base_env, "SPOT_SNAPSHOT_ENABLED": "false"},
+    }
+    # 시스템 부하 변화가 한쪽에만 반영되지 않도록 두 방식을 번갈아 실행
+    results: dict[str, list[dict]] = {label: [] for label in modes}
+    for _ in range(args.runs):
+        for label, env in modes.items():
+            results[label].append(run_once(env))
+
+    print(f"median of {args.runs} runs")
+    for label in modes:
+        result = summarize(results[label])
+        print(
+            f"- {label:<10}: import {result['import_ms']:6.1f}ms, first request {result['first_request_ms']:6.1f}ms, "
+            f"total {result['import_ms'] + result['first_request_ms']:6.1f}ms "
+            f"(googletrans imported: {result['googletrans_imported']})"
+        )
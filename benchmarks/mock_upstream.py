@@ -0,0 +1,223 @@
+"""부하 테스트용 가짜 backend API server. 실제 API의 quota를 쓰지 않고 offline으로 요청 경로를 측정하기 위함
+- Papago n2mt: POST /v1/papago/n2mt (form data)
+- DeepL v2: POST /v2/translate (JSON, text 배열), GET/POST /v2/glossaries, DELETE /v2/glossaries/{glossary_id}
+- Google(googletrans 대신): POST /language/translate/v2 (Cloud Translation v2 basic 형식)
+번역 결과는 "[<target>] <원문>" 이므로 glossary placeholder도 그대로 돌아옴
+
+응답 latency 분포, 5xx 오류 비율, 429(rate limit), quota 초과(DeepL 456, Papago 429 + errorCode 010) 비율을 설정할 수 있음
+설정은 `SPOT_MOCK_<FIELD>` 환경변수 또는 아래 command line option으로 줌
+
+Usage (repo root에서 실행):
+    python -m benchmarks.mock_upstream --port 8001 --latency-ms 80 --error-rate 0.01 --rate-limit-rate 0.02
+
+    # API server가 mock server로 요청하도록 주소를 바꿔서 실행
+    SPOT_UPSTREAM_PAPAGO_URL=http://127.0.0.1:8001/v1/papago/n2mt \\
+    SPOT_UPSTREAM_DEEPL_URL=http://127.0.0.1:8001/v2/translate \\
+    SPOT_UPSTREAM_DEEPL_GLOSSARY_URL=http://127.0.0.1:8001/v2/glossaries \\
+    SPOT_UPSTREAM_GOOGLE_URL=http://127.0.0.1:8001/language/translate/v2 \\
+    uvicorn main:app --port 8000
+"""
+import argparse
+import asyncio
+import os
+import random
+import uuid
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from src.common.config import load_config
+
+
+@dataclass
+class MockUpstreamConfig:
+    """- latency_dist: "lognormal"(latency_ms가 중앙값, latency_sigma가 퍼짐 정도), "uniform"(0 ~ 2 x latency_ms), "fixed"
+    - latency_per_char_ms: 글자 수에 비례해서 더하는 latency
+    - error_rate, rate_limit_rate, quota_rate: 요청 중 5xx, 429, quota 초과로 응답하는 비율(0~1)
+    - seed: 같은 순서의 요청에 같은 latency/오류가 나오도록 고정할 때 사용
+    """
+
+    latency_dist: str = "lognormal"
+    latency_ms: float = 80.0
+    latency_sigma: float = 0.5
+    latency_per_char_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    quota_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+config = load_config(MockUpstreamConfig, "mock")
+rng = random.Random(config.seed)
+app = FastAPI(title="Spot Translator mock upstream")
+
+n_requests: dict[str, int] = {}
+glossaries: dict[str, dict] = {}  # glossary_id -> glossary 정보. API key 구분 없이 하나의 계정처럼 저장
+
+
+def sample_latency(n_chars: int) -> float:
+    """응답 전에 기다릴 시간(초)"""
+    if config.latency_dist == "fixed":
+        latency_ms = config.latency_ms
+    elif config.latency_dist == "uniform":
+        latency_ms = rng.uniform(0, 2 * config.latency_ms)
+    else:
+        latency_ms = config.latency_ms * rng.lognormvariate(0, config.latency_sigma)
+    return (latency_ms + config.latency_per_char_ms * n_chars) / 1000
+
+
+def sample_error() -> Optional[str]:
+    """이번 요청에 넣을 오류. None, "error", "rate_limit", "quota" 중 하나"""
+    value = rng.random()
+    for error, rate in (
+        ("error", config.error_rate),
+        ("rate_limit", config.rate_limit_rate),
+        ("quota", config.quota_rate),
+    ):
+        if value < rate:
+            return error
+        value -= rate
+    return None
+
+
+async def simulate(backend: str, n_chars: int) -> Optional[str]:
+    n_requests[backend] = n_requests.get(backend, 0) + 1
+    await asyncio.sleep(sample_latency(n_chars))
+    return sample_error()
+
+
+def fake_translate(text: str, tgt_lang: str) -> str:
+    return f"[{tgt_lang}] {text}"
+
+
+@app.post("/v1/papago/n2mt")
+async def papago_n2mt(request: Request):
+    if not request.headers.get("X-Naver-Client-Id") or not request.headers.get("X-Naver-Client-Secret"):
+        return JSONResponse({"errorMessage": "Authentication failed", "errorCode": "024"}, status_code=401)
+
+    # python-multipart 없이 파싱(application/x-www-form-urlencoded)
+    form = {key: values[0] for key, values in parse_qs((await request.body()).decode("utf-8")).items()}
+    text = form.get("text", "")
+    error = await simulate("papago", len(text))
+    if error == "error":
+        return JSONResponse({"errorMessage": "Internal server errors", "errorCode": "N2MT99"}, status_code=500)
+    if error == "rate_limit":
+        return JSONResponse({"errorMessage": "Rate limit exceeded.", "errorCode": "012"}, status_code=429)
+    if error == "quota":
+        return JSONResponse({"errorMessage": "Quota Exceeded", "errorCode": "010"}, status_code=429)
+
+    result = {"srcLangType": form.get("source"), "tarLangType": form.get("target")}
+    result["translatedText"] = fake_translate(text, form.get("target", ""))
+    return {"message": {"@type": "response", "result": result}}
+
+
+def _deepl_error(error: Optional[str]) -> Optional[JSONResponse]:
+    if error == "error":
+        return JSONResponse({"message": "Internal error"}, status_code=500)
+    if error == "rate_limit":
+        return JSONResponse({"message": "Too many requests"}, status_code=429, headers={"Retry-After": "1"})
+    if error == "quota":
+        return JSONResponse({"message": "Quota exceeded"}, status_code=456)
+    return None
+
+
+@app.post("/v2/translate")
+async def deepl_translate(request: Request):
+    if not request.headers.get("Authorization", "").startswith("DeepL-Auth-Key "):
+        return JSONResponse({"message": "Wrong endpoint or authentication"}, status_code=403)
+
+    data = await request.json()
+    texts = data.get("text", [])
+    error_response = _deepl_error(await simulate("deepl", sum(len(text) for text in texts)))
+    if error_response is not None:
+        return error_response
+
+    if data.get("glossary_id") is not None and data["glossary_id"] not in glossaries:
+        return JSONResponse({"message": "Glossary not found"}, status_code=404)
+
+    source_lang = (data.get("source_lang") or "EN").upper()
+    translations = [
+        {"detected_source_language": source_lang, "text": fake_translate(text, data.get("target_lang", ""))}
+        for text in texts
+    ]
+    return {"translations": translations}
+
+
+@app.post("/v2/glossaries", status_code=201)
+async def deepl_create_glossary(request: Request):
+    data = await request.json()
+    error_response = _deepl_error(await simulate("deepl_glossary", 0))
+    if error_response is not None:
+        return error_response
+
+    entry_count = len([line for line in data.get("entries", "").split("\n") if line])
+    glossary = {
+        "glossary_id": str(uuid.uuid4()),
+        "name": data.get("name"),
+        "ready": True,
+        "source_lang": data.get("source_lang"),
+        "target_lang": data.get("target_lang"),
+        "creation_time": datetime.now(timezone.utc).isoformat(),
+        "entry_count": entry_count,
+    }
+    glossaries[glossary["glossary_id"]] = glossary
+    return glossary
+
+
+@app.get("/v2/glossaries")
+async def deepl_list_glossaries():
+    error_response = _deepl_error(await simulate("deepl_glossary", 0))
+    if error_response is not None:
+        return error_response
+    return {"glossaries": list(glossaries.values())}
+
+
+@app.delete("/v2/glossaries/{glossary_id}", status_code=204)
+async def deepl_delete_glossary(glossary_id: str):
+    if glossaries.pop(glossary_id, None) is None:
+        return JSONResponse({"message": "Not found"}, status_code=404)
+    return Response(status_code=204)
+
+
+@app.post("/language/translate/v2")
+async def google_translate(request: Request):
+    data = await request.json()
+    texts = data.get("q", [])
+    texts = [texts] if isinstance(texts, str) else texts
+    error = await simulate("google", sum(len(text) for text in texts))
+    if error is not None:
+        status_code = 500 if error == "error" else 429  # Google은 rate limit과 quota 모두 429
+        return JSONResponse({"error": {"code": status_code, "message": error}}, status_code=status_code)
+
+    translations = [{"translatedText": fake_translate(text, data.get("target", ""))} for text in texts]
+    return {"data": {"translations": translations}}
+
+
+@app.get("/_mock/stats")
+async def stats():
+    return {"config": config.__dict__, "requests": dict(n_requests), "glossaries": len(glossaries)}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    for f in fields(MockUpstreamConfig):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", help=f"SPOT_MOCK_{f.name.upper()}")
+    args = parser.parse_args()
+
+    # option은 환경변수와 같은 방식으로 변환되도록 환경변수로 넣고 다시 읽음
+    for f in fields(MockUpstreamConfig):
+        value = getattr(args, f.name)
+        if value is not None:
+            os.environ[f"SPOT_MOCK_{f.name.upper()}"] = value
+    config.__dict__.update(vars(load_config(MockUpstreamConfig, "mock")))
+    rng.seed(config.seed)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,134 @@
+# tests에서 repository root 기준으로 `src.` package를 import 할 수 있도록 pytest가 이 경로를 sys.path에 추가함
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+
+class FakeResponse:
+    """backend API의 httpx.Response 대신 사용"""
+
+    def __init__(self, status_code: int, data: dict = None):
+        self.status_code = status_code
+        self.data = data or {}
+        self.headers = {}
+        self.text = str(self.data)
+
+    def json(self):
+        return self.data
+
+
+class FakeUpstreamClient:
+    """받은 text를 줄마다 대문자로 바꿔서 번역하는 backend API. 요청 형식을 보고 Papago/Google/DeepL 형식으로 응답
+    - status_code: 200이 아니면 번역하지 않고 이 status code로 응답
+    - drop_lines: 다음 요청 하나의 줄바꿈을 없애서 줄 수가 달라지게 함
+    - delay: 응답 전에 기다리는 시간(초)
+    """
+
+    def __init__(self):
+        self.requests: list[str] = []
+        self.status_code = 200
+        self.drop_lines = False
+        self.delay = 0.0
+
+    def translate(self, text: str) -> str:
+        translated = text.upper()
+        if self.drop_lines:
+            self.drop_lines = False
+            translated = translated.replace("\n", " ")
+        return translated
+
+    async def request(self, method, url, data=None, json=None, **kwargs):
+        texts = [data["text"]] if data is not None else [json["q"]] if "q" in json else json["text"]
+        self.requests.extend(texts)
+        await asyncio.sleep(self.delay)
+        if self.status_code != 200:
+            return FakeResponse(self.status_code, {"message": "Fake upstream error"})
+
+        translated_texts = [self.translate(text) for text in texts]
+        if data is not None:  # Papago
+            return FakeResponse(200, {"message": {"result": {"translatedText": translated_texts[0]}}})
+        if "q" in json:  # Google(Cloud Translation v2 basic 형식)
+            return FakeResponse(200, {"data": {"translations": [{"translatedText": translated_texts[0]}]}})
+        return FakeResponse(200, {"translations": [{"text": text} for text in translated_texts]})  # DeepL
+
+
+class FakeDeepLClient:
+    """API key 하나의 DeepL 계정처럼 glossary를 저장. 없는 glossary_id로 번역하면 404"""
+
+    def __init__(self):
+        self.glossaries: dict[str, dict] = {}
+        self.n_created = 0
+        self.translate_requests: list[dict] = []
+        self.deleted: list[str] = []
+        self.delete_started = asyncio.Event()
+        self.allow_delete = asyncio.Event()
+        self.allow_delete.set()
+
+    async def request(self, method, url, json=None, **kwargs):
+        if url.endswith("/glossaries") and method == "GET":
+            return FakeResponse(200, {"glossaries": list(self.glossaries.values())})
+        if url.endswith("/glossaries") and method == "POST":
+            self.n_created += 1
+            glossary_id = f"glossary-{self.n_created}"
+            self.glossaries[glossary_id] = {
+                "glossary_id": glossary_id,
+                "name": json["name"],
+                "source_lang": json["source_lang"],
+                "target_lang": json["target_lang"],
+                "creation_time": str(self.n_created),
+            }
+            return FakeResponse(201, {"glossary_id": glossary_id})
+        if method == "DELETE":
+            self.delete_started.set()
+            await self.allow_delete.wait()
+            glossary_id = url.rsplit("/", 1)[1]
+            self.deleted.append(glossary_id)
+            return FakeResponse(204 if self.glossaries.pop(glossary_id, None) else 404)
+
+        self.translate_requests.append(json)
+        if json.get("glossary_id") is not None and json["glossary_id"] not in self.glossaries:
+            return FakeResponse(404, {"message": "Glossary not found"})
+        return FakeResponse(200, {"translations": [{"text": text.upper()} for text in json["text"]]})
+
+
+@pytest.fixture
+def upstream_clients(monkeypatch) -> defaultdict[str, FakeUpstreamClient]:
+    """backend(SERVICE_NAME)별 FakeUpstreamClient. 처음 사용할 때 만들어짐
+    Google도 googletrans 대신 REQUEST_URL(http)로 보내서 FakeUpstreamClient를 사용
+    """
+    from src.translate.client import http_clients
+    from src.translate.translator import GoogleTranslator
+
+    clients = defaultdict(FakeUpstreamClient)
+    monkeypatch.setattr(http_clients, "get", lambda service_name: clients[service_name])
+    monkeypatch.setattr(GoogleTranslator, "REQUEST_URL", "http://google.test")
+    return clients
+
+
+@pytest.fixture
+def deepl_client(monkeypatch) -> FakeDeepLClient:
+    from src.translate.client import http_clients
+    from src.translate.translator import DeepLTranslator
+
+    client = FakeDeepLClient()
+    monkeypatch.setattr(http_clients, "get", lambda service_name: client)
+    monkeypatch.setattr(DeepLTranslator, "_native_glossaries", DeepLTranslator._native_glossaries.__class__())
+    return client
+
+
+@pytest.fixture
+def api(upstream_clients, monkeypatch):
+    """upstream_clients로 번역하는 main.app
+    언어 감지는 항상 "en"이고, 이전 test의 translation cache와 circuit breaker는 비운 상태로 시작
+    """
+    import main
+    from src.translate.breaker import circuit_breakers
+    from src.translate.cache import translation_cache
+    from src.translate.translator import Translator
+
+    monkeypatch.setattr(Translator, "identify_lang", staticmethod(lambda *args, **kwargs: asyncio.sleep(0, "en")))
+    monkeypatch.setattr(circuit_breakers, "_breakers", circuit_breakers._breakers.__class__())
+    translation_cache.clear()
+    yield main.app
+    translation_cache.clear()
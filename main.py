@@ -1,67 +1,249 @@
-from pathlib import Path
+import time
+from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI
+import orjson
+from fastapi import Depends, FastAPI, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-from src.common.base import logger
-from src.common.models import TranslateRequest, TranslatorType, UserOption
-from src.common.utils import load_obj
-from src.translate.translator import DeepLTranslator, GoogleTranslator, PapagoTranslator
+from src.common.admission import AdmissionRejected, admission_controller
+from src.common.base import log_stats, logger
+from src.common.metrics import (
+    FALLBACKS,
+    REQUEST_SECONDS,
+    format_server_timing,
+    metrics_registry,
+    start_request_timing,
+    timed_stage,
+)
+from src.common.models import BatchTranslateRequest, TranslateRequest, TranslatorType, UserOption
+from src.translate.breaker import circuit_breakers
+from src.translate.cache import translation_cache
+from src.translate.client import http_clients
+from src.translate.executor import google_executor
+from src.translate.fallback import fallback_policy
+from src.translate.glossary import glossary_registry
+from src.translate.limiter import rate_limiters, start_request_group
+from src.translate.router import backend_router
+from src.translate.session import TranslationSession, WebSocketSession
+from src.translate.singleflight import translation_flights
+from src.translate.snapshot import data_snapshot
+from src.translate.store import translation_store
+from src.translate.stream import STREAM_MEDIA_TYPES, StreamFormat, format_event, iter_translation_events
+from src.translate.translator import GoogleTranslator
 
-app = FastAPI(title="Spot Translator API", version="1.0")
 
-TERM_EN_DIR = Path("data/term_set")
-BASE_TERM_EN_FILES = ["ml_terms_google_picked.txt", "ml_terms_manual.txt"]
-BASE_TERM_EN_SET = set()
-for filename in BASE_TERM_EN_FILES:
-    BASE_TERM_EN_LIST = load_obj(TERM_EN_DIR / filename)
-    BASE_TERM_EN_SET.update(BASE_TERM_EN_LIST)
-BASE_TERM_EN_LIST = list(BASE_TERM_EN_SET)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    http_clients.start()
+    await translation_store.start()
+    yield
+    await translation_store.stop()
+    await http_clients.aclose()
+    google_executor.shutdown()
 
 
-@app.post("/translate")
+app = FastAPI(title="Spot Translator API", version="1.0", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def record_timing(request: Request, call_next):
+    """요청 latency를 metrics에 기록하고, 단계별 시간(timed_stage)을 Server-Timing header로 알려줌
+    streaming 응답은 header를 먼저 보내므로 total만 들어감
+    """
+    timings = start_request_timing()
+    start_request_group()
+    start = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - start
+
+    # 없는 path로 label 수가 늘어나지 않도록, 등록된 route가 아니면 "other"
+    path = request.url.path if request.url.path in ROUTE_PATHS else "other"
+    REQUEST_SECONDS.observe(total, path, response.status_code)
+    response.headers["Server-Timing"] = format_server_timing(timings, total)
+    response.headers["Timing-Allow-Origin"] = "*"  # 확장 프로그램(다른 origin)에서도 Server-Timing을 볼 수 있도록
+    return response
+
+
+async def admit_request(request: Request):
+    """번역 endpoint들의 dependency. 서버가 과부하면 처리하지 않고 503(AdmissionRejected)
+    client는 X-Request-Timeout header(초)로 기다릴 수 있는 시간을 알려줄 수 있음
+    """
+    try:
+        max_wait = float(request.headers["X-Request-Timeout"])
+    except (KeyError, ValueError):
+        max_wait = None
+    async with admission_controller.admit(max_wait):
+        yield
+
+
+@app.exception_handler(AdmissionRejected)
+async def handle_admission_rejected(request: Request, exc: AdmissionRejected):
+    response_dict = {"text": None, "status_msg": "❗ Server is busy. Please try again in a few seconds"}
+    return JSONResponse(content=response_dict, status_code=503, headers={"Retry-After": exc.retry_after_header})
+
+
+@app.post("/translate", dependencies=[Depends(admit_request)])
 async def translate(translate_request: TranslateRequest, user_option: Optional[UserOption] = None):
     translator_type = user_option.translator_client_info.translator_type
-    logger.info(f"{'-'*10} New request for {translator_type} {'-'*10}")
-
-    match translator_type:
-        case TranslatorType.papago:
-            translator = PapagoTranslator(user_option)
-        case TranslatorType.deepl:
-            translator = DeepLTranslator(user_option)
-        case TranslatorType.google:
-            translator = GoogleTranslator(user_option)
-
-    # term_en_set =  Translator.BASE_TERM_EN_SET if self.user_defined_term_set is None \
-    #     else (Translator.BASE_TERM_EN_SET | self.user_defined_term_set)
-    # term_en_list = BASE_TERM_EN_LIST
-
-    status_code = 200
-    translated_text, status_msg = await translator.run(
+    logger.info("---------- New request for %s ----------", translator_type)
+
+    result = await TranslationSession(user_option).translate(
         src_text=translate_request.src_text, tgt_lang=translate_request.tgt_lang
     )
-    if translated_text is None and not isinstance(translator, GoogleTranslator):
-        logger.error(f"{translator_type} API failed. Try Google API")
-        translator_type = TranslatorType.google
-        translator = GoogleTranslator(user_option)
-        translated_text, _ = await translator.run(
-            src_text=translate_request.src_text, tgt_lang=translate_request.tgt_lang
-        )
-
-        if translated_text is None:
-            logger.error("Google API also failed")
-            status_msg = status_msg + "<br/>Google API also failed"
-            status_code = 503
-        else:
-            status_msg = status_msg + "<br/>But translate it by Google API"
-
-    response_dict = {"text": translated_text, "status_msg": status_msg, "translator_type": translator_type}
+
+    response_dict = {"text": result.text, "status_msg": result.status_msg, "translator_type": result.translator_type}
     response_json = jsonable_encoder(response_dict)
+    return JSONResponse(content=response_json, status_code=result.status_code)
+
+
+@app.post("/translate/batch", dependencies=[Depends(admit_request)])
+async def translate_batch(batch_request: BatchTranslateRequest, user_option: Optional[UserOption] = None):
+    """여러 text(segment)를 한 번에 번역. 결과는 입력 순서대로 segment마다 status와 함께 리턴
+    - status: "ok", "fallback"(Google API로 대신 번역), "empty", "error"
+    """
+    translator_type = user_option.translator_client_info.translator_type
+    logger.info(
+        "---------- New batch request for %s (%d texts) ----------", translator_type, len(batch_request.src_texts)
+    )
+
+    session = TranslationSession(user_option)
+    # auto면 가장 긴 text 기준으로 backend를 하나 골라서 batch 전체를 보냄(한 번의 요청으로 묶을 수 있도록)
+    translator_type, _ = await session.select(max(batch_request.src_texts, key=len, default=""), batch_request.tgt_lang)
+    translator = session.translators.get(translator_type, session.google_translator)
+    results = await translator.run_batch(batch_request.src_texts, tgt_lang=batch_request.tgt_lang)
+    segments = [
+        {"text": translated_text, "status_msg": status_msg, "translator_type": translator_type, "status": "ok"}
+        for translated_text, status_msg in results
+    ]
+    for segment in segments:
+        if segment["text"] == "":
+            segment["status"] = "empty"
+
+    failed_indices = [idx for idx, segment in enumerate(segments) if segment["text"] is None]
+    if failed_indices and not isinstance(translator, GoogleTranslator):
+        logger.error("%s API failed for %d texts. Try Google API", translator_type, len(failed_indices))
+        FALLBACKS.inc(translator_type, "failed", amount=len(failed_indices))
+        with timed_stage("fallback"):
+            google_results = await session.google_translator.run_batch(
+                [batch_request.src_texts[idx] for idx in failed_indices], tgt_lang=batch_request.tgt_lang
+            )
+        for idx, (translated_text, _) in zip(failed_indices, google_results):
+            segment = segments[idx]
+            if translated_text is None:
+                segment["status_msg"] = segment["status_msg"] + "<br/>Google API also failed"
+            else:
+                segment.update(
+                    text=translated_text,
+                    status_msg=segment["status_msg"] + "<br/>But translate it by Google API",
+                    translator_type=TranslatorType.google,
+                    status="fallback",
+                )
+    for segment in segments:
+        if segment["text"] is None:
+            segment["status"] = "error"
+
+    status_code = 503 if segments and all(segment["status"] == "error" for segment in segments) else 200
+    response_json = jsonable_encoder({"results": segments})
     return JSONResponse(content=response_json, status_code=status_code)
 
 
+@app.post("/translate/stream", dependencies=[Depends(admit_request)])
+async def translate_stream(
+    request: Request,
+    translate_request: TranslateRequest,
+    user_option: Optional[UserOption] = None,
+    stream_format: Optional[StreamFormat] = Query(None, alias="format"),
+):
+    """/translate와 같지만, 번역이 끝난 segment부터 NDJSON 또는 SSE(Server-Sent Events)로 바로 보냄
+    format query가 없으면 Accept header가 text/event-stream인 경우 SSE, 아니면 NDJSON
+    """
+    if stream_format is None:
+        accept = request.headers.get("accept", "")
+        stream_format = StreamFormat.sse if "text/event-stream" in accept else StreamFormat.ndjson
+
+    translator_type = user_option.translator_client_info.translator_type
+    logger.info("---------- New stream request for %s ----------", translator_type)
+
+    session = TranslationSession(user_option)
+    translator_type, src_lang = await session.route(translate_request.src_text, translate_request.tgt_lang)
+    translator = session.translators.get(translator_type, session.google_translator)
+    fallback_translator = session.get_fallback(translator_type)
+    events = iter_translation_events(
+        translator,
+        translator_type,
+        translate_request.src_text,
+        tgt_lang=translate_request.tgt_lang,
+        fallback_translator=fallback_translator,
+        src_lang=src_lang,
+    )
+
+    async def _stream():
+        async for event in events:
+            yield format_event(event, stream_format)
+
+    return StreamingResponse(_stream(), media_type=STREAM_MEDIA_TYPES[stream_format])
+
+
+@app.websocket("/ws")
+async def translate_ws(websocket: WebSocket):
+    """연결 시 한 번만 UserOption을 보내고, 이후에는 작은 번역 요청들을 주고받는 WebSocket endpoint
+    message 형식은 src.translate.session.WebSocketSession 참고
+    """
+    await websocket.accept()
+    ws_session = WebSocketSession(websocket.send_json)
+    try:
+        while True:
+            try:
+                message = orjson.loads(await websocket.receive_text())
+            except orjson.JSONDecodeError:
+                await ws_session.send({"type": "error", "msg": "Invalid JSON"})
+                continue
+            if not isinstance(message, dict):
+                await ws_session.send({"type": "error", "msg": "Message must be a JSON object"})
+                continue
+            await ws_session.handle(message)
+    except WebSocketDisconnect:
+        logger.info("WebSocket disconnected")
+    finally:
+        ws_session.close()
+
+
+@app.get("/health")
+async def health():
+    """load balancer용. 과부하(대기 중인 요청이 많거나 예상 대기 시간이 긴 경우)면 503"""
+    health_dict = admission_controller.health()
+    return JSONResponse(content=health_dict, status_code=503 if health_dict["status"] == "overloaded" else 200)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text 형식. 값은 worker process마다 따로 집계됨"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "admission": admission_controller.stats(),
+        "logging": log_stats(),
+        "http_clients": http_clients.stats(),
+        "google_executor": google_executor.stats(),
+        "translation_cache": translation_cache.stats(),
+        "translation_store": translation_store.stats(),
+        "fallback": fallback_policy.stats(),
+        "circuit_breakers": circuit_breakers.stats(),
+        "rate_limiters": rate_limiters.stats(),
+        "single_flight": translation_flights.stats(),
+        "glossary": glossary_registry.stats(),
+        "router": backend_router.stats(),
+        "data_snapshot": data_snapshot.stats(),
+    }
+
+
+ROUTE_PATHS = frozenset(route.path for route in app.routes)
+
 if __name__ == "__main__":
     import uvicorn
 
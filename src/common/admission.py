@@ -0,0 +1,167 @@
+"""서버 전체의 번역 요청 수를 제한하는 admission controller(load shedding)
+- 동시에 처리하는 요청 수를 max_in_flight개로 제한하고, 나머지는 도착 순서대로(FIFO) 기다림
+- 예상 대기 시간(대기 순번 x 평균 처리 시간 / max_in_flight)이 client가 기다릴 수 있는 시간보다 길면
+    기다리지 않고 바로 503 + Retry-After로 응답. 기다리다가 deadline이 지나도 503
+- health(): load balancer가 과부하인 worker를 빼낼 수 있도록 상태를 알려줌
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+
+
+@dataclass
+class AdmissionConfig:
+    """- max_in_flight: 동시에 처리하는 번역 요청 수
+    - max_queue: 기다릴 수 있는 요청 수. 넘으면 바로 503
+    - max_wait: 기다리는 최대 시간(초). client가 X-Request-Timeout header로 더 짧게 줄 수 있음
+    - ewma_alpha: 평균 처리 시간(EWMA)에서 새 표본의 가중치
+    - overload_queue_ratio: 대기 중인 요청이 max_queue의 이 비율 이상이면 health에서 overloaded
+    """
+
+    enabled: bool = True
+    max_in_flight: int = 256
+    max_queue: int = 512
+    max_wait: float = 3.0
+    ewma_alpha: float = 0.1
+    overload_queue_ratio: float = 0.8
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(f"Request rejected: {reason}")
+        self.retry_after = retry_after
+        self.reason = reason
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(math.ceil(self.retry_after), 1))
+
+
+class AdmissionController:
+    def __init__(self, config: Optional[AdmissionConfig] = None):
+        self.config = config if config is not None else load_config(AdmissionConfig, "admission")
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Event] = deque()
+        self.avg_service_time: Optional[float] = None  # 요청 하나의 평균 처리 시간(초)
+
+        self.n_admitted = 0
+        self.n_queued = 0  # 기다린 뒤 처리한 수
+        self.n_rejected_early = 0  # 예상 대기 시간이 길거나 queue가 가득 차서 바로 거절한 수
+        self.n_rejected_timeout = 0  # 기다리다가 deadline이 지나서 거절한 수
+
+    @property
+    def n_waiting(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        """지금 들어오는 요청이 처리되기 시작할 때까지 예상 대기 시간(초). 처리 시간 표본이 없으면 0"""
+        if self.in_flight < self.config.max_in_flight and not self._waiters:
+            return 0.0
+        if self.avg_service_time is None:
+            return 0.0
+        return (len(self._waiters) + 1) * self.avg_service_time / self.config.max_in_flight
+
+    def is_overloaded(self) -> bool:
+        return (
+            len(self._waiters) >= self.config.max_queue * self.config.overload_queue_ratio
+            or self.expected_wait() > self.config.max_wait
+        )
+
+    async def acquire(self, max_wait: Optional[float] = None):
+        """처리를 시작해도 되면 리턴(끝나면 release() 호출). 안 되면 AdmissionRejected"""
+        max_wait = self.config.max_wait if max_wait is None else min(max_wait, self.config.max_wait)
+        if self.in_flight < self.config.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.n_admitted += 1
+            return
+
+        expected_wait = self.expected_wait()
+        if len(self._waiters) >= self.config.max_queue or expected_wait > max_wait:
+            self.n_rejected_early += 1
+            raise AdmissionRejected(expected_wait, "overloaded")
+
+        waiter = asyncio.Event()
+        self._waiters.append(waiter)
+        deadline = time.monotonic() + max_wait
+        try:
+            while not (self._waiters[0] is waiter and self.in_flight < self.config.max_in_flight):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    self.n_rejected_timeout += 1
+                    raise AdmissionRejected(self.expected_wait(), "queue timeout")
+                waiter.clear()
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+            self.n_admitted += 1
+            self.n_queued += 1
+        finally:
+            self._waiters.remove(waiter)
+            self._wake_next()
+
+    def release(self, service_time: Optional[float] = None):
+        self.in_flight -= 1
+        if service_time is not None:
+            alpha = self.config.ewma_alpha
+            self.avg_service_time = (
+                service_time
+                if self.avg_service_time is None
+                else alpha * service_time + (1 - alpha) * self.avg_service_time
+            )
+        self._wake_next()
+
+    def _wake_next(self):
+        if self._waiters and self.in_flight < self.config.max_in_flight:
+            self._waiters[0].set()
+
+    @asynccontextmanager
+    async def admit(self, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        if not self.config.enabled:
+            yield
+            return
+
+        try:
+            await self.acquire(max_wait)
+        except AdmissionRejected as e:
+            logger.warning(
+                f"{e} (in flight: {self.in_flight}, waiting: {self.n_waiting}, retry after {e.retry_after:.1f}s)"
+            )
+            raise
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def health(self) -> dict:
+        return {
+            "status": "overloaded" if self.config.enabled and self.is_overloaded() else "ok",
+            "in_flight": self.in_flight,
+            "max_in_flight": self.config.max_in_flight,
+            "waiting": self.n_waiting,
+            "max_queue": self.config.max_queue,
+            "expected_wait": self.expected_wait(),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.config.enabled,
+            **self.health(),
+            "avg_service_time": self.avg_service_time,
+            "admitted": self.n_admitted,
+            "queued": self.n_queued,
+            "rejected_early": self.n_rejected_early,
+            "rejected_timeout": self.n_rejected_timeout,
+        }
+
+
+admission_controller = AdmissionController()
@@ -1,14 +1,26 @@
+import atexit
 import logging
 import logging.handlers
-
-from varname import argname
+import queue
+from typing import Optional
+
+from src.common.config import load_config
+from src.common.log import (
+    DebugSamplingFilter,
+    DroppingQueueHandler,
+    JsonFormatter,
+    LogConfig,
+    TextFormatter,
+)
 
 logger = logging.getLogger("logger")
+log_queue_handler: Optional[DroppingQueueHandler] = None  # queue mode에서만 사용
 
 
-def set_logger(logger):
-    logger.setLevel(logging.INFO)
-    logger.setLevel(logging.DEBUG)
+def set_logger(logger, config: Optional[LogConfig] = None):
+    global log_queue_handler
+    config = config if config is not None else load_config(LogConfig, "log")
+    logger.setLevel(config.level.upper())
 
     # Check handler exists
     if len(logger.handlers) > 0:
@@ -18,13 +30,18 @@ def set_logger(logger):
     stream_handler = logging.StreamHandler()
     # fileHandle 생성 및 추가
     file_handler = logging.handlers.TimedRotatingFileHandler(
-        filename="./logs/log", encoding="utf-8", when="midnight", interval=1, backupCount=100
+        filename=config.filename, encoding="utf-8", when="midnight", interval=1, backupCount=100
     )
     file_handler.suffix = "-%Y%m%d"  # 파일명 끝에 붙여줌; ex. log-20190811
     # file_handler = logging.FileHandler('./logs/my.log')
 
     # 로그 포멧 정의
-    formatter = logging.Formatter("(%(asctime)s) [%(levelname)s] %(message)s", datefmt="%y%m%d %H:%M:%S")
+    if config.format == "json":
+        formatter = JsonFormatter(max_len=config.max_message_len)
+    else:
+        formatter = TextFormatter(
+            "(%(asctime)s) [%(levelname)s] %(message)s", datefmt="%y%m%d %H:%M:%S", max_len=config.max_message_len
+        )
     # formatter = logging.Formatter(
     #     "(%(asctime)s  %(relativeCreated)d)  [%(levelname)s]  %(filename)s, %(lineno)s line \n>> %(message)s",
     #     datefmt="%Y%m%d %H:%M:%S",
@@ -34,37 +51,41 @@ def set_logger(logger):
     stream_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
 
-    logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
+    # 버릴 DEBUG record는 queue에 넣지도 않음. 긴 message를 자르는 것은 formatter에서 함
+    logger.addFilter(DebugSamplingFilter(config.debug_sample_rate))
+
+    if config.mode == "queue":
+        # 파일/콘솔 출력(disk I/O)은 listener thread에서 하고, logger를 호출한 쪽은 queue에 넣기만 함
+        log_queue_handler = DroppingQueueHandler(queue.Queue(maxsize=config.max_queue))
+        listener = logging.handlers.QueueListener(
+            log_queue_handler.queue, stream_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)  # 종료 전에 queue에 남은 record를 출력
+        logger.addHandler(log_queue_handler)
+    else:
+        logger.addHandler(stream_handler)
+        logger.addHandler(file_handler)
 
 
 set_logger(logger)
 
 
-def gen_log_text(*vars, title=None):  # pre_text=None,
-    var_names = argname(vars)
-
-    name_space = 10
-    value_space = 50
-
-    text = f"<{title}>\n" if title is not None else ""
-    for idx, var_tuple in enumerate(zip(var_names, vars)):
-        if isinstance(var_tuple[1], str):
-            text += (
-                f"{var_tuple[0]:<{name_space}}: {var_tuple[1]:<{value_space}}"
-                if idx == 0
-                else f" \n>> {var_tuple[0]:<{name_space}}: {var_tuple[1]:<{value_space}}"
-            )
-        else:
-            text += (
-                f"{var_tuple[0]:<{name_space}}: {var_tuple[1]}"
-                if idx == 0
-                else f" \n>> {var_tuple[0]:<{name_space}}: {var_tuple[1]}"
-            )
-
-    # return f"{text}" if pre_text is None else \
-    #         f"{pre_text} {text}"
-    return f"{text}"
+def log_stats() -> dict:
+    stats = {"mode": "queue" if log_queue_handler is not None else "sync"}
+    if log_queue_handler is not None:
+        stats.update(log_queue_handler.stats())
+    return stats
+
+
+def log_fields(level: int, message: str, **fields):
+    """message와 key=value field들을 남기는 structured log
+    - level이 꺼져 있으면 record를 만들지 않고, 호출한 곳의 frame 등을 살펴보지도 않음
+    - field 값을 문자열로 바꾸는 것은 formatter(queue mode에서는 listener thread)에서 함
+    - text 형식에서는 "message | key='value' ...", json 형식에서는 "fields" 항목으로 기록
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields}, stacklevel=2)
 
 
 class EmptyFileError(Exception):
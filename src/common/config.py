@@ -0,0 +1,37 @@
+import os
+from dataclasses import fields
+from typing import Optional, Type, TypeVar, get_args, get_origin, get_type_hints
+
+ENV_PREFIX = "SPOT"
+
+T = TypeVar("T")
+
+
+def _cast(value: str, type_):
+    if get_origin(type_) is not None:  # Optional[int] -> int
+        args = [arg for arg in get_args(type_) if arg is not type(None)]
+        if value.lower() in ("", "none", "null"):
+            return None
+        type_ = args[0]
+
+    if type_ is bool:
+        return value.lower() in ("1", "true", "yes", "on")
+    return type_(value)
+
+
+def load_config(config_cls: Type[T], section: str, **overrides) -> T:
+    """dataclass 형태의 설정 클래스를 환경변수 값으로 덮어써서 생성하는 함수
+    - 각 field는 `SPOT_<SECTION>_<FIELD>` 환경변수로 덮어쓸 수 있음
+        ex. load_config(HTTPClientConfig, "http") -> SPOT_HTTP_MAX_CONNECTIONS=200
+    - overrides로 주어진 값이 가장 우선함
+    """
+    type_hints = get_type_hints(config_cls)
+    kwargs = {}
+    for f in fields(config_cls):
+        env_name = f"{ENV_PREFIX}_{section}_{f.name}".upper()
+        value: Optional[str] = os.environ.get(env_name)
+        if value is not None:
+            kwargs[f.name] = _cast(value, type_hints[f.name])
+    kwargs.update(overrides)
+
+    return config_cls(**kwargs)
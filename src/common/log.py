@@ -0,0 +1,131 @@
+"""logger 구성 요소
+- queue mode: event loop(요청 처리 thread)에서는 record를 queue에 넣기만 하고, 파일/콘솔 출력은
+    QueueListener의 background thread에서 함. 디스크가 느려 queue가 가득 차면 기다리지 않고 record를 버림
+- JSON 형식(한 줄에 record 하나), 긴 message 자르기, DEBUG record sampling
+- message(msg % args)를 만들고 자르는 것, structured field(record.fields, base.log_fields로 남김)를 문자열로 바꾸는 것은
+    formatter에서 함. queue mode에서는 listener thread에서 하므로 log를 남기는 쪽에서는 record를 queue에 넣고 끝남
+"""
+import logging
+import logging.handlers
+import queue
+import random
+from dataclasses import dataclass
+from datetime import datetime
+
+import orjson
+
+
+@dataclass
+class LogConfig:
+    """- mode: "queue"(출력은 background thread에서) 또는 "sync"(log를 남긴 thread에서 바로 출력)
+    - format: "text" 또는 "json"(한 줄에 JSON 하나)
+    - max_queue: queue mode에서 출력을 기다리는 record 수 상한. 넘으면 버림(요청 처리를 막지 않도록)
+    - max_message_len: 이보다 긴 message는 잘라서 기록. 0이면 자르지 않음
+    - debug_sample_rate: DEBUG record 중 기록할 비율(0~1)
+    """
+
+    mode: str = "queue"
+    level: str = "DEBUG"
+    format: str = "text"
+    filename: str = "./logs/log"
+    max_queue: int = 10000
+    max_message_len: int = 2000
+    debug_sample_rate: float = 1.0
+
+
+def truncate(text: str, max_len: int) -> str:
+    if max_len <= 0 or len(text) <= max_len:
+        return text
+    return f"{text[:max_len]}...(+{len(text) - max_len} chars)"
+
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG record는 sample_rate 비율만 남김. INFO 이상은 모두 남김"""
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+
+class TextFormatter(logging.Formatter):
+    """기본 text 형식. record.fields가 있으면 message 뒤에 " | key='value' ..." 로 붙임
+    max_len: message와 field 값마다 이보다 길면 잘라서 기록. 0이면 자르지 않음
+    """
+
+    def __init__(self, fmt: str, datefmt: str, max_len: int = 0):
+        super().__init__(fmt, datefmt)
+        self.max_len = max_len
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = truncate(record.message, self.max_len)
+        text = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " | " + " ".join(f"{key}={truncate(repr(value), self.max_len)}" for key, value in fields.items())
+        return text
+
+
+# LogRecord의 기본 attribute. 이 외의 attribute(logger.info(..., extra={...}))는 JSON field로 남김
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """max_len: message와 field 값마다 이보다 길면 잘라서 기록. 0이면 자르지 않음"""
+
+    def __init__(self, max_len: int = 0):
+        super().__init__()
+        self.max_len = max_len
+
+    def _field_value(self, value):
+        if isinstance(value, (bool, int, float)) or value is None:
+            return value
+        if isinstance(value, dict):
+            return {str(key): self._field_value(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._field_value(item) for item in value]
+        return truncate(str(value), self.max_len)
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": truncate(record.getMessage(), self.max_len),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = self._field_value(value)
+        return orjson.dumps(data, default=str).decode("utf-8")
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """queue가 가득 차면 기다리지 않고 record를 버리는 QueueHandler
+    기본 QueueHandler.prepare()는 queue에 넣기 전에 message를 만들지만(format), 같은 process의 listener가 출력하므로
+    record를 그대로 넘겨서 message를 만드는 것도 listener thread의 formatter에서 하도록 함
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.n_dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.n_dropped += 1
+
+    def stats(self) -> dict:
+        return {"queued": self.queue.qsize(), "max_queue": self.queue.maxsize, "dropped": self.n_dropped}
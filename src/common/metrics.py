@@ -0,0 +1,180 @@
+"""Prometheus text 형식(/metrics)으로 내보내는 counter, histogram과 요청별 단계(stage) 시간 측정
+- prometheus_client 없이 필요한 만큼만 구현. 값은 process(uvicorn worker)마다 따로 집계됨
+- timed_stage("detect"): 현재 요청의 단계별 시간(Server-Timing header)과 stage histogram에 함께 기록
+    요청마다 start_request_timing()으로 contextvar에 dict를 만들어두고, 그 요청에서 만든 task들도 같은 dict를 사용
+"""
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        key = tuple(str(value) for value in label_values)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, *label_values) -> float:
+        return self._values.get(tuple(str(value) for value in label_values), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value:g}")
+        return lines
+
+
+class _HistogramValue:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, n_buckets: int):
+        self.counts = [0] * (n_buckets + 1)  # bucket별 개수(누적 아님). 마지막은 +Inf
+        self.total = 0.0
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help_text: str, label_names: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple[str, ...], _HistogramValue] = {}
+
+    def observe(self, value: float, *label_values):
+        key = tuple(str(label_value) for label_value in label_values)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = _HistogramValue(len(self.buckets))
+            self._values[key] = entry
+        entry.counts[bisect.bisect_left(self.buckets, value)] += 1
+        entry.total += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, entry in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), entry.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.label_names, label_values, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {entry.total:g}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help_text: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(
+        self, name: str, help_text: str, label_names: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicated metric name: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+REQUEST_SECONDS = metrics_registry.histogram(
+    "spot_request_duration_seconds", "HTTP request latency", ("path", "status_code")
+)
+STAGE_SECONDS = metrics_registry.histogram(
+    "spot_stage_duration_seconds",
+    "Time spent in each translation stage(preprocess, detect, support_check, upstream, postprocess, fallback)",
+    ("stage",),
+)
+UPSTREAM_SECONDS = metrics_registry.histogram(
+    "spot_upstream_duration_seconds", "Backend API request latency", ("backend",)
+)
+UPSTREAM_REQUESTS = metrics_registry.counter(
+    "spot_upstream_requests_total",
+    "Backend API requests by status code and APIErrorCode category",
+    ("backend", "status_code", "category"),
+)
+UPSTREAM_CHARS = metrics_registry.counter("spot_upstream_chars_total", "Characters sent to backend APIs", ("backend",))
+REQUEST_CHARS = metrics_registry.counter("spot_request_chars_total", "Characters requested to translate", ("backend",))
+REUSED_CHARS = metrics_registry.counter(
+    "spot_reused_chars_total",
+    "Characters of sentences reused from previous translations instead of sent to backend APIs",
+    ("backend",),
+)
+CACHE_LOOKUPS = metrics_registry.counter(
+    "spot_cache_lookups_total", "Translation cache lookups by result(cache_hit, store_hit, miss)", ("result",)
+)
+FALLBACKS = metrics_registry.counter(
+    "spot_fallbacks_total", "Google API fallback requests by reason(failed, hedged, race)", ("backend", "reason")
+)
+SERVED = metrics_registry.counter(
+    "spot_served_total", "Translation results by the backend that served them", ("backend",)
+)
+
+_request_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timing() -> dict[str, float]:
+    """요청 처리 시작 시 호출. 이 요청(과 이 요청에서 만든 task)의 단계별 시간(초)을 모을 dict"""
+    timings: dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """단계 시간을 stage histogram과 현재 요청의 timings에 기록. 같은 단계가 여러 번이면 합산
+    동시에 실행된 task(ex. 긴 text의 chunk들)의 시간도 합산되므로 요청 전체 시간보다 클 수 있음
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def format_server_timing(timings: dict[str, float], total: Optional[float] = None) -> str:
+    """Server-Timing header 값. ex. 'detect;dur=0.4, upstream;dur=231.2, total;dur=240.1' (ms)"""
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
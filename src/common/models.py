@@ -3,6 +3,8 @@ from dataclasses import dataclass, field, fields
 from enum import Enum, auto
 from typing import Optional
 
+from src.common.config import load_config
+
 
 class StrEnum(str, Enum):
     def _generate_next_value_(name, start, count, last_values):
@@ -19,6 +21,12 @@ class TranslatorType(StrEnum):
     papago: str = auto()
     google: str = auto()
     deepl: str = auto()
+    auto: str = auto()  # 요청마다 backend_router가 latency, 성공률을 보고 backend를 고름
+
+    @classmethod
+    def backends(cls) -> list["TranslatorType"]:
+        """실제 번역 backend들(auto 제외)"""
+        return [translator_type for translator_type in cls if translator_type != cls.auto]
 
 
 @dataclass
@@ -27,6 +35,14 @@ class TranslatorClientInfo:
     api_key: Optional[str] = None
     secret_key: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranslatorClientInfo":
+        return cls(
+            translator_type=TranslatorType(data["translator_type"]),
+            api_key=data.get("api_key"),
+            secret_key=data.get("secret_key"),
+        )
+
 
 @dataclass
 class TranslateRequest:
@@ -34,11 +50,57 @@ class TranslateRequest:
     tgt_lang: Optional[str] = None
 
 
+@dataclass
+class BatchConfig:
+    """/translate/batch 요청 하나의 크기 제한. 넘으면 422
+    - max_items: src_texts 개수 상한
+    - max_chars: src_texts 전체 글자 수 상한
+    """
+
+    max_items: int = 100
+    max_chars: int = 50000
+
+
+batch_config = load_config(BatchConfig, "batch")
+
+
+@dataclass
+class BatchTranslateRequest:
+    src_texts: list[str]
+    tgt_lang: Optional[str] = None
+
+    def __post_init__(self):
+        # FastAPI의 request body 검증 중에 실행되므로 ValueError는 422 응답이 됨
+        if len(self.src_texts) > batch_config.max_items:
+            raise ValueError(f"Too many src_texts: {len(self.src_texts)} (max: {batch_config.max_items})")
+        n_chars = sum(len(src_text) for src_text in self.src_texts)
+        if n_chars > batch_config.max_chars:
+            raise ValueError(f"src_texts are too long: {n_chars} chars (max: {batch_config.max_chars})")
+
+
 @dataclass
 class UserOption:
     main_tgt_lang: str
     sub_tgt_lang: str
     translator_client_info: Optional[TranslatorClientInfo] = None
+    user_defined_terms: Optional[list[str]] = None  # base 용어집 외에 번역하지 않고 그대로 둘 용어들
+    # translator_type이 auto일 때 고를 수 있는 backend들의 key. Google은 key 없이도 후보에 포함됨
+    translator_client_infos: Optional[list[TranslatorClientInfo]] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserOption":
+        """FastAPI의 request body 검증을 거치지 않는 곳(ex. WebSocket message)에서 사용"""
+        client_info = data.get("translator_client_info")
+        client_infos = data.get("translator_client_infos")
+        return cls(
+            main_tgt_lang=data["main_tgt_lang"],
+            sub_tgt_lang=data["sub_tgt_lang"],
+            translator_client_info=TranslatorClientInfo.from_dict(client_info) if client_info is not None else None,
+            user_defined_terms=data.get("user_defined_terms"),
+            translator_client_infos=(
+                [TranslatorClientInfo.from_dict(info) for info in client_infos] if client_infos is not None else None
+            ),
+        )
 
     # def to_dict_for_trasnlator(self):
     #     # main_tgt_lang, sub_tgt_lang, api_key, secret_key
@@ -69,6 +131,22 @@ class APIErrorCode:
         self.internal_error_rep = re.compile(self.internal_error_reg)
         self.external_error_rep = re.compile(self.external_error_reg)
 
+    def categorize(self, status_code: Optional[int]) -> str:
+        """metrics에 쓰는 status code 분류. Papago처럼 rate limit과 quota가 같은 code면 rate_limit"""
+        if status_code is None or 200 <= status_code < 300:
+            return "ok"
+        if status_code in self.auth_failed:
+            return "auth_failed"
+        if status_code in self.rate_limit_exceeded:
+            return "rate_limit"
+        if status_code in self.quota_exceeded:
+            return "quota"
+        if self.internal_error_rep.fullmatch(str(status_code)):
+            return "client_error"
+        if self.external_error_rep.fullmatch(str(status_code)):
+            return "server_error"
+        return "other"
+
     def convert_to_msg(self, status_code: int) -> Optional[str]:
         msgs = []
         if status_code in self.auth_failed:
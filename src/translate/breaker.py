@@ -0,0 +1,182 @@
+"""backend + API key별 circuit breaker
+- closed: 정상. 5xx/timeout이 연속 failure_threshold번 나면 open
+- open: open_until까지 backend에 요청을 보내지 않고 바로 실패 처리(-> fallback)
+    - 429: Retry-After header 만큼(없으면 rate_limit_duration) open
+    - quota 초과(DeepL 456, Papago errorCode 010): quota가 초기화될 때까지 open
+- half_open: open 기간이 끝난 뒤 요청 1건만 통과시켜 봄. 성공하면 closed, 실패하면 더 긴 기간 open
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+from src.common.models import StrEnum
+
+
+class BreakerState(StrEnum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+@dataclass
+class BreakerConfig:
+    """- failure_threshold: 연속 실패(5xx, timeout) 횟수가 이 값이 되면 open
+    - open_duration: 처음 open되는 기간(초). half_open 시도가 실패할 때마다 2배씩 늘어남(max_open_duration까지)
+    - rate_limit_duration: 429 응답에 Retry-After header가 없을 때 open하는 기간(초)
+    - quota_duration: quota 초기화 시점을 모르는 backend에서 quota 초과 시 open하는 기간(초)
+    - max_breakers: 유지하는 breaker 수 상한(API key 수). 넘으면 오래 사용되지 않은 것부터 제거
+    """
+
+    enabled: bool = True
+    failure_threshold: int = 5
+    open_duration: float = 10.0
+    max_open_duration: float = 300.0
+    rate_limit_duration: float = 5.0
+    quota_duration: float = 3600.0
+    max_breakers: int = 10000
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header(초 또는 HTTP-date)를 지금부터의 초로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def hash_api_key(api_key: Optional[str]) -> str:
+    """API key 원문을 메모리/로그에 남기지 않기 위해 hash로 구분"""
+    if not api_key:
+        return ""
+    return hashlib.blake2b(api_key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, config: BreakerConfig):
+        self.name = name
+        self.config = config
+        self.state = BreakerState.closed
+        self.reason: Optional[str] = None  # open된 이유: "error", "rate_limit", "quota"
+        self.open_status_code: Optional[int] = None  # open 중에 요청 대신 리턴할 status code
+        self.open_until = 0.0
+        self.n_consecutive_failures = 0
+        self._open_duration = config.open_duration
+        self._probe_in_flight = False
+
+        self.n_rejected = 0
+        self.n_opened = 0
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지. half_open 상태에서는 한 번에 1건만 허용"""
+        if self.state == BreakerState.closed:
+            return True
+        if self.state == BreakerState.open and time.monotonic() >= self.open_until:
+            self.state = BreakerState.half_open
+            self._probe_in_flight = False
+        if self.state == BreakerState.half_open and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.n_rejected += 1
+        return False
+
+    def is_blocked(self) -> bool:
+        """allow()와 달리 상태를 바꾸지 않고, open 기간 중인지만 확인(router가 후보에서 뺄 때 사용)"""
+        return self.state == BreakerState.open and time.monotonic() < self.open_until
+
+    def release_probe(self):
+        """결과를 알 수 없이 끝난(취소된) 요청이 half_open 시도였다면 다음 요청이 다시 시도할 수 있게 함"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        if self.state != BreakerState.closed:
+            logger.info(f"Circuit breaker {self.name} closed")
+        self.state = BreakerState.closed
+        self.reason = None
+        self.open_status_code = None
+        self.n_consecutive_failures = 0
+        self._open_duration = self.config.open_duration
+        self._probe_in_flight = False
+
+    def record_failure(self, status_code: int):
+        """5xx, timeout 등 backend 쪽 오류. 연속으로 failure_threshold번 나면(half_open이면 바로) open"""
+        self.n_consecutive_failures += 1
+        if self.state == BreakerState.half_open:
+            self._open_duration = min(self._open_duration * 2, self.config.max_open_duration)
+            self.open("error", status_code, self._open_duration)
+        elif self.n_consecutive_failures >= self.config.failure_threshold:
+            self.open("error", status_code, self._open_duration)
+
+    def record_rate_limited(self, status_code: int, retry_after: Optional[float]):
+        self.open(
+            "rate_limit", status_code, retry_after if retry_after is not None else self.config.rate_limit_duration
+        )
+
+    def record_quota_exceeded(self, status_code: int, reset_after: Optional[float]):
+        self.open("quota", status_code, reset_after if reset_after is not None else self.config.quota_duration)
+
+    def open(self, reason: str, status_code: int, duration: float):
+        logger.warning(f"Circuit breaker {self.name} opened for {duration:.1f}s ({reason}, {status_code})")
+        self.state = BreakerState.open
+        self.reason = reason
+        self.open_status_code = status_code
+        self.open_until = time.monotonic() + duration
+        self._probe_in_flight = False
+        self.n_opened += 1
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "reason": self.reason,
+            "open_remaining": max(self.open_until - time.monotonic(), 0.0) if self.state == BreakerState.open else 0.0,
+            "consecutive_failures": self.n_consecutive_failures,
+            "opened": self.n_opened,
+            "rejected": self.n_rejected,
+        }
+
+
+class BreakerRegistry:
+    """(backend, API key hash) 별 CircuitBreaker"""
+
+    def __init__(self, config: Optional[BreakerConfig] = None):
+        self.config = config if config is not None else load_config(BreakerConfig, "breaker")
+        self._breakers: OrderedDict[tuple[str, str], CircuitBreaker] = OrderedDict()
+
+    def get(self, service_name: str, api_key: Optional[str]) -> CircuitBreaker:
+        key = (service_name, hash_api_key(api_key))
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(f"{service_name}:{key[1]}", self.config)
+            self._breakers[key] = breaker
+            if len(self._breakers) > self.config.max_breakers:
+                self._breakers.popitem(last=False)
+        else:
+            self._breakers.move_to_end(key)
+        return breaker
+
+    def stats(self) -> dict:
+        n_states = {state: 0 for state in BreakerState}
+        for breaker in self._breakers.values():
+            n_states[breaker.state] += 1
+        return {
+            "enabled": self.config.enabled,
+            "breakers": len(self._breakers),
+            **{str(state): n for state, n in n_states.items()},
+            "not_closed": {
+                breaker.name: breaker.stats()
+                for breaker in self._breakers.values()
+                if breaker.state != BreakerState.closed
+            },
+        }
+
+
+circuit_breakers = BreakerRegistry()
@@ -0,0 +1,122 @@
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+from src.common.config import load_config
+
+
+class CacheKey(NamedTuple):
+    backend: str
+    src_lang: str
+    tgt_lang: str
+    text: str  # normalize_text()를 거친 text
+    glossary_version: str = ""
+
+
+def normalize_text(text: str) -> str:
+    """같은 번역 결과를 낼 text는 같은 key가 되도록 정규화
+    - Unicode NFC 정규화, 양끝 공백 제거, 줄 안의 연속된 공백은 하나로 합침(줄바꿈은 유지)
+    """
+    text = unicodedata.normalize("NFC", text)
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines())
+
+
+@dataclass
+class CacheConfig:
+    """- max_bytes: cache가 사용할 메모리 상한(추정치). 넘으면 LRU 순서로 제거
+    - ttl: 저장 후 ttl(초)이 지난 항목은 조회 시 만료 처리
+    """
+
+    enabled: bool = True
+    max_bytes: int = 64 * 1024 * 1024
+    ttl: float = 24 * 60 * 60
+
+
+class TranslationCache:
+    """번역 결과(str)를 저장하는 in-process LRU + TTL cache
+    - coroutine이 아닌 결과값을 저장하므로 여러 요청에서 재사용 가능
+    - 실패한 번역(None)은 저장하지 않음
+    - event loop 하나에서만 사용되므로 별도의 lock은 두지 않음
+    """
+
+    ENTRY_OVERHEAD = 200  # OrderedDict node, tuple 등 key/value 외의 대략적인 메모리(byte)
+
+    def __init__(self, config: Optional[CacheConfig] = None):
+        self.config = config if config is not None else load_config(CacheConfig, "cache")
+        self._data: OrderedDict[CacheKey, tuple[str, float, int]] = OrderedDict()  # key -> (value, expire_at, size)
+        self.n_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def estimate_size(cls, key: CacheKey, value: str) -> int:
+        return sum(sys.getsizeof(field) for field in key) + sys.getsizeof(value) + cls.ENTRY_OVERHEAD
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        if not self.config.enabled:
+            return None
+
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expire_at, _ = entry
+        if expire_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: CacheKey, value: Optional[str]):
+        if not self.config.enabled or value is None:
+            return
+
+        size = self.estimate_size(key, value)
+        if size > self.config.max_bytes:
+            return
+
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (value, time.monotonic() + self.config.ttl, size)
+        self.n_bytes += size
+
+        while self.n_bytes > self.config.max_bytes:
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: CacheKey):
+        _, _, size = self._data.pop(key)
+        self.n_bytes -= size
+
+    def clear(self):
+        self._data.clear()
+        self.n_bytes = 0
+
+    def stats(self) -> dict:
+        n_lookups = self.hits + self.misses
+        return {
+            "enabled": self.config.enabled,
+            "entries": len(self._data),
+            "bytes": self.n_bytes,
+            "max_bytes": self.config.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / n_lookups if n_lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+translation_cache = TranslationCache()
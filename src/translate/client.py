@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from src.common.base import logger
+from src.common.config import load_config
+
+try:
+    import h2  # noqa: F401  # httpx는 h2 패키지가 있어야 HTTP/2 사용 가능
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# httpx 0.13에서는 timeout/network 예외가 httpx.HTTPError의 subclass가 아니므로(httpcore 예외) 직접 나열함
+TIMEOUT_ERRORS = (httpx.ConnectTimeout, httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout)
+REQUEST_ERRORS = (httpx.HTTPError, httpx.NetworkError, httpx.ProtocolError)
+
+
+@dataclass
+class HTTPClientConfig:
+    """Backend별로 유지되는 httpx.AsyncClient의 connection pool 설정"""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+    write_timeout: float = 5.0
+    pool_timeout: float = 3.0
+    http2: bool = True
+
+
+def _build_client_kwargs(config: HTTPClientConfig) -> dict:
+    # (connect, read, write, pool) tuple 형태는 httpx 0.13 ~ 최신 버전 모두에서 동작함
+    timeout = httpx.Timeout((config.connect_timeout, config.read_timeout, config.write_timeout, config.pool_timeout))
+    if hasattr(httpx, "Limits"):  # httpx >= 0.18
+        limits = {
+            "limits": httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            )
+        }
+    else:  # googletrans 3.1.0a0이 고정하는 httpx 0.13.x. keepalive_expiry는 설정 불가
+        limits = {
+            "pool_limits": httpx.PoolLimits(
+                max_keepalive=config.max_keepalive_connections, max_connections=config.max_connections
+            )
+        }
+
+    return {"http2": config.http2 and HTTP2_AVAILABLE, "timeout": timeout, **limits}
+
+
+def _count_connections(client: httpx.AsyncClient) -> Optional[int]:
+    """현재 pool에 열려있는 connection 수. httpx/httpcore 버전마다 내부 구조가 달라 best-effort로 셈"""
+    transport = getattr(client, "_transport", None) or getattr(client, "transport", None)  # httpx 0.13: .transport
+    pool = getattr(transport, "_pool", transport)  # httpx >= 0.18: transport._pool(httpcore.AsyncConnectionPool)
+    connections = getattr(pool, "connections", None)
+    if connections is not None:
+        return len(connections)
+    connections = getattr(pool, "_connections", None)  # httpcore 0.9: {origin: set(connection)}
+    if isinstance(connections, dict):
+        return sum(len(conns) for conns in connections.values())
+    return None
+
+
+class HTTPClientRegistry:
+    """Backend(service name)별로 하나의 httpx.AsyncClient를 app 수명동안 유지하는 registry
+    - 매 요청마다 client를 새로 만들면 TCP/TLS handshake를 매번 다시 하게 되므로,
+      connection pool을 공유해서 keep-alive connection을 재사용함
+    - FastAPI lifespan에서 start() / aclose()를 호출
+    """
+
+    def __init__(self, config: Optional[HTTPClientConfig] = None):
+        self.config = config if config is not None else load_config(HTTPClientConfig, "http")
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._request_counts: dict[str, int] = {}
+        self.started = False
+
+    def start(self):
+        self.started = True
+        logger.info(f"HTTP client registry started (http2={self.config.http2 and HTTP2_AVAILABLE})")
+
+    def get(self, service_name: str) -> httpx.AsyncClient:
+        """service_name에 해당하는 client를 리턴. 없으면 생성
+        lifespan 밖(스크립트 등)에서 호출되더라도 동작하도록 lazy하게 생성함
+        """
+        client = self._clients.get(service_name)
+        if client is None:
+            client = httpx.AsyncClient(**_build_client_kwargs(self.config))
+            self._clients[service_name] = client
+            self._request_counts[service_name] = 0
+        self._request_counts[service_name] += 1
+        return client
+
+    async def aclose(self):
+        for service_name, client in self._clients.items():
+            await client.aclose()
+            logger.info(f"HTTP client for {service_name} closed")
+        self._clients.clear()
+        self.started = False
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "config": self.config.__dict__,
+            "http2_available": HTTP2_AVAILABLE,
+            "clients": {
+                service_name: {
+                    "requests": self._request_counts[service_name],
+                    "open_connections": _count_connections(client),
+                }
+                for service_name, client in self._clients.items()
+            },
+        }
+
+
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+
+
+@dataclass
+class ExecutorConfig:
+    """Blocking 함수 실행용 thread pool 설정
+    - max_workers: 동시에 실행되는 blocking 호출 수
+    - max_pending: 실행 중 + 대기 중인 호출 수의 상한. 넘으면 대기하다가 timeout으로 실패
+    - timeout: 호출 1건당 기본 timeout(초). 대기 시간 포함
+    """
+
+    max_workers: int = 8
+    max_pending: int = 64
+    timeout: float = 5.0
+
+
+class BlockingCallExecutor:
+    """googletrans처럼 동기(blocking) I/O를 하는 함수를 event loop 밖의 thread pool에서 실행시키는 executor
+    - async 함수 안에서 blocking 함수를 바로 호출하면 그동안 uvicorn worker 전체가 멈추므로 이를 사용
+    - timeout이 나더라도 이미 thread에서 실행 중인 호출은 끝까지 실행됨(결과만 버림)
+    """
+
+    def __init__(self, name: str, config: Optional[ExecutorConfig] = None):
+        self.name = name
+        self.config = config if config is not None else load_config(ExecutorConfig, f"executor_{name}")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.n_calls = 0
+        self.n_timeouts = 0
+        self.n_errors = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.config.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.max_pending)
+        return self._semaphore
+
+    async def _run(self, func: Callable, *args):
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None):
+        """func(*args)를 thread pool에서 실행하고 결과를 리턴
+        timeout(초과 시 asyncio.TimeoutError) 이 주어지지 않으면 config.timeout을 사용
+        """
+        timeout = self.config.timeout if timeout is None else timeout
+        self.n_calls += 1
+        try:
+            return await asyncio.wait_for(self._run(func, *args), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.n_timeouts += 1
+            logger.warning(f"[{self.name}] '{getattr(func, '__name__', func)}' timed out after {timeout}s")
+            raise
+        except Exception:
+            self.n_errors += 1
+            raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+    def stats(self) -> dict:
+        semaphore = self._semaphore
+        return {
+            "config": self.config.__dict__,
+            "in_flight": 0 if semaphore is None else self.config.max_pending - semaphore._value,
+            "calls": self.n_calls,
+            "timeouts": self.n_timeouts,
+            "errors": self.n_errors,
+        }
+
+
+google_executor = BlockingCallExecutor("google")
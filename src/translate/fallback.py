@@ -0,0 +1,203 @@
+"""main backend(Papago/DeepL)가 실패하거나 느릴 때 Google API로 fallback하는 방식(policy)
+- sequential: main backend가 완전히 실패한 뒤에 Google API로 번역(기존 동작)
+- hedged: main backend가 평소 latency(percentile)보다 오래 걸리면 Google API 요청도 보내고, 먼저 성공한 결과를 사용
+- race: 처음부터 둘 다 보내고 먼저 성공한 결과를 사용. 나머지 요청은 취소
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+from src.common.metrics import FALLBACKS, SERVED, timed_stage
+from src.common.models import StrEnum, TranslatorType
+from src.translate.latency import LatencyTracker, backend_latency
+from src.translate.translator import Translator
+
+
+class FallbackMode(StrEnum):
+    sequential = "sequential"
+    hedged = "hedged"
+    race = "race"
+
+
+@dataclass
+class FallbackConfig:
+    """- hedge_percentile: main backend latency의 이 percentile만큼 기다린 뒤에도 응답이 없으면 Google API 요청 시작
+    - hedge_min_delay, hedge_max_delay: hedge 대기 시간(초)의 하한/상한
+    - hedge_default_delay: latency 표본이 min_samples개보다 적을 때의 hedge 대기 시간(초)
+    """
+
+    mode: FallbackMode = FallbackMode.sequential
+    hedge_percentile: float = 0.95
+    hedge_min_delay: float = 0.1
+    hedge_max_delay: float = 3.0
+    hedge_default_delay: float = 1.0
+    min_samples: int = 20
+
+
+class FallbackPolicy:
+    """main translator와 fallback translator(Google)로 번역하는 방식을 정함
+    run()은 (translated_text, status_msg, 결과를 만든 translator_type) 를 리턴
+    """
+
+    def __init__(self, config: Optional[FallbackConfig] = None, latency_tracker: Optional[LatencyTracker] = None):
+        self.config = config if config is not None else load_config(FallbackConfig, "fallback")
+        self.latency_tracker = latency_tracker if latency_tracker is not None else backend_latency
+
+        self.served_by: dict[str, int] = {}  # 결과를 만든 backend별 요청 수
+        self.n_requests = 0
+        self.n_fallbacks = 0  # main backend가 실패해서 Google API를 사용한 수
+        self.n_hedges = 0  # main backend가 느려서 Google API 요청을 추가로 보낸 수
+        self.n_failed = 0
+
+    def hedge_delay(self, translator: Translator) -> float:
+        histogram = self.latency_tracker.get(translator.SERVICE_NAME)
+        if histogram.count() < self.config.min_samples:
+            return self.config.hedge_default_delay
+        delay = histogram.percentile(self.config.hedge_percentile)
+        return min(max(delay, self.config.hedge_min_delay), self.config.hedge_max_delay)
+
+    async def run(
+        self,
+        translator: Translator,
+        translator_type: TranslatorType,
+        src_text: str,
+        tgt_lang: Optional[str] = None,
+        fallback_translator: Optional[Translator] = None,
+        mode: Optional[FallbackMode] = None,
+        src_lang: Optional[str] = None,
+    ) -> tuple[Optional[str], Optional[str], TranslatorType]:
+        """src_lang: 이미 감지한 src_text의 언어. 주어지면 main, fallback translator 모두 다시 감지하지 않음"""
+        mode = self.config.mode if mode is None else mode
+        self.n_requests += 1
+
+        if fallback_translator is None:
+            translated_text, status_msg = await translator.run(src_text=src_text, tgt_lang=tgt_lang, src_lang=src_lang)
+            result = (translated_text, status_msg, translator_type)
+        elif mode == FallbackMode.sequential:
+            result = await self._run_sequential(
+                translator, translator_type, src_text, tgt_lang, fallback_translator, src_lang
+            )
+        else:
+            delay = 0.0 if mode == FallbackMode.race else self.hedge_delay(translator)
+            result = await self._run_hedged(
+                translator, translator_type, src_text, tgt_lang, fallback_translator, delay, src_lang
+            )
+
+        translated_text, _, served_translator_type = result
+        if translated_text is None:
+            self.n_failed += 1
+        else:
+            self.served_by[served_translator_type] = self.served_by.get(served_translator_type, 0) + 1
+            SERVED.inc(served_translator_type)
+            logger.info("Served by %s (%s)", served_translator_type, mode)
+        return result
+
+    async def _run_sequential(
+        self,
+        translator: Translator,
+        translator_type: TranslatorType,
+        src_text: str,
+        tgt_lang: Optional[str],
+        fallback_translator: Translator,
+        src_lang: Optional[str] = None,
+    ) -> tuple[Optional[str], Optional[str], TranslatorType]:
+        translated_text, status_msg = await translator.run(src_text=src_text, tgt_lang=tgt_lang, src_lang=src_lang)
+        if translated_text is not None:
+            return translated_text, status_msg, translator_type
+
+        logger.error("%s API failed. Try Google API", translator_type)
+        self.n_fallbacks += 1
+        FALLBACKS.inc(translator_type, "failed")
+        translated_text, _ = await self._run_fallback(fallback_translator, src_text, tgt_lang, src_lang)
+        return translated_text, self._merge_status_msg(status_msg, translated_text), TranslatorType.google
+
+    async def _run_hedged(
+        self,
+        translator: Translator,
+        translator_type: TranslatorType,
+        src_text: str,
+        tgt_lang: Optional[str],
+        fallback_translator: Translator,
+        delay: float,
+        src_lang: Optional[str] = None,
+    ) -> tuple[Optional[str], Optional[str], TranslatorType]:
+        """main backend 요청을 먼저 보내고, delay(초) 안에 응답이 없으면 Google API 요청도 보냄
+        먼저 성공한 결과를 사용하고 나머지 요청은 취소. delay=0 이면 race
+        """
+        main_task = asyncio.create_task(translator.run(src_text=src_text, tgt_lang=tgt_lang, src_lang=src_lang))
+        fallback_task: Optional[asyncio.Task] = None
+        try:
+            if delay > 0:
+                await asyncio.wait({main_task}, timeout=delay)
+                if main_task.done():
+                    translated_text, status_msg = main_task.result()
+                    if translated_text is not None:
+                        return translated_text, status_msg, translator_type
+                    logger.error("%s API failed. Try Google API", translator_type)
+                    self.n_fallbacks += 1
+                    FALLBACKS.inc(translator_type, "failed")
+                else:
+                    logger.warning("%s API is slower than %.3fs. Send Google API request too", translator_type, delay)
+                    self.n_hedges += 1
+                    FALLBACKS.inc(translator_type, "hedged")
+            else:
+                FALLBACKS.inc(translator_type, "race")
+            fallback_task = asyncio.create_task(self._run_fallback(fallback_translator, src_text, tgt_lang, src_lang))
+
+            pending = {main_task, fallback_task}
+            status_msg = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 둘이 같이 끝났다면 main backend 결과를 우선함
+                for task in sorted(done, key=lambda task: task is not main_task):
+                    translated_text, task_status_msg = task.result()
+                    if task is main_task:
+                        status_msg = task_status_msg
+                        if translated_text is not None:
+                            return translated_text, task_status_msg, translator_type
+                    elif translated_text is not None:
+                        # main backend가 아직 응답하지 않았다면 status_msg는 None
+                        return (
+                            translated_text,
+                            self._merge_status_msg(status_msg, translated_text),
+                            TranslatorType.google,
+                        )
+
+            return None, self._merge_status_msg(status_msg, None), TranslatorType.google
+
+        finally:
+            for task in (main_task, fallback_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    async def _run_fallback(
+        fallback_translator: Translator, src_text: str, tgt_lang: Optional[str], src_lang: Optional[str] = None
+    ) -> tuple[Optional[str], Optional[str]]:
+        with timed_stage("fallback"):
+            return await fallback_translator.run(src_text=src_text, tgt_lang=tgt_lang, src_lang=src_lang)
+
+    @staticmethod
+    def _merge_status_msg(status_msg: Optional[str], fallback_translated_text: Optional[str]) -> Optional[str]:
+        if fallback_translated_text is None:
+            logger.error("Google API also failed")
+            return (status_msg or "") + "<br/>Google API also failed"
+        if status_msg is None:
+            return None
+        return status_msg + "<br/>But translate it by Google API"
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.config.mode,
+            "requests": self.n_requests,
+            "served_by": dict(self.served_by),
+            "fallbacks": self.n_fallbacks,
+            "hedges": self.n_hedges,
+            "failed": self.n_failed,
+            "latency": self.latency_tracker.stats(),
+        }
+
+
+fallback_policy = FallbackPolicy()
@@ -0,0 +1,301 @@
+"""번역하지 않고 원문 그대로 둘 용어(glossary)를 처리하는 모듈
+- 번역 전에 용어를 placeholder([#0], [#1], ...)로 바꿔서(mask) backend로 보내고, 번역 후 원래 용어로 되돌림(unmask)
+- 용어 찾기는 Aho–Corasick 자동자를 한 번만 만들어두고 text를 한 번 훑어서 찾음. 용어 수와 관계없이 text 길이에 비례
+"""
+import hashlib
+import re
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+from src.common.utils import load_obj
+from src.translate.snapshot import data_snapshot
+
+
+@dataclass
+class GlossaryConfig:
+    """- term_files: term_dir 안의 용어 파일들(한 줄에 용어 하나). ','로 구분
+    - src_langs: glossary를 적용할 원문 언어들. ','로 구분
+    - max_cached: 사용자 용어집별로 만든 Glossary를 보관하는 수(LRU)
+    - max_user_terms: 사용자 용어집 하나의 최대 용어 수. 넘는 용어는 무시
+    - deepl_native: DeepL은 용어를 placeholder로 바꾸는 대신 DeepL glossary API에 등록해서 사용
+    """
+
+    enabled: bool = True
+    term_dir: str = "data/term_set"
+    term_files: str = "ml_terms_google_picked.txt,ml_terms_manual.txt"
+    src_langs: str = "en"
+    max_cached: int = 256
+    max_user_terms: int = 5000
+    deepl_native: bool = True
+
+
+def _casefold(text: str) -> str:
+    """글자 수가 바뀌지 않는 소문자 변환. 'İ'.lower()처럼 길이가 바뀌는 글자는 그대로 둠"""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(char_lower if len(char_lower := char.lower()) == 1 else char for char in text)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class TermMatcher:
+    """Aho–Corasick 자동자로 여러 용어를 text 한 번 훑어서 찾음
+    - 대소문자: 대문자가 들어간 용어(BLEU, Keras)는 대소문자가 같아야 하고, 소문자로만 된 용어(transformer)는 구분하지 않음
+    - 단어 경계: 용어 앞뒤가 글자/숫자/_ 이면 매칭하지 않음(ex. 'mask'는 'masks', 'unmask'에서 찾지 않음)
+    - 겹치는 경우: 먼저 시작하는 것, 같으면 긴 것을 선택(ex. 'self-attention masks' > 'self-attention')
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: list[str] = []
+        self._case_sensitive: list[bool] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[int] = [-1]  # node에서 끝나는 용어의 index
+        self._output_link: list[int] = [0]  # fail link를 따라가며 만나는, 용어가 끝나는 가장 가까운 node(0이면 없음)
+
+        for term in dict.fromkeys(term.strip() for term in terms):
+            if term:
+                self._add(term)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _add(self, term: str):
+        node = 0
+        for char in _casefold(term):
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._output_link.append(0)
+            node = next_node
+
+        if self._output[node] == -1:
+            self._output[node] = len(self.terms)
+            self.terms.append(term)
+            self._case_sensitive.append(term != _casefold(term))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                child_fail = self._goto[fail].get(char, 0)
+                self._fail[child] = child_fail if child_fail != child else 0
+                self._output_link[child] = (
+                    self._fail[child] if self._output[self._fail[child]] != -1 else self._output_link[self._fail[child]]
+                )
+
+    def find(self, text: str) -> list[tuple[int, int]]:
+        """text에서 찾은 용어들의 (start, end) 목록. 서로 겹치지 않고 start 순서"""
+        if not self.terms:
+            return []
+
+        folded = _casefold(text)
+        candidates = []
+        goto, fail, output, output_link = self._goto, self._fail, self._output, self._output_link
+        node = 0
+        for idx, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            match_node = node if output[node] != -1 else output_link[node]
+            while match_node:
+                term_idx = output[match_node]
+                start = idx + 1 - len(self.terms[term_idx])
+                if self._is_valid_match(text, start, idx + 1, term_idx):
+                    candidates.append((start, idx + 1))
+                match_node = output_link[match_node]
+
+        candidates.sort(key=lambda span: (span[0], -span[1]))
+        spans, last_end = [], 0
+        for start, end in candidates:
+            if start >= last_end:
+                spans.append((start, end))
+                last_end = end
+        return spans
+
+    def _is_valid_match(self, text: str, start: int, end: int, term_idx: int) -> bool:
+        if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+            return False
+        if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+            return False
+        return not self._case_sensitive[term_idx] or text[start:end] == self.terms[term_idx]
+
+
+def hash_terms(terms: Iterable[str]) -> str:
+    return hashlib.blake2b("\n".join(sorted(terms)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class MaskedText(NamedTuple):
+    text: str  # 용어가 placeholder로 바뀐 text
+    terms: list[str]  # placeholder index별 원문 용어
+
+
+class Glossary:
+    PLACEHOLDER_FORMAT = "[#{}]"
+    PLACEHOLDER_PATTERN = re.compile(r"\[\s*#\s*(\d+)\s*\]")
+
+    def __init__(self, terms: Iterable[str], src_langs: Iterable[str] = ("en",), matcher: Optional[TermMatcher] = None):
+        """matcher: terms로 미리 만들어둔 자동자(data snapshot). 주어지면 terms는 사용하지 않음"""
+        self.matcher = matcher if matcher is not None else TermMatcher(terms)
+        self.src_langs = frozenset(src_langs)
+        # cache key에 들어가는 version. 용어 목록이 바뀌면 이전 번역 결과를 쓰지 않도록 내용의 hash를 사용
+        self.version = hash_terms(self.matcher.terms) if self.matcher.terms else ""
+
+    def __len__(self) -> int:
+        return len(self.matcher)
+
+    def applies_to(self, src_lang: str) -> bool:
+        return len(self.matcher) > 0 and src_lang in self.src_langs
+
+    def mask(self, text: str) -> MaskedText:
+        """용어를 placeholder로 바꿈. 같은 용어는 같은 placeholder를 사용
+        원문에 이미 placeholder 형태의 문자열이 있으면 되돌릴 때 구분할 수 없으므로 바꾸지 않음
+        """
+        spans = self.matcher.find(text)
+        if not spans or self.PLACEHOLDER_PATTERN.search(text):
+            return MaskedText(text, [])
+
+        term_to_idx: dict[str, int] = {}
+        pieces, last_end = [], 0
+        for start, end in spans:
+            term = text[start:end]
+            term_idx = term_to_idx.setdefault(term, len(term_to_idx))
+            pieces.append(text[last_end:start])
+            pieces.append(self.PLACEHOLDER_FORMAT.format(term_idx))
+            last_end = end
+        pieces.append(text[last_end:])
+        return MaskedText("".join(pieces), list(term_to_idx))
+
+    @classmethod
+    def unmask(cls, translated_text: str, terms: list[str]) -> Optional[str]:
+        """placeholder를 원래 용어로 되돌림. backend가 placeholder를 빠뜨렸거나 바꿔버렸으면 None"""
+        if not terms:
+            return translated_text
+
+        restored_indices = set()
+
+        def _restore(match: re.Match) -> str:
+            term_idx = int(match.group(1))
+            if term_idx >= len(terms):
+                return match.group()
+            restored_indices.add(term_idx)
+            return terms[term_idx]
+
+        restored_text = cls.PLACEHOLDER_PATTERN.sub(_restore, translated_text)
+        if len(restored_indices) != len(terms):
+            return None
+        return restored_text
+
+
+def read_term_files(term_dir: Path, filenames: Iterable[str]) -> list[str]:
+    terms = []
+    for filename in filenames:
+        terms.extend(load_obj(term_dir / filename))
+    return terms
+
+
+def load_base_glossary(config: GlossaryConfig) -> Glossary:
+    """모든 사용자에게 공통으로 적용되는 용어집(data/term_set)을 불러옴
+    기본 term_dir이면 data snapshot에 미리 만들어둔 자동자나 용어 목록을 사용
+    """
+    src_langs = [lang.strip() for lang in config.src_langs.split(",") if lang.strip()]
+    if not config.enabled:
+        return Glossary([], src_langs)
+
+    filenames = tuple(filename.strip() for filename in config.term_files.split(",") if filename.strip())
+    matcher, term_sets = None, None
+    if Path(config.term_dir) == Path(GlossaryConfig.term_dir):
+        matcher = (data_snapshot.get("base_matchers") or {}).get(filenames)
+        term_sets = data_snapshot.get("term_sets")
+
+    if matcher is not None:
+        glossary = Glossary([], src_langs, matcher=matcher)
+    elif term_sets is not None and all(filename in term_sets for filename in filenames):
+        glossary = Glossary([term for filename in filenames for term in term_sets[filename]], src_langs)
+    else:
+        glossary = Glossary(read_term_files(Path(config.term_dir), filenames), src_langs)
+    logger.info(f"Load base glossary: {len(glossary)} terms (version: {glossary.version})")
+    return glossary
+
+
+class GlossaryRegistry:
+    """사용자 용어집(UserOption.user_defined_terms)별로 base glossary와 합친 Glossary를 만들어 재사용
+    - 용어 목록의 내용 hash를 key로 하므로, 같은 용어 목록을 보내는 요청들은 자동자를 한 번만 만듦
+    - 최근에 사용된 max_cached개만 보관(LRU)
+    - base glossary는 처음 사용할 때 불러옴
+    """
+
+    def __init__(self, config: Optional[GlossaryConfig] = None):
+        self.config = config if config is not None else load_config(GlossaryConfig, "glossary")
+        self._base: Optional[Glossary] = None
+        self._glossaries: OrderedDict[str, Glossary] = OrderedDict()
+
+        self.n_compiles = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def base(self) -> Glossary:
+        if self._base is None:
+            self._base = load_base_glossary(self.config)
+        return self._base
+
+    def get(self, user_terms: Optional[Iterable[str]] = None) -> Glossary:
+        if not self.config.enabled or not user_terms:
+            return self.base
+
+        user_terms = sorted({term.strip() for term in user_terms if term and term.strip()})
+        if len(user_terms) > self.config.max_user_terms:
+            logger.warning(f"Too many user defined terms({len(user_terms)}). Use first {self.config.max_user_terms}")
+            user_terms = user_terms[: self.config.max_user_terms]
+        if not user_terms:
+            return self.base
+
+        key = hash_terms(user_terms)
+        glossary = self._glossaries.get(key)
+        if glossary is not None:
+            self._glossaries.move_to_end(key)
+            self.hits += 1
+            return glossary
+
+        self.misses += 1
+        self.n_compiles += 1
+        glossary = Glossary(self.base.matcher.terms + user_terms, self.base.src_langs)
+        self._glossaries[key] = glossary
+        if len(self._glossaries) > self.config.max_cached:
+            self._glossaries.popitem(last=False)
+        return glossary
+
+    def stats(self) -> dict:
+        n_lookups = self.hits + self.misses
+        return {
+            "enabled": self.config.enabled,
+            "base_terms": len(self.base),
+            "base_version": self.base.version,
+            "entries": len(self._glossaries),
+            "compiles": self.n_compiles,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / n_lookups if n_lookups else 0.0,
+        }
+
+
+glossary_registry = GlossaryRegistry()
@@ -0,0 +1,246 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.common.config import load_config
+from src.translate.snapshot import data_snapshot
+from src.translate.utils import count_scripts
+
+LANG_PROFILE_DIR = Path("data/lang_profile")
+
+# 문자 체계만 보고 언어를 (거의) 확정할 수 있는 경우: script -> (lang, confidence)
+SCRIPT_TO_LANG = {
+    "Hangul": ("ko", 0.99),
+    "Greek": ("el", 0.99),
+    "Armenian": ("hy", 0.99),
+    "Georgian": ("ka", 0.99),
+    "Thai": ("th", 0.99),
+    "Lao": ("lo", 0.99),
+    "Khmer": ("km", 0.99),
+    "Myanmar": ("my", 0.99),
+    "Sinhala": ("si", 0.99),
+    "Thaana": ("dv", 0.99),
+    "Tamil": ("ta", 0.99),
+    "Telugu": ("te", 0.99),
+    "Kannada": ("kn", 0.99),
+    "Malayalam": ("ml", 0.99),
+    "Gujarati": ("gu", 0.99),
+    "Gurmukhi": ("pa", 0.99),
+    "Oriya": ("or", 0.99),
+    "MeeteiMayek": ("mni-Mtei", 0.99),
+    "Mongolian": ("mn", 0.9),
+    "Hebrew": ("he", 0.9),  # Yiddish(yi)도 Hebrew 문자를 씀
+    "Ethiopic": ("am", 0.8),  # Tigrinya(ti)도 Ethiopic 문자를 씀
+    "Devanagari": ("hi", 0.6),  # mr, ne, sa, mai, bho, doi, gom 도 Devanagari 문자를 씀
+}
+
+# 같은 문자 체계를 쓰는 언어들을 구분하는 특징 문자: script -> [(lang, chars)]. 앞에 있는 것이 우선
+DISTINCT_CHARS = {
+    "Cyrillic": [
+        ("uk", "іїєґ"),
+        ("be", "ў"),
+        ("kk", "әғқңұһ"),
+        ("tg", "ӣҳҷӯ"),
+        ("mk", "ѓќѕ"),
+        ("sr", "ђћ"),
+        ("ky", "ңөү"),
+        ("ru", "ыэё"),
+    ],
+    "Arabic": [
+        ("ug", "ېۆۈۇڭ"),
+        ("ckb", "ڕڵێ"),
+        ("ps", "ټډړږښګڼۍ"),
+        ("sd", "ڀٻڄڃڇڊڌڏڙ"),
+        ("ur", "ٹڈڑںے"),
+        ("fa", "پچژگکی"),
+    ],
+    "Bengali": [("as", "ৰৱ")],
+}
+# 특징 문자가 없을 때의 기본값
+SCRIPT_DEFAULT_LANG = {"Cyrillic": ("ru", 0.6), "Arabic": ("ar", 0.8), "Bengali": ("bn", 0.9)}
+
+# 간체/번체 구분용 문자. 둘 다 없으면 간체로 간주
+SIMPLIFIED_CHARS = set("这们说国个时对会为发动过后开还进见机关问长门现实车东书业报")
+TRADITIONAL_CHARS = set("這們說國個時對會為發動過後開還進見機關問長門現實車東書業報")
+
+
+@dataclass
+class NgramPrediction:
+    """- confidence: 모델에 있는 언어들 사이의 상대적인 확률. 모델에 없는 언어의 text도 비슷한 언어로 높게 나올 수 있음
+    - avg_log_prob: lang 기준 n-gram 하나당 평균 log-likelihood(모델에 없는 n-gram 포함).
+        모델에 없는 언어이거나 단어가 아닌 text(약어, 이름 등)이면 낮음
+    - n_ngrams: text에서 뽑은 n-gram 수
+    """
+
+    lang: str
+    confidence: float
+    avg_log_prob: float
+    n_ngrams: int
+
+
+@dataclass
+class DetectResult:
+    lang: Optional[str]
+    confidence: float
+    script: Optional[str] = None
+
+
+class CharNgramModel:
+    """Latin 문자를 쓰는 언어들을 구분하기 위한 character n-gram(1~n_max) naive bayes 모델
+    - 언어별로 빈도 상위 profile_size개의 n-gram만 유지하는 compact한 모델
+    - sharpness: confidence 계산 시 n-gram당 평균 log-likelihood 차이를 얼마나 크게 볼지.
+        benchmarks/bench_lang_detect.py 의 평가 데이터(모델에 없는 언어 포함)에서
+        min_confidence를 넘는 결과가 모두 맞도록 정함
+    """
+
+    WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+    def __init__(
+        self,
+        corpus: dict[str, str],
+        n_max: int = 4,
+        profile_size: int = 1000,
+        smoothing: float = 0.5,
+        sharpness: float = 11.0,
+    ):
+        self.n_max = n_max
+        self.sharpness = sharpness
+        self.langs = list(corpus.keys())
+
+        profiles = [dict(Counter(self.extract_ngrams(corpus[lang])).most_common(profile_size)) for lang in self.langs]
+        denominators = [sum(profile.values()) + smoothing * profile_size for profile in profiles]
+        unseen_log_probs = [math.log(smoothing / denominator) for denominator in denominators]
+        self._unseen_log_probs = unseen_log_probs
+
+        # ngram -> 언어별 log probability. 언어 순서는 self.langs를 따름
+        self._log_probs: dict[str, list[float]] = {}
+        for lang_idx, profile in enumerate(profiles):
+            for ngram, count in profile.items():
+                if ngram not in self._log_probs:
+                    self._log_probs[ngram] = list(unseen_log_probs)
+                self._log_probs[ngram][lang_idx] = math.log((count + smoothing) / denominators[lang_idx])
+
+    @classmethod
+    def from_tsv(cls, file_path: Path, **kwargs) -> "CharNgramModel":
+        """lang<TAB>text 형태의 tsv 파일로 모델 생성. 같은 lang의 line은 이어붙임"""
+        corpus = {}
+        with open(file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                lang, text = line.rstrip("\n").split("\t", 1)
+                corpus[lang] = corpus.get(lang, "") + " " + text
+        return cls(corpus, **kwargs)
+
+    def extract_ngrams(self, text: str) -> list[str]:
+        ngrams = []
+        for word in self.WORD_PATTERN.findall(text.lower()):
+            padded = f" {word} "
+            for n in range(1, self.n_max + 1):
+                ngrams.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+        return [ngram for ngram in ngrams if ngram != " "]
+
+    def predict(self, text: str) -> Optional[NgramPrediction]:
+        """confidence가 가장 높은 언어. 모델에 있는 n-gram이 하나도 없으면 None"""
+        log_probs = self._log_probs
+        ngrams = self.extract_ngrams(text)
+        rows = [log_probs[ngram] for ngram in ngrams if ngram in log_probs]
+        if not rows:
+            return None
+
+        scores = [sum(column) for column in zip(*rows)]  # 언어별 log-likelihood 합
+
+        # n-gram 개수로 나눈 평균값으로 softmax해야 text 길이와 관계없이 비슷한 scale의 confidence가 나옴
+        max_score = max(scores)
+        exps = [math.exp((score - max_score) / len(rows) * self.sharpness) for score in scores]
+        lang_idx = scores.index(max_score)
+        n_unseen = len(ngrams) - len(rows)
+        return NgramPrediction(
+            lang=self.langs[lang_idx],
+            confidence=exps[lang_idx] / sum(exps),
+            avg_log_prob=(max_score + n_unseen * self._unseen_log_probs[lang_idx]) / len(ngrams),
+            n_ngrams=len(ngrams),
+        )
+
+
+@dataclass
+class LangDetectConfig:
+    """- min_confidence: 이 값보다 confidence가 낮으면 remote(Google) detect를 사용
+    - char_num_to_check: 앞에서부터 몇 글자를 보고 판단할지
+    - min_latin_letters: Latin 문자 text의 글자 수가 이보다 적으면 그 비율만큼 confidence를 낮춤(ex. "OK")
+    - min_avg_log_prob: n-gram당 평균 log-likelihood가 이보다 낮으면 모델에 없는 언어나 단어가 아닌 text로 보고
+        confidence를 낮춤. benchmarks/bench_lang_detect.py 의 평가 데이터 중 가장 낮은 값(-7.2) 근처로 정함
+    - min_han_chars: 한자만 있는 text가 이보다 짧으면 중국어/일본어를 구분할 수 없으므로 remote detect를 사용(ex. "東京")
+    """
+
+    min_confidence: float = 0.7
+    char_num_to_check: int = 60
+    remote_fallback: bool = True
+    min_latin_letters: int = 15
+    min_avg_log_prob: float = -7.3
+    min_han_chars: int = 8
+
+
+class LangDetector:
+    """네트워크 없이 동작하는 언어 감지기
+    1. 문자 체계(Unicode block)로 언어를 판단 (한글, 가나, 키릴 문자 등)
+    2. Latin 문자인 경우 character n-gram 모델로 판단
+    code는 data/support_lang/code_to_lang.tsv 의 code를 따름
+    """
+
+    def __init__(self, ngram_model: Optional[CharNgramModel] = None, config: Optional[LangDetectConfig] = None):
+        self._ngram_model = ngram_model
+        self.config = config if config is not None else load_config(LangDetectConfig, "lang_detect")
+
+    @property
+    def ngram_model(self) -> CharNgramModel:
+        if self._ngram_model is None:
+            self._ngram_model = data_snapshot.get("latin_ngram_model")
+        if self._ngram_model is None:
+            self._ngram_model = CharNgramModel.from_tsv(LANG_PROFILE_DIR / "latin_corpus.tsv")
+        return self._ngram_model
+
+    def detect(self, text: str) -> DetectResult:
+        text = text[: self.config.char_num_to_check]
+        script_counts = count_scripts(text)
+        if not script_counts:
+            return DetectResult(lang=None, confidence=0.0)
+
+        # 한글이나 가나가 한 글자라도 있으면 다른 문자보다 우선함(ex. 한자나 영어가 섞인 한국어/일본어 문장)
+        if "Hangul" in script_counts:
+            return DetectResult(lang="ko", confidence=0.99, script="Hangul")
+        if "Hiragana" in script_counts or "Katakana" in script_counts:
+            return DetectResult(lang="ja", confidence=0.99, script="Kana")
+
+        script = script_counts.most_common(1)[0][0]
+        if script == "Latin":
+            prediction = self.ngram_model.predict(text)
+            if prediction is None:
+                return DetectResult(lang=None, confidence=0.0, script=script)
+            # posterior는 모델에 있는 언어들 사이의 비교일 뿐이므로, 근거(글자 수, likelihood)가 부족하면 낮춤
+            confidence = prediction.confidence * min(1.0, script_counts["Latin"] / self.config.min_latin_letters)
+            confidence *= math.exp(min(0.0, prediction.avg_log_prob - self.config.min_avg_log_prob))
+            return DetectResult(lang=prediction.lang, confidence=confidence, script=script)
+
+        if script == "Han":
+            n_simplified = sum(char in SIMPLIFIED_CHARS for char in text)
+            n_traditional = sum(char in TRADITIONAL_CHARS for char in text)
+            lang = "zh-TW" if n_traditional > n_simplified else "zh-CN"
+            # 짧은 한자 text는 일본어일 수도 있고(ex. 東京), 간체/번체 구분 문자가 없으면 어느 쪽인지 알 수 없음
+            if script_counts["Han"] < self.config.min_han_chars or n_simplified == n_traditional:
+                return DetectResult(lang=lang, confidence=0.5, script=script)
+            return DetectResult(lang=lang, confidence=0.9, script=script)
+
+        if script in DISTINCT_CHARS:
+            for lang, chars in DISTINCT_CHARS[script]:
+                if any(char in chars for char in text):
+                    return DetectResult(lang=lang, confidence=0.9, script=script)
+            lang, confidence = SCRIPT_DEFAULT_LANG[script]
+            return DetectResult(lang=lang, confidence=confidence, script=script)
+
+        lang, confidence = SCRIPT_TO_LANG.get(script, (None, 0.0))
+        return DetectResult(lang=lang, confidence=confidence, script=script)
+
+
+lang_detector = LangDetector()
@@ -0,0 +1,185 @@
+"""언어 code 정규화 + backend별 지원 언어 index
+- 여러 형태의 code(대소문자, '_' 구분자, region subtag, zh-Hant 같은 별칭, Google detect의 iw/jw 등)를
+    backend마다 실제로 보낼 code로 바꾸는 표를 시작할 때 한 번 만들어둠
+- backend x src x tgt 지원 여부를 dict 조회로 판단하므로, network 요청 전에 사용할 backend를 고를 수 있음
+- 지원 언어 목록은 data snapshot(src.translate.snapshot)이 있으면 거기서 읽고, backend별 표는 처음 사용할 때 만듦
+"""
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.common.models import TranslatorType
+from src.common.utils import load_obj
+from src.translate.snapshot import data_snapshot
+
+SUPPORT_LANG_DIR = Path("data/support_lang")
+
+# 같은 언어를 가리키는 다른 표기 -> 기준 code(code_to_lang.tsv). key는 normalize_code()를 거친 값
+LANG_ALIASES = {
+    "zh-hant": "zh-TW",
+    "zh-hk": "zh-TW",
+    "zh-mo": "zh-TW",
+    "zh-hans": "zh-CN",
+    "zh-sg": "zh-CN",
+    "iw": "he",  # Google detect가 옛 code를 리턴하기도 함
+    "jw": "jv",
+    "in": "id",
+    "ji": "yi",
+}
+# 기준 code가 backend에 없을 때 시도해볼 같은 언어의 다른 code
+LANG_EQUIVALENTS = {
+    "no": ["nb"],
+    "nb": ["no"],
+    "fil": ["tl"],
+    "tl": ["fil"],
+}
+
+
+def normalize_code(code: str) -> str:
+    """비교용 code 형태: 소문자, '-' 구분자. ex. 'EN_US' -> 'en-us', 'zh-TW' -> 'zh-tw'"""
+    return code.strip().replace("_", "-").lower()
+
+
+class LanguageIndex:
+    MAX_CODES = 4096  # backend, 방향별로 저장해두는 code 표기 수 상한
+
+    def __init__(
+        self,
+        support_langs: dict[TranslatorType, tuple[Iterable[str], Iterable[str]]],
+        lang_names: dict[str, str],
+    ):
+        """
+        support_langs: backend -> (지원하는 src code들, 지원하는 tgt code들). backend에 실제로 보낼 형태의 code
+        lang_names: 기준 code -> 언어 이름
+        """
+        self.lang_names = {normalize_code(code): name for code, name in lang_names.items()}
+        self._canonical = {normalize_code(code): code for code in lang_names}
+
+        self.backends = list(support_langs)
+        self._support_langs = {
+            (backend, direction): codes
+            for backend, (src_codes, tgt_codes) in support_langs.items()
+            for direction, codes in (("src", src_codes), ("tgt", tgt_codes))
+        }
+        self._known_codes = set(self._canonical) | set(LANG_ALIASES) | set(LANG_EQUIVALENTS)
+        for src_codes, tgt_codes in support_langs.values():
+            self._known_codes.update(normalize_code(code) for code in (*src_codes, *tgt_codes))
+
+        # (backend, "src"/"tgt") -> normalize_code(표기) -> backend code. 없는 조합은 None으로 저장
+        # 사용하지 않는 backend의 표는 만들지 않도록 _table()에서 처음 조회할 때 만듦
+        self._tables: dict[tuple[TranslatorType, str], dict[str, Optional[str]]] = {}
+        self._supported: dict[tuple[TranslatorType, str], set[str]] = {}
+
+    def _table(self, backend: TranslatorType, direction: str) -> dict[str, Optional[str]]:
+        table = self._tables.get((backend, direction))
+        if table is None:
+            supported = {normalize_code(code): code for code in self._support_langs[(backend, direction)]}
+            table = {code: self._match(code, supported) for code in self._known_codes}
+            self._tables[(backend, direction)] = table
+            self._supported[(backend, direction)] = {code for code, value in table.items() if value}
+        return table
+
+    @classmethod
+    def load(cls) -> "LanguageIndex":
+        """data snapshot이 있으면 snapshot으로, 없으면 data/support_lang 의 파일들로 생성"""
+        sources = data_snapshot.get("support_langs")
+        return cls(*sources) if sources is not None else cls.from_dir()
+
+    @classmethod
+    def from_dir(cls, support_lang_dir: Path = SUPPORT_LANG_DIR) -> "LanguageIndex":
+        return cls(*cls.read_sources(support_lang_dir))
+
+    @staticmethod
+    def read_sources(
+        support_lang_dir: Path = SUPPORT_LANG_DIR,
+    ) -> tuple[dict[TranslatorType, tuple[list[str], list[str]]], dict[str, str]]:
+        """data/support_lang 의 <backend>_src_lang.txt, <backend>_tgt_lang.txt, code_to_lang.tsv 를 읽어서
+        (support_langs, lang_names) 를 리턴
+        """
+        support_langs = {
+            translator_type: (
+                load_obj(support_lang_dir / f"{translator_type}_src_lang.txt"),
+                load_obj(support_lang_dir / f"{translator_type}_tgt_lang.txt"),
+            )
+            for translator_type in TranslatorType.backends()
+        }
+        lang_names = {}
+        with open(support_lang_dir / "code_to_lang.tsv", "r", encoding="utf-8") as file:
+            next(file)  # header
+            for line in file:
+                code, name = line.rstrip("\n").split("\t")[:2]
+                lang_names[code] = name.strip()
+        return support_langs, lang_names
+
+    @staticmethod
+    def _candidates(code: str) -> list[str]:
+        """backend에서 찾아볼 code 후보(우선순위 순). code는 normalize_code()를 거친 값"""
+        candidates = [code]
+        alias = LANG_ALIASES.get(code)
+        if alias is not None:
+            candidates.append(normalize_code(alias))
+        for candidate in list(candidates):
+            base = candidate.split("-")[0]
+            if base != candidate:
+                candidates.append(base)
+        for candidate in list(candidates):
+            candidates.extend(LANG_EQUIVALENTS.get(candidate, []))
+        return list(dict.fromkeys(candidates))
+
+    @classmethod
+    def _match(cls, code: str, supported: dict[str, str]) -> Optional[str]:
+        for candidate in cls._candidates(code):
+            if candidate in supported:
+                return supported[candidate]
+        return None
+
+    def canonical(self, code: str) -> str:
+        """code_to_lang.tsv 의 기준 code. 모르는 code는 정규화만 해서 리턴"""
+        normalized = normalize_code(code)
+        normalized = normalize_code(LANG_ALIASES.get(normalized, normalized))
+        return self._canonical.get(normalized, normalized)
+
+    def language_name(self, code: str) -> str:
+        """언어 이름. 모르는 code면 code를 그대로 리턴"""
+        normalized = normalize_code(code)
+        name = self.lang_names.get(normalized) or self.lang_names.get(normalize_code(LANG_ALIASES.get(normalized, "")))
+        return name if name is not None else code
+
+    def resolve(self, backend: TranslatorType, direction: str, code: str) -> Optional[str]:
+        """code를 backend에 보낼 code로 변환. 지원하지 않으면 None
+        direction: 원문 언어면 "src", 번역 언어면 "tgt"
+        """
+        table = self._table(backend, direction)
+        normalized = normalize_code(code)
+        if normalized in table:
+            return table[normalized]
+
+        # 시작할 때 몰랐던 표기(ex. 'en-au'). 한 번 계산해서 저장(잘못된 code가 계속 쌓이지 않도록 개수 제한)
+        supported = {code: table[code] for code in self._supported[(backend, direction)]}
+        resolved = self._match(normalized, supported)
+        if len(table) < self.MAX_CODES:
+            table[normalized] = resolved
+        return resolved
+
+    def resolve_pair(
+        self, backend: TranslatorType, src_lang: str, tgt_lang: str
+    ) -> tuple[Optional[str], Optional[str]]:
+        return self.resolve(backend, "src", src_lang), self.resolve(backend, "tgt", tgt_lang)
+
+    def supports(self, backend: TranslatorType, src_lang: str, tgt_lang: str) -> bool:
+        src_code, tgt_code = self.resolve_pair(backend, src_lang, tgt_lang)
+        return src_code is not None and tgt_code is not None
+
+    def supported_backends(self, src_lang: str, tgt_lang: str) -> list[TranslatorType]:
+        return [backend for backend in self.backends if self.supports(backend, src_lang, tgt_lang)]
+
+    def best_backend(
+        self, src_lang: str, tgt_lang: str, preferred: Optional[Iterable[TranslatorType]] = None
+    ) -> Optional[TranslatorType]:
+        """preferred 순서(기본: 등록 순서)대로 src_lang -> tgt_lang을 지원하는 첫 backend. 없으면 None"""
+        for backend in preferred if preferred is not None else self.backends:
+            if self.supports(backend, src_lang, tgt_lang):
+                return backend
+        return None
+
+
+lang_index = LanguageIndex.load()
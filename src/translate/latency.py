@@ -0,0 +1,95 @@
+import bisect
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.common.config import load_config
+
+
+@dataclass
+class LatencyConfig:
+    """- window: latency histogram을 갱신하는 주기(초). 최근 2개 구간의 표본만 사용"""
+
+    window: float = 300.0
+
+
+class LatencyHistogram:
+    """backend 요청 latency를 log scale bucket(1ms ~ 60s)에 모아두는 histogram
+    - 장애 중 latency 변화를 반영하도록 latency_window마다 구간을 바꾸고, 직전 구간과 현재 구간만 사용
+    """
+
+    BUCKET_BOUNDS = [0.001 * 1.25**i for i in range(50)]  # 1ms ~ 약 56s
+
+    def __init__(self, window: float = 300.0):
+        self.window = window
+        self._current = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self._previous = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self._window_start = time.monotonic()
+        self.n_total = 0
+
+    def _rotate_if_needed(self):
+        now = time.monotonic()
+        if now - self._window_start < self.window:
+            return
+        # 한 구간 이상 기록이 없었다면 직전 구간도 오래된 것이므로 버림
+        self._previous = self._current if now - self._window_start < 2 * self.window else [0] * len(self._current)
+        self._current = [0] * len(self._current)
+        self._window_start = now
+
+    def record(self, seconds: float):
+        self._rotate_if_needed()
+        self._current[bisect.bisect_left(self.BUCKET_BOUNDS, seconds)] += 1
+        self.n_total += 1
+
+    def count(self) -> int:
+        self._rotate_if_needed()
+        return sum(self._current) + sum(self._previous)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q(0~1) percentile에 해당하는 bucket의 상한값(초). 표본이 없으면 None"""
+        self._rotate_if_needed()
+        counts = [current + previous for current, previous in zip(self._current, self._previous)]
+        n_samples = sum(counts)
+        if n_samples == 0:
+            return None
+
+        threshold = q * n_samples
+        cumulative = 0
+        for idx, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= threshold and count:
+                return self.BUCKET_BOUNDS[min(idx, len(self.BUCKET_BOUNDS) - 1)]
+        return self.BUCKET_BOUNDS[-1]
+
+    def stats(self) -> dict:
+        return {
+            "samples": self.count(),
+            "total": self.n_total,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class LatencyTracker:
+    """backend(SERVICE_NAME)별 LatencyHistogram"""
+
+    def __init__(self, window: float = 300.0):
+        self.window = window
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def get(self, service_name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(service_name)
+        if histogram is None:
+            histogram = LatencyHistogram(self.window)
+            self._histograms[service_name] = histogram
+        return histogram
+
+    def record(self, service_name: str, seconds: float):
+        self.get(service_name).record(seconds)
+
+    def stats(self) -> dict:
+        return {service_name: histogram.stats() for service_name, histogram in self._histograms.items()}
+
+
+backend_latency = LatencyTracker(window=load_config(LatencyConfig, "latency").window)
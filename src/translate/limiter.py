@@ -0,0 +1,274 @@
+"""API key별 요청 속도(rate) + 동시 요청 수 제한
+- 여러 사용자가 같은 Papago/DeepL key를 쓰는 경우, 한 사용자의 burst로 429가 나면 같은 key의 모든 사용자가 실패함
+- backend에 보내기 전에 (backend, API key) 별 token bucket(요청 수, 글자 수)과 동시 요청 수를 확인하고,
+    여유가 없으면 짧게 순서대로(FIFO) 기다림. 기다려도 deadline 안에 보낼 수 없으면 backend에 보내지 않고 바로 실패
+- client 요청 하나가 나눠서 보내는 backend 요청들(긴 text의 chunk, batch, stream segment 등)은 RequestGroup으로 묶어서
+    queue 자리를 하나만 차지하고, 보내는 데 필요한 만큼 더 기다릴 수 있음(자기 요청끼리 막혀서 실패하지 않도록)
+    요청마다 start_request_group()으로 contextvar에 묶음을 만들어두고, 그 요청에서 만든 task들도 같은 묶음을 사용
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from src.common.config import load_config
+from src.translate.breaker import hash_api_key
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """backend 하나의 API key당 제한. Translator.RATE_LIMIT 으로 지정
+    - requests_per_sec, burst: 초당 요청 수와 한 번에 몰아서 보낼 수 있는 요청 수
+    - chars_per_sec, char_burst: 초당 글자 수 제한(없으면 None)
+    - max_concurrency: 동시에 보내는 요청 수
+    """
+
+    requests_per_sec: float
+    burst: int
+    max_concurrency: int
+    chars_per_sec: Optional[float] = None
+    char_burst: Optional[int] = None
+
+
+@dataclass
+class RateLimiterConfig:
+    """- max_wait: token이나 동시 요청 자리를 기다리는 최대 시간(초). 이 안에 보낼 수 없으면 바로 실패(429)
+    - max_queue: API key 하나에서 기다릴 수 있는 client 요청 수. 한 client 요청의 backend 요청들은 하나로 셈. 넘으면 바로 실패
+    - max_group_wait: 한 client 요청의 backend 요청들이 첫 요청부터 기다릴 수 있는 최대 시간(초)
+    - max_limiters: 유지하는 limiter 수(API key 수) 상한. 넘으면 오래 사용되지 않은 것부터 제거
+    """
+
+    enabled: bool = True
+    max_wait: float = 1.0
+    max_queue: int = 32
+    max_group_wait: float = 10.0
+    max_limiters: int = 10000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """amount만큼의 token이 모이기까지 남은 시간(초). capacity보다 큰 요청은 가득 찼을 때 보냄"""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(missing / self.rate, 0.0)
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+
+class RequestGroup:
+    """client 요청 하나에서 같은 limiter로 보내는 backend 요청들
+    k번째 요청은 max_wait에 더해 RATE_LIMIT으로 앞의 k-1개 요청(과 그 글자 수)을 보내는 데 걸리는 시간만큼 더 기다릴 수 있음
+    """
+
+    __slots__ = ("start", "n_requests", "n_chars")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.n_requests = 0
+        self.n_chars = 0
+
+    def add(self, n_chars: int, rate_limit: RateLimit) -> float:
+        """요청 하나를 더하고, 앞의 요청들을 보내는 데 필요한 시간(초)을 리턴"""
+        needed = self.n_requests / rate_limit.requests_per_sec
+        if rate_limit.chars_per_sec:
+            needed = max(needed, self.n_chars / rate_limit.chars_per_sec)
+        self.n_requests += 1
+        self.n_chars += n_chars
+        return needed
+
+
+_request_groups: ContextVar[Optional[dict["KeyRateLimiter", RequestGroup]]] = ContextVar(
+    "rate_limit_request_groups", default=None
+)
+
+
+def start_request_group():
+    """client 요청 처리 시작 시 호출. 이 요청(과 이 요청에서 만든 task)의 backend 요청들을 limiter별로 묶음"""
+    _request_groups.set({})
+
+
+class KeyRateLimiter:
+    """API key 하나의 limiter. 기다리는 요청들은 도착 순서대로 처리(앞 요청이 나가기 전에 뒤 요청이 끼어들지 않음)"""
+
+    def __init__(self, rate_limit: RateLimit, max_queue: int):
+        self.rate_limit = rate_limit
+        self.max_queue = max_queue
+        self.request_bucket = TokenBucket(rate_limit.requests_per_sec, rate_limit.burst)
+        self.char_bucket = (
+            TokenBucket(rate_limit.chars_per_sec, rate_limit.char_burst or rate_limit.chars_per_sec)
+            if rate_limit.chars_per_sec
+            else None
+        )
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Event] = deque()
+        self._waiting_groups: dict[object, int] = {}  # 기다리는 요청이 있는 RequestGroup(묶음이 없는 요청은 자기 자신) -> 수
+
+        self.n_admitted = 0
+        self.n_waited = 0  # 바로 보내지 못하고 기다린 뒤 보낸 수
+        self.n_rejected = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def n_waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        return self.in_flight == 0 and not self._waiters
+
+    def _delay(self, n_chars: int, now: float) -> float:
+        delay = self.request_bucket.delay(1, now)
+        if self.char_bucket is not None:
+            delay = max(delay, self.char_bucket.delay(n_chars, now))
+        return delay
+
+    async def acquire(
+        self, n_chars: int, max_wait: float, group: Optional[RequestGroup] = None, max_group_wait: float = 0.0
+    ) -> bool:
+        """요청을 보내도 되면 True(끝나면 release() 호출). deadline 안에 보낼 수 없으면 기다리지 않고 False
+        deadline은 max_wait 후. group의 요청이면 앞의 요청들을 보내는 시간만큼 늦춤(group 시작부터 max_group_wait까지)
+        """
+        start = time.monotonic()
+        deadline = start + max_wait
+        waiter = asyncio.Event()
+        owner = group if group is not None else waiter
+        if owner not in self._waiting_groups and len(self._waiting_groups) >= self.max_queue:
+            self.n_rejected += 1
+            return False
+        if group is not None:
+            needed = group.add(n_chars, self.rate_limit)
+            deadline = max(deadline, min(group.start + max_wait + needed, group.start + max_group_wait))
+
+        self._waiters.append(waiter)
+        self._waiting_groups[owner] = self._waiting_groups.get(owner, 0) + 1
+        waited = False
+        try:
+            while True:
+                now = time.monotonic()
+                timeout = deadline - now
+                if self._waiters[0] is waiter and self.in_flight < self.rate_limit.max_concurrency:
+                    delay = self._delay(n_chars, now)
+                    if delay <= 0:
+                        self.request_bucket.take(1, now)
+                        if self.char_bucket is not None:
+                            self.char_bucket.take(n_chars, now)
+                        self.in_flight += 1
+                        self.n_admitted += 1
+                        if waited:
+                            self.n_waited += 1
+                            self.wait_seconds += now - start
+                        return True
+                    if delay > timeout:  # 기다려도 deadline 안에 token이 모이지 않음
+                        break
+                    timeout = delay
+                if timeout <= 0:
+                    break
+
+                waiter.clear()
+                waited = True
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiters.remove(waiter)
+            self._waiting_groups[owner] -= 1
+            if not self._waiting_groups[owner]:
+                del self._waiting_groups[owner]
+            self._wake_next()
+
+        self.n_rejected += 1
+        return False
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake_next()
+
+    def _wake_next(self):
+        if self._waiters:
+            self._waiters[0].set()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.n_waiting,
+            "admitted": self.n_admitted,
+            "waited": self.n_waited,
+            "rejected": self.n_rejected,
+        }
+
+
+class RateLimiterRegistry:
+    """(backend, API key hash) 별 KeyRateLimiter"""
+
+    def __init__(self, config: Optional[RateLimiterConfig] = None):
+        self.config = config if config is not None else load_config(RateLimiterConfig, "ratelimit")
+        self._limiters: OrderedDict[tuple[str, str], KeyRateLimiter] = OrderedDict()
+
+    def get(
+        self, service_name: str, api_key: Optional[str], rate_limit: Optional[RateLimit]
+    ) -> Optional[KeyRateLimiter]:
+        """제한을 사용하지 않으면(설정 또는 backend에 RATE_LIMIT이 없음) None"""
+        if not self.config.enabled or rate_limit is None:
+            return None
+
+        key = (service_name, hash_api_key(api_key))
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = KeyRateLimiter(rate_limit, self.config.max_queue)
+            self._limiters[key] = limiter
+            self._evict()
+        else:
+            self._limiters.move_to_end(key)
+        return limiter
+
+    def _evict(self):
+        # 요청 중이거나 기다리는 요청이 있는 limiter는 제거하지 않음(제거하면 같은 key에 limiter가 2개가 됨)
+        for key in list(self._limiters):
+            if len(self._limiters) <= self.config.max_limiters:
+                break
+            if self._limiters[key].idle:
+                del self._limiters[key]
+
+    async def acquire(self, limiter: Optional[KeyRateLimiter], n_chars: int) -> bool:
+        if limiter is None:
+            return True
+        groups = _request_groups.get()
+        group = None
+        if groups is not None:
+            group = groups.get(limiter)
+            if group is None:
+                group = groups[limiter] = RequestGroup(time.monotonic())
+        return await limiter.acquire(n_chars, self.config.max_wait, group, self.config.max_group_wait)
+
+    def stats(self) -> dict:
+        limiters = list(self._limiters.values())
+        n_admitted = sum(limiter.n_admitted for limiter in limiters)
+        n_waited = sum(limiter.n_waited for limiter in limiters)
+        return {
+            "enabled": self.config.enabled,
+            "limiters": len(limiters),
+            "in_flight": sum(limiter.in_flight for limiter in limiters),
+            "waiting": sum(limiter.n_waiting for limiter in limiters),
+            "admitted": n_admitted,
+            "waited": n_waited,
+            "rejected": sum(limiter.n_rejected for limiter in limiters),
+            "avg_wait": sum(limiter.wait_seconds for limiter in limiters) / n_waited if n_waited else 0.0,
+        }
+
+
+rate_limiters = RateLimiterRegistry()
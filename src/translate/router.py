@@ -0,0 +1,150 @@
+"""TranslatorType.auto 요청을 어느 backend로 보낼지 정하는 router
+- 실제 번역 요청(Translator.fetch 등)의 latency, 성공 여부를 (backend, 언어쌍, text 길이 구간)별 EWMA로 기록
+- 사용자가 key를 가진 backend(Google은 key 불필요) 중 언어쌍을 지원하는 backend에서,
+    예상 비용(latency / 성공률)이 가장 낮은 backend를 고름
+- 긴 text는 chunk로 나누지 않아도 되는(MAX_CHAR_PER_REQ가 큰) backend를 우선함
+"""
+import bisect
+import math
+import random
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from src.common.config import load_config
+from src.common.models import TranslatorType
+from src.translate.lang_index import lang_index
+
+
+@dataclass
+class RouterConfig:
+    """- alpha: EWMA에서 새 표본의 가중치
+    - length_buckets: text 길이(글자 수) 구간의 경계. ','로 구분
+    - min_samples: (backend, 언어쌍, 길이 구간)의 표본이 이보다 적으면 backend 전체 EWMA를 사용.
+        backend 전체 표본이 이보다 적은 backend는 먼저 골라서 표본을 모음
+    - default_latency: backend 전체 표본도 없을 때의 예상 latency(초)
+    - explore_rate: 가장 좋은 backend 대신 다른 후보를 골라 통계를 갱신하는 비율
+    - max_entries: 유지하는 (backend, 언어쌍, 길이 구간) 통계 수 상한(LRU)
+    """
+
+    alpha: float = 0.2
+    length_buckets: str = "100,500,2000,5000"
+    min_samples: int = 3
+    default_latency: float = 1.0
+    explore_rate: float = 0.05
+    max_entries: int = 10000
+
+
+class EwmaStats:
+    __slots__ = ("latency", "success_rate", "n_samples")
+
+    def __init__(self):
+        self.latency: Optional[float] = None  # 성공한 요청의 latency(초) EWMA
+        self.success_rate = 1.0
+        self.n_samples = 0
+
+    def update(self, seconds: float, success: bool, alpha: float):
+        # 실패(breaker open, 인증 실패 등)는 바로 끝나는 경우가 많아 latency에는 반영하지 않고 성공률에만 반영
+        if success:
+            self.latency = seconds if self.latency is None else alpha * seconds + (1 - alpha) * self.latency
+        self.success_rate = alpha * float(success) + (1 - alpha) * self.success_rate
+        self.n_samples += 1
+
+    def to_dict(self) -> dict:
+        return {"latency": self.latency, "success_rate": self.success_rate, "samples": self.n_samples}
+
+
+class BackendRouter:
+    def __init__(self, config: Optional[RouterConfig] = None, seed: Optional[int] = None):
+        self.config = config if config is not None else load_config(RouterConfig, "router")
+        self.length_bounds = [int(bound) for bound in self.config.length_buckets.split(",") if bound.strip()]
+        self._stats: OrderedDict[tuple[TranslatorType, str, str, int], EwmaStats] = OrderedDict()
+        self._backend_stats: dict[TranslatorType, EwmaStats] = {}
+        self._random = random.Random(seed)
+
+        self.chosen: dict[str, int] = {}  # 고른 backend별 요청 수
+        self.n_explored = 0
+
+    def length_bucket(self, n_chars: int) -> int:
+        return bisect.bisect_left(self.length_bounds, n_chars)
+
+    def _key(
+        self, backend: TranslatorType, src_lang: str, tgt_lang: str, n_chars: int
+    ) -> tuple[TranslatorType, str, str, int]:
+        # backend마다 code 표기가 다르므로(ex. DeepL 'EN-US') 기준 code로 저장
+        return backend, lang_index.canonical(src_lang), lang_index.canonical(tgt_lang), self.length_bucket(n_chars)
+
+    def record(
+        self, backend: TranslatorType, src_lang: str, tgt_lang: str, n_chars: int, seconds: float, success: bool
+    ):
+        """backend에 실제로 보낸 번역 요청 하나의 결과를 기록. cache hit, 취소된 요청은 기록하지 않음"""
+        key = self._key(backend, src_lang, tgt_lang, n_chars)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = EwmaStats()
+            self._stats[key] = stats
+            if len(self._stats) > self.config.max_entries:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        stats.update(seconds, success, self.config.alpha)
+        self._backend_stats.setdefault(backend, EwmaStats()).update(seconds, success, self.config.alpha)
+
+    def expected_cost(self, backend: TranslatorType, src_lang: str, tgt_lang: str, n_chars: int) -> float:
+        """성공한 응답을 받기까지의 예상 시간(초). latency / 성공률"""
+        stats = self._stats.get(self._key(backend, src_lang, tgt_lang, n_chars))
+        if stats is None or stats.n_samples < self.config.min_samples or stats.latency is None:
+            stats = self._backend_stats.get(backend)
+        if stats is None or stats.latency is None:
+            latency = self.config.default_latency
+            success_rate = stats.success_rate if stats is not None else 1.0
+        else:
+            latency, success_rate = stats.latency, stats.success_rate
+        return latency / max(success_rate, 0.01)
+
+    def choose(
+        self, candidates: dict[TranslatorType, Optional[int]], src_lang: str, tgt_lang: str, n_chars: int
+    ) -> Optional[TranslatorType]:
+        """candidates(backend -> MAX_CHAR_PER_REQ, None이면 제한 없음) 중 번역할 backend. 후보가 없으면 None
+        - chunk 수가 가장 적은 backend들만 남김(긴 text는 한 번에 보낼 수 있는 backend로)
+        - 표본이 min_samples개보다 적은 backend가 있으면 그 backend(처음 사용할 때 모든 backend의 latency를 재봄)
+        - 아니면 expected_cost가 가장 낮은 backend. explore_rate 비율로는 나머지 중에서 무작위로 고름
+        """
+        if not candidates:
+            return None
+
+        n_chunks = {
+            backend: 1 if max_chars is None else max(math.ceil(n_chars / max_chars), 1)
+            for backend, max_chars in candidates.items()
+        }
+        min_chunks = min(n_chunks.values())
+        backends = [backend for backend in candidates if n_chunks[backend] == min_chunks]
+
+        n_samples = {
+            backend: stats.n_samples if (stats := self._backend_stats.get(backend)) is not None else 0
+            for backend in backends
+        }
+        warming_up = [backend for backend in backends if n_samples[backend] < self.config.min_samples]
+        if warming_up:
+            backend = min(warming_up, key=n_samples.__getitem__)
+        else:
+            costs = {backend: self.expected_cost(backend, src_lang, tgt_lang, n_chars) for backend in backends}
+            backend = min(backends, key=costs.__getitem__)
+            others = [other for other in backends if other != backend]
+            if others and self._random.random() < self.config.explore_rate:
+                backend = self._random.choice(others)
+                self.n_explored += 1
+
+        self.chosen[str(backend)] = self.chosen.get(str(backend), 0) + 1
+        return backend
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._stats),
+            "chosen": self.chosen,
+            "explored": self.n_explored,
+            "backends": {str(backend): stats.to_dict() for backend, stats in self._backend_stats.items()},
+        }
+
+
+backend_router = BackendRouter()
@@ -0,0 +1,103 @@
+"""긴 text를 문장 단위로 나누고, 한 번의 번역 요청에 들어갈 크기의 chunk로 묶는 모듈
+- split_sentences(), pack_segments() 모두 결과를 그대로 이어붙이면 원문과 같아지도록(lossless) 나눔
+"""
+import re
+from bisect import bisect_right
+
+# 문장 끝으로 보지 않을 약어들(소문자, 마지막 '.' 제외)
+# fmt: off
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs", "etc", "e.g", "i.e", "cf", "al", "fig", "figs",
+    "eq", "eqs", "no", "nos", "vol", "pp", "p", "ch", "sec", "approx", "dept", "est", "inc", "ltd", "co", "corp",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k", "ph.d",
+}
+# fmt: on
+
+# 안에서 문장을 나누면 안 되는 부분: markup tag, URL, email, 소수점/버전 숫자(3.14, v1.2.3)
+PROTECTED_PATTERN = re.compile(
+    r"<[^<>]{1,200}>"
+    + r"|(?:https?://|www\.)[^\s<>\"]*[^\s<>\".,;:!?)\]']"
+    + r"|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+    + r"|\b\d+(?:[.,]\d+)+\b"
+)
+# 문장 끝 기호 + (닫는 따옴표/괄호) + 공백. CJK 문장 끝 기호는 뒤에 공백이 없어도 됨
+BOUNDARY_PATTERN = re.compile(r"(?:[.!?…]+[\"'”’)\]]*(?:\s+|$)|[。！？]+[」』”’)\]]*\s*|\n\s*)")
+WORD_BEFORE_PATTERN = re.compile(r"([\w.]+)\.$")
+
+
+def _is_abbreviation(text: str, dot_idx: int) -> bool:
+    """text[dot_idx] 의 '.'가 약어나 이니셜(ex. J. K. Rowling)의 일부인지"""
+    # 약어는 짧으므로 앞쪽 일부만 봄. text 전체에서 찾으면 문장 수만큼 반복되어 O(n^2)이 됨
+    match = WORD_BEFORE_PATTERN.search(text, max(0, dot_idx - 20), dot_idx + 1)
+    if match is None:
+        return False
+    word = match.group(1)
+    if word.lower() in ABBREVIATIONS:
+        return True
+    return len(word) == 1 and word.isalpha() and word.isupper()
+
+
+def split_sentences(text: str) -> list[str]:
+    """text를 문장 단위로 나눔. 각 문장은 뒤따르는 공백(줄바꿈 포함)을 포함함"""
+    protected = [match.span() for match in PROTECTED_PATTERN.finditer(text)]
+    protected_starts = [start for start, _ in protected]
+
+    def _is_protected(idx: int) -> bool:
+        span_idx = bisect_right(protected_starts, idx) - 1
+        return span_idx >= 0 and idx < protected[span_idx][1]
+
+    sentences = []
+    start = 0
+    for match in BOUNDARY_PATTERN.finditer(text):
+        end = match.end()
+        if end >= len(text):
+            break
+        punct_idx = match.start()
+        if _is_protected(punct_idx):
+            continue
+        if text[punct_idx] == "." and match.group().count(".") == 1 and _is_abbreviation(text, punct_idx):
+            continue
+        # 문장 끝 기호 다음이 소문자로 시작하면 문장이 이어지는 것으로 봄(ex. "... what? he said")
+        if text[punct_idx] != "\n" and text[end].islower():
+            continue
+        sentences.append(text[start:end])
+        start = end
+
+    if start < len(text):
+        sentences.append(text[start:])
+    return sentences
+
+
+def _split_long_segment(segment: str, max_chars: int) -> list[str]:
+    """max_chars보다 긴 문장은 공백 위치에서(없으면 max_chars 위치에서) 자름"""
+    pieces = []
+    while len(segment) > max_chars:
+        split_idx = segment.rfind(" ", 0, max_chars) + 1
+        if split_idx <= 0:
+            split_idx = max_chars
+        pieces.append(segment[:split_idx])
+        segment = segment[split_idx:]
+    if segment:
+        pieces.append(segment)
+    return pieces
+
+
+def pack_segments(segments: list[str], max_chars: int) -> list[str]:
+    """순서를 유지하면서 각 chunk가 max_chars를 넘지 않도록 연속된 segment들을 묶음"""
+    chunks = []
+    current = ""
+    for segment in segments:
+        for piece in _split_long_segment(segment, max_chars) if len(segment) > max_chars else [segment]:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_trailing_space(text: str) -> tuple[str, str]:
+    """text를 (내용, 뒤쪽 공백)으로 나눔. 번역 후 원래의 공백/줄바꿈을 복원할 때 사용"""
+    stripped = text.rstrip()
+    return stripped, text[len(stripped) :]
@@ -0,0 +1,237 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from src.common.admission import AdmissionRejected, admission_controller
+from src.common.base import logger
+from src.common.config import load_config
+from src.common.metrics import timed_stage
+from src.common.models import TranslatorClientInfo, TranslatorType, UserOption
+from src.translate.breaker import circuit_breakers
+from src.translate.fallback import fallback_policy
+from src.translate.lang_index import lang_index
+from src.translate.limiter import start_request_group
+from src.translate.router import backend_router
+from src.translate.translator import GoogleTranslator, Translator, create_translator
+
+
+@dataclass
+class TranslationResult:
+    text: Optional[str]
+    status_msg: Optional[str]
+    translator_type: TranslatorType
+    status_code: int = 200
+
+
+def auto_client_infos(user_option: UserOption) -> list[TranslatorClientInfo]:
+    """auto에서 고를 수 있는 backend들의 client info. backend마다 처음 것만 사용하고, Google은 key가 없어도 포함"""
+    client_infos: dict[TranslatorType, TranslatorClientInfo] = {}
+    for client_info in user_option.translator_client_infos or []:
+        if client_info.translator_type != TranslatorType.auto:
+            client_infos.setdefault(client_info.translator_type, client_info)
+    client_infos.setdefault(TranslatorType.google, TranslatorClientInfo(TranslatorType.google))
+    return list(client_infos.values())
+
+
+class TranslationSession:
+    """한 사용자(UserOption)에 대한 translator들을 묶어둔 것
+    - HTTP 요청에서는 요청마다 만들고, WebSocket에서는 연결 동안 유지해서 재사용함
+    - translator_type이 auto면 key가 있는 backend마다 translator를 만들고, 요청마다 backend_router로 고름
+    """
+
+    def __init__(self, user_option: UserOption):
+        self.user_option = user_option
+        self.translator_type = user_option.translator_client_info.translator_type
+        if self.translator_type == TranslatorType.auto:
+            self.translators = {
+                client_info.translator_type: create_translator(client_info.translator_type, user_option, client_info)
+                for client_info in auto_client_infos(user_option)
+            }
+        else:
+            self.translators = {self.translator_type: create_translator(self.translator_type, user_option)}
+        google_translator = self.translators.get(TranslatorType.google)
+        self.google_translator = google_translator if google_translator is not None else GoogleTranslator(user_option)
+
+    def get_fallback(self, translator_type: TranslatorType) -> Optional[Translator]:
+        return None if translator_type == TranslatorType.google else self.google_translator
+
+    @staticmethod
+    async def detect_lang(src_text: str) -> str:
+        src_text = src_text.strip()
+        if not src_text:
+            return "en"
+        with timed_stage("detect"):
+            return await Translator.identify_lang(src_text)
+
+    async def select(self, src_text: str, tgt_lang: Optional[str] = None) -> tuple[TranslatorType, Optional[str]]:
+        """(src_text를 번역할 backend, 감지한 src_lang) 를 리턴
+        auto가 아니면 항상 사용자가 고른 backend이고 언어는 감지하지 않음(src_lang은 None)
+        auto면 src_text의 언어쌍을 지원하고 circuit breaker가 open이 아닌 backend 중 backend_router가 고름
+        """
+        if self.translator_type != TranslatorType.auto:
+            return self.translator_type, None
+
+        src_lang = await self.detect_lang(src_text)
+        src_text = src_text.strip()
+        if tgt_lang is None:
+            main_tgt_lang, sub_tgt_lang = self.user_option.main_tgt_lang, self.user_option.sub_tgt_lang
+            tgt_lang = main_tgt_lang if src_lang != main_tgt_lang else sub_tgt_lang
+
+        candidates = {
+            translator_type: translator.MAX_CHAR_PER_REQ
+            for translator_type, translator in self.translators.items()
+            if lang_index.supports(translator_type, src_lang, tgt_lang)
+            and not circuit_breakers.get(translator.SERVICE_NAME, translator.limit_key).is_blocked()
+        }
+        translator_type = backend_router.choose(candidates, src_lang, tgt_lang, len(src_text))
+        # 고를 수 있는 backend가 없으면 Google로 보내서 지원하지 않는 언어 등의 메시지를 받음
+        return (translator_type if translator_type is not None else TranslatorType.google), src_lang
+
+    async def route(self, src_text: str, tgt_lang: Optional[str] = None) -> tuple[TranslatorType, Optional[str]]:
+        """select()와 같지만, fallback translator가 있으면 src_lang을 여기서 한 번만 감지해서 리턴
+        (main backend와 fallback이 각자 다시 감지하지 않도록 translator.run() 등에 넘겨줌)
+        """
+        translator_type, src_lang = await self.select(src_text, tgt_lang)
+        if src_lang is None and self.get_fallback(translator_type) is not None:
+            src_lang = await self.detect_lang(src_text)
+        return translator_type, src_lang
+
+    async def translate(self, src_text: str, tgt_lang: Optional[str] = None) -> TranslationResult:
+        """main backend로 번역하고, 실패하거나 느리면 fallback_policy에 따라 Google API로 번역"""
+        translator_type, src_lang = await self.route(src_text, tgt_lang)
+        fallback_translator = self.get_fallback(translator_type)
+        translated_text, status_msg, served_type = await fallback_policy.run(
+            self.translators.get(translator_type, self.google_translator),
+            translator_type,
+            src_text,
+            tgt_lang,
+            fallback_translator=fallback_translator,
+            src_lang=src_lang,
+        )
+        status_code = 503 if translated_text is None and fallback_translator is not None else 200
+        return TranslationResult(translated_text, status_msg, served_type, status_code)
+
+
+@dataclass
+class WebSocketSessionConfig:
+    """- max_in_flight: 한 WebSocket 연결에서 동시에 처리하는 번역 요청 수 상한"""
+
+    max_in_flight: int = 32
+
+
+def is_valid_request_id(request_id) -> bool:
+    """응답에 그대로 돌려주고 dict key로 쓸 수 있는 id만 허용(str, int). bool은 int의 subclass지만 제외"""
+    return isinstance(request_id, (str, int)) and not isinstance(request_id, bool)
+
+
+class WebSocketSession:
+    """WebSocket 연결 하나의 상태
+    1. client가 {"type": "auth", "user_option": {...}} 를 보내면 TranslationSession을 만들고 {"type": "ready"} 응답
+    2. {"type": "translate", "id": ..., "src_text": ..., "tgt_lang": ...} 를 받으면 동시에 번역해서
+        끝나는 순서대로 {"type": "result", "id": ..., "text": ..., ...} 응답
+    3. {"type": "cancel", "id": ...} 로 진행 중인 번역 취소 -> {"type": "cancelled", "id": ...}
+        없거나 이미 끝난 id면 {"type": "error", "id": ...}. {"type": "ping"} -> {"type": "pong"}
+    - id는 문자열 또는 정수. translate message 하나가 HTTP 요청 하나처럼 admission_controller를 거침
+    """
+
+    def __init__(self, send_json, config: Optional[WebSocketSessionConfig] = None):
+        self._send_json = send_json
+        self.config = config if config is not None else load_config(WebSocketSessionConfig, "ws")
+        self.session: Optional[TranslationSession] = None
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, message: dict):
+        async with self._send_lock:
+            await self._send_json(message)
+
+    async def handle(self, message: dict):
+        match message.get("type"):
+            case "auth":
+                try:
+                    self.session = TranslationSession(UserOption.from_dict(message["user_option"]))
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    await self.send({"type": "error", "msg": f"Invalid user_option: {e}"})
+                    return
+                logger.info(f"WebSocket session ready for {self.session.translator_type}")
+                await self.send({"type": "ready", "translator_type": self.session.translator_type})
+
+            case "translate":
+                request_id = message.get("id")
+                src_text, tgt_lang = message.get("src_text"), message.get("tgt_lang")
+                if request_id is None or src_text is None:
+                    await self.send({"type": "error", "id": None, "msg": "'id' and 'src_text' are required"})
+                elif not is_valid_request_id(request_id):
+                    await self.send({"type": "error", "id": None, "msg": "'id' must be a string or an integer"})
+                elif not isinstance(src_text, str) or not (tgt_lang is None or isinstance(tgt_lang, str)):
+                    await self.send(
+                        {"type": "error", "id": request_id, "msg": "'src_text', 'tgt_lang' must be strings"}
+                    )
+                elif self.session is None:
+                    await self.send({"type": "error", "id": request_id, "msg": "Send 'auth' message first"})
+                elif request_id in self._tasks:
+                    await self.send({"type": "error", "id": request_id, "msg": "Duplicated request id"})
+                elif len(self._tasks) >= self.config.max_in_flight:
+                    await self.send({"type": "error", "id": request_id, "msg": "Too many requests in flight"})
+                else:
+                    task = asyncio.create_task(self._translate(request_id, src_text, tgt_lang))
+                    self._tasks[request_id] = task
+                    task.add_done_callback(lambda task: self._forget(request_id, task))
+
+            case "cancel":
+                request_id = message.get("id")
+                if not is_valid_request_id(request_id):
+                    await self.send({"type": "error", "id": None, "msg": "'id' must be a string or an integer"})
+                    return
+                task = self._tasks.get(request_id)
+                # 이미 끝난 task는 결과를 보냈으므로 취소할 수 없음
+                if task is None or not task.cancel():
+                    await self.send({"type": "error", "id": request_id, "msg": "Unknown or finished request id"})
+                    return
+                del self._tasks[request_id]  # 취소한 id는 바로 다시 사용할 수 있음
+                await self.send({"type": "cancelled", "id": request_id})
+
+            case "ping":
+                await self.send({"type": "pong"})
+
+            case _:
+                await self.send({"type": "error", "msg": f"Unknown message type: {message.get('type')}"})
+
+    def _forget(self, request_id, task: asyncio.Task):
+        # 취소된 뒤 같은 id로 새 요청이 들어왔을 수 있으므로, 끝난 task 자신인 경우에만 지움
+        if self._tasks.get(request_id) is task:
+            del self._tasks[request_id]
+
+    async def _translate(self, request_id, src_text: str, tgt_lang: Optional[str]):
+        start_request_group()  # message마다 task로 실행되므로 task 안에서만 적용됨
+        try:
+            async with admission_controller.admit():
+                result = await self.session.translate(src_text, tgt_lang=tgt_lang)
+        except AdmissionRejected as e:
+            await self.send(
+                {
+                    "type": "error",
+                    "id": request_id,
+                    "msg": "Server is busy. Please try again in a few seconds",
+                    "retry_after": int(e.retry_after_header),
+                }
+            )
+            return
+        except Exception as e:
+            logger.exception(e)
+            await self.send({"type": "error", "id": request_id, "msg": "Internal error"})
+            return
+        await self.send(
+            {
+                "type": "result",
+                "id": request_id,
+                "text": result.text,
+                "status_msg": result.status_msg,
+                "translator_type": result.translator_type,
+                "status_code": result.status_code,
+            }
+        )
+
+    def close(self):
+        for task in self._tasks.values():
+            task.cancel()
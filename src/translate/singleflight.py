@@ -0,0 +1,84 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from src.common.config import load_config
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightConfig:
+    enabled: bool = True
+
+
+class _Flight:
+    __slots__ = ("task", "n_waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.n_waiters = 0
+
+
+class SingleFlight:
+    """같은 key의 요청이 동시에 여러 개 들어오면 처음 요청(leader)만 실제로 실행하고,
+    나머지는 그 결과를 같이 기다리도록 묶음(request coalescing)
+    - 기다리던 요청 하나가 취소되어도 공유 중인 실행은 계속됨(asyncio.shield)
+    - 기다리는 요청이 모두 취소되면 실행도 취소함
+    - 실행이 끝나면 key를 지우므로 결과를 저장(cache)하지는 않음
+    """
+
+    def __init__(self, config: Optional[SingleFlightConfig] = None):
+        self.config = config if config is not None else load_config(SingleFlightConfig, "singleflight")
+        self._flights: dict[Hashable, _Flight] = {}
+
+        self.n_leaders = 0  # 실제로 실행한 수
+        self.n_coalesced = 0  # 다른 요청의 실행 결과를 같이 받은 수
+        self.n_cancelled = 0  # 기다리는 요청이 모두 취소되어 실행을 취소한 수
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        if not self.config.enabled:
+            return await func()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func()))
+            flight.task.add_done_callback(lambda task: self._on_done(key, flight))
+            self._flights[key] = flight
+            self.n_leaders += 1
+        else:
+            self.n_coalesced += 1
+
+        flight.n_waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.n_waiters -= 1
+            if flight.n_waiters == 0 and not flight.task.done():
+                # 이후에 같은 key로 들어온 요청이 취소 중인 실행에 붙지 않도록 바로 지움
+                self._forget(key, flight)
+                flight.task.cancel()
+                self.n_cancelled += 1
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _on_done(self, key: Hashable, flight: _Flight):
+        self._forget(key, flight)
+        if not flight.task.cancelled():
+            flight.task.exception()  # 기다리는 요청이 없을 때의 "exception was never retrieved" 경고 방지
+
+    def stats(self) -> dict:
+        n_calls = self.n_leaders + self.n_coalesced
+        return {
+            "enabled": self.config.enabled,
+            "in_flight": len(self._flights),
+            "leaders": self.n_leaders,
+            "coalesced": self.n_coalesced,
+            "coalesced_rate": self.n_coalesced / n_calls if n_calls else 0.0,
+            "cancelled": self.n_cancelled,
+        }
+
+
+translation_flights = SingleFlight()
@@ -0,0 +1,192 @@
+"""data/ 를 미리 변환해서 하나의 binary 파일(pickle)로 저장해두는 snapshot
+- 지원 언어 목록, 언어 이름, 용어 파일, base 용어집의 Aho–Corasick 자동자, 언어 감지 n-gram 모델
+- 시작할 때(또는 처음 사용할 때) text 파일들을 읽고 parsing/모델 생성을 하는 대신 snapshot을 읽음
+    section마다 따로 pickle해두고 처음 get()할 때 그 section만 읽어서 풀기 때문에,
+    쓰지 않는 section(ex. 언어 감지 모델)은 시작 시간에 영향 없음
+- 파일 형식: header 길이(8 byte) + header(pickle. format, fingerprint, section별 위치) + section들(각각 pickle)
+- snapshot을 만든 뒤 data/ 의 파일이 바뀌었으면(내용 hash가 다르면) snapshot을 쓰지 않고 원래 파일에서 읽음
+    snapshot에 저장하는 객체의 형식(class 구조)이 바뀌면 SNAPSHOT_FORMAT을 올림
+- CLI: python -m src.translate.snapshot {build,info}
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+
+SNAPSHOT_FORMAT = 2
+_HEADER_SIZE = struct.Struct(">Q")
+
+
+@dataclass
+class SnapshotConfig:
+    """- path: snapshot 파일. `python -m src.translate.snapshot build`로 만듦
+    - data_dir: snapshot으로 만드는 원본 data 디렉토리. 내용 hash로 snapshot이 최신인지 확인함
+    """
+
+    enabled: bool = True
+    path: str = "data/snapshot.pickle"
+    data_dir: str = "data"
+
+
+def fingerprint(data_dir: Path, exclude: Optional[Path] = None) -> str:
+    """data_dir 아래 모든 파일(exclude 제외)의 경로와 내용으로 만든 hash"""
+    digest = hashlib.blake2b(digest_size=16)
+    exclude = exclude.resolve() if exclude is not None else None
+    for root, dirs, files in os.walk(data_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            file_path = Path(root) / filename
+            if file_path.resolve() == exclude:
+                continue
+            digest.update(file_path.relative_to(data_dir).as_posix().encode("utf-8") + b"\0")
+            digest.update(file_path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+class DataSnapshot:
+    """snapshot 파일을 처음 get()할 때 한 번 읽음. 없거나 오래된 snapshot이면 모든 section이 None"""
+
+    def __init__(self, config: Optional[SnapshotConfig] = None):
+        self.config = config if config is not None else load_config(SnapshotConfig, "snapshot")
+        self._sections: Optional[dict[str, tuple[int, int]]] = None  # section 이름 -> header 다음부터의 (offset, 길이)
+        self._data_start = 0
+        # section을 읽을 때까지 열어둠. 그 사이에 snapshot을 다시 build해도(os.replace) 처음 연 파일을 계속 읽음
+        self._file: Optional[BinaryIO] = None
+        self._values: dict[str, Any] = {}
+        self.status = "not loaded"
+        self.load_seconds: Optional[float] = None
+
+    def _load(self) -> dict[str, tuple[int, int]]:
+        path = Path(self.config.path)
+        if not self.config.enabled:
+            self.status = "disabled"
+            return {}
+        if not path.exists():
+            self.status = "missing"
+            logger.info(f"No data snapshot at {path}. Read data files instead (python -m src.translate.snapshot build)")
+            return {}
+
+        start = time.perf_counter()
+        file = open(path, "rb")
+        try:
+            (header_len,) = _HEADER_SIZE.unpack(file.read(_HEADER_SIZE.size))
+            header = pickle.loads(file.read(header_len))
+        except Exception as e:  # 깨진 파일 등
+            file.close()
+            self.status = "invalid"
+            logger.warning(f"Fail to load data snapshot {path}: {e!r}. Read data files instead")
+            return {}
+
+        if header.get("format") != SNAPSHOT_FORMAT:
+            self.status = "outdated format"
+        elif header.get("fingerprint") != fingerprint(Path(self.config.data_dir), exclude=path):
+            self.status = "stale"
+        else:
+            self.status = "loaded"
+            self._file = file
+            self._data_start = _HEADER_SIZE.size + header_len
+            self.load_seconds = time.perf_counter() - start
+            logger.info(f"Load data snapshot {path} ({self.load_seconds * 1000:.1f}ms)")
+            return header["sections"]
+
+        file.close()
+        logger.warning(f"Data snapshot {path} is {self.status}. Read data files instead")
+        return {}
+
+    def get(self, section: str) -> Optional[Any]:
+        if self._sections is None:
+            self._sections = self._load()
+        if section not in self._values:
+            self._values[section] = self._read_section(section)
+            # 모든 section을 읽었으면 파일을 닫음. snapshot에 없는 section의 조회(None)는 세지 않음
+            if self._file is not None and self._sections.keys() <= self._values.keys():
+                self._file.close()
+                self._file = None
+        return self._values[section]
+
+    def _read_section(self, section: str) -> Optional[Any]:
+        if section not in self._sections:
+            return None
+        offset, length = self._sections[section]
+        self._file.seek(self._data_start + offset)
+        try:
+            return pickle.loads(self._file.read(length))
+        except Exception as e:  # 없어진 class 등
+            logger.warning(f"Fail to load '{section}' from data snapshot: {e!r}. Read data files instead")
+            return None
+
+    def stats(self) -> dict:
+        return {
+            "path": self.config.path,
+            "status": self.status,
+            "load_seconds": self.load_seconds,
+            "sections": sorted(self._sections) if self._sections else [],
+        }
+
+
+def build_snapshot(config: SnapshotConfig) -> dict[str, Any]:
+    """data/ 의 파일들을 읽어서 snapshot에 넣을 section들을 만듦"""
+    from src.translate.glossary import GlossaryConfig, TermMatcher, read_term_files
+    from src.translate.lang_detect import LANG_PROFILE_DIR, CharNgramModel
+    from src.translate.lang_index import LanguageIndex
+
+    glossary_config = GlossaryConfig()
+    term_dir = Path(glossary_config.term_dir)
+    term_sets = {file_path.name: read_term_files(term_dir, [file_path.name]) for file_path in term_dir.glob("*.txt")}
+    base_term_files = tuple(name.strip() for name in glossary_config.term_files.split(",") if name.strip())
+    return {
+        "support_langs": LanguageIndex.read_sources(),
+        "term_sets": term_sets,
+        # base 용어집(기본 term_files)은 자동자까지 만들어서 저장
+        "base_matchers": {base_term_files: TermMatcher(read_term_files(term_dir, base_term_files))},
+        "latin_ngram_model": CharNgramModel.from_tsv(LANG_PROFILE_DIR / "latin_corpus.tsv"),
+    }
+
+
+def write_snapshot(config: SnapshotConfig) -> Path:
+    path = Path(config.path)
+    data_fingerprint = fingerprint(Path(config.data_dir), exclude=path)
+    sections = {
+        section: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        for section, value in build_snapshot(config).items()
+    }
+
+    positions, offset = {}, 0  # offset은 header 다음부터
+    for section, data in sections.items():
+        positions[section] = (offset, len(data))
+        offset += len(data)
+    header = {"format": SNAPSHOT_FORMAT, "fingerprint": data_fingerprint, "sections": positions}
+    header = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER_SIZE.pack(len(header)) + header)
+        for data in sections.values():
+            file.write(data)
+    os.replace(tmp_path, path)  # 읽는 쪽에서 쓰다 만 파일을 보지 않도록
+    return path
+
+
+data_snapshot = DataSnapshot()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="data/ snapshot")
+    parser.add_argument("command", choices=["build", "info"])
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        path = write_snapshot(data_snapshot.config)
+        print(f"Write {path} ({path.stat().st_size / 1024:.1f}KB, {time.perf_counter() - start:.2f}s)")
+    else:
+        data_snapshot.get("support_langs")
+        print(data_snapshot.stats())
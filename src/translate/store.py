@@ -0,0 +1,385 @@
+"""SQLite(WAL mode) 기반의 영구 번역 메모리(translation memory)
+
+- uvicorn worker 여러 개와 재시작 사이에서 번역 결과를 공유하기 위해 사용
+- 조회는 thread pool에서 동시에 실행(WAL mode이므로 reader끼리 막지 않음)되고,
+  저장은 모아두었다가 background task가 한 transaction으로 batch insert 함
+- CLI: python -m src.translate.store {stats,list,prune,compact}
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.common.base import logger
+from src.common.config import load_config
+from src.translate.cache import CacheKey
+from src.translate.executor import BlockingCallExecutor, ExecutorConfig
+
+
+@dataclass
+class StoreConfig:
+    """- max_bytes: 저장된 text 크기의 합 상한. 넘으면 오래 사용되지 않은 항목부터 삭제(compaction)
+    - read_timeout: 조회가 이 시간(초)보다 오래 걸리면 miss로 간주해서 요청을 지연시키지 않음
+    - flush_interval / flush_batch_size: 저장 요청을 모아서 쓰는 주기(초)와 한 번에 쓰는 최대 개수
+    - compact_interval: compaction을 확인하는 주기(초)
+    """
+
+    enabled: bool = True
+    path: str = "cache/translation_memory.sqlite3"
+    max_bytes: int = 512 * 1024 * 1024
+    read_workers: int = 4
+    read_timeout: float = 0.05
+    flush_interval: float = 0.5
+    flush_batch_size: int = 256
+    compact_interval: float = 10 * 60
+
+
+def hash_key(key: CacheKey) -> str:
+    """source text의 content hash + 언어쌍 + backend(+ glossary version)로 만든 key"""
+    return hashlib.blake2b("\x1f".join(key).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TranslationMemory:
+    """translation memory DB에 대한 동기(blocking) 접근. thread마다 별도의 connection을 사용"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS translations (
+            key_hash TEXT PRIMARY KEY,
+            backend TEXT NOT NULL,
+            src_lang TEXT NOT NULL,
+            tgt_lang TEXT NOT NULL,
+            glossary_version TEXT NOT NULL,
+            src_text TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_translations_last_used_at ON translations(last_used_at);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._init_db()
+
+    def _init_db(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self.connection
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)  # autocommit. transaction은 직접 관리
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key_hash: str) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT translated_text FROM translations WHERE key_hash = ?", (key_hash,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def write_batch(self, rows: list[tuple], touched: dict[str, int]):
+        """rows: put()으로 쌓인 새 항목, touched: key_hash -> 조회된 횟수"""
+        now = time.time()
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                + "(key_hash, backend, src_lang, tgt_lang, glossary_version, src_text, translated_text, "
+                + "size, created_at, last_used_at, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                [(*row, now, now) for row in rows],
+            )
+            conn.executemany(
+                "UPDATE translations SET last_used_at = ?, hits = hits + ? WHERE key_hash = ?",
+                [(now, n_hits, key_hash) for key_hash, n_hits in touched.items()],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def total_bytes(self) -> int:
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+
+    def compact(self, max_bytes: int, target_ratio: float = 0.9, vacuum: bool = False) -> int:
+        """저장된 크기가 max_bytes를 넘으면 last_used_at이 오래된 것부터 max_bytes * target_ratio 이하가 되도록 삭제
+        삭제된 항목 수를 리턴
+        """
+        total_bytes = self.total_bytes()
+        n_deleted = 0
+        if total_bytes > max_bytes:
+            bytes_to_free = total_bytes - int(max_bytes * target_ratio)
+            conn = self.connection
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 오래된 순서로 누적한 크기가 bytes_to_free에 도달할 때까지의 항목을 삭제
+                n_deleted = conn.execute(
+                    "DELETE FROM translations WHERE key_hash IN ("
+                    + " SELECT key_hash FROM ("
+                    + "  SELECT key_hash, size,"
+                    + "   SUM(size) OVER (ORDER BY last_used_at, key_hash ROWS UNBOUNDED PRECEDING) AS acc_size"
+                    + "  FROM translations"
+                    + " ) WHERE acc_size - size < ?"
+                    + ")",
+                    (bytes_to_free,),
+                ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        if vacuum:
+            self.connection.execute("VACUUM")
+        return n_deleted
+
+    def prune(
+        self, older_than_days: Optional[float] = None, backend: Optional[str] = None, tgt_lang: Optional[str] = None
+    ) -> int:
+        conditions, params = [], []
+        if older_than_days is not None:
+            conditions.append("last_used_at < ?")
+            params.append(time.time() - older_than_days * 24 * 60 * 60)
+        if backend is not None:
+            conditions.append("backend = ?")
+            params.append(backend)
+        if tgt_lang is not None:
+            conditions.append("tgt_lang = ?")
+            params.append(tgt_lang)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.connection.execute(f"DELETE FROM translations{where}", params).rowcount
+
+    def stats(self) -> dict:
+        conn = self.connection
+        n_entries, n_bytes, n_hits = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM translations"
+        ).fetchone()
+        by_backend = dict(conn.execute("SELECT backend, COUNT(*) FROM translations GROUP BY backend").fetchall())
+        file_bytes = sum(
+            os.path.getsize(self.path + suffix) for suffix in ("", "-wal") if os.path.exists(self.path + suffix)
+        )
+        return {
+            "entries": n_entries,
+            "text_bytes": n_bytes,
+            "file_bytes": file_bytes,
+            "hits": n_hits,
+            "entries_by_backend": by_backend,
+        }
+
+    def list_recent(self, limit: int = 20, backend: Optional[str] = None) -> list[tuple]:
+        where, params = ("WHERE backend = ?", [backend]) if backend is not None else ("", [])
+        return self.connection.execute(
+            "SELECT backend, src_lang, tgt_lang, hits, last_used_at, src_text, translated_text "
+            + f"FROM translations {where} ORDER BY last_used_at DESC LIMIT ?",
+            [*params, limit],
+        ).fetchall()
+
+
+class TranslationStore:
+    """Translator.run에서 사용하는 async interface
+    - get(): read thread pool에서 조회. read_timeout을 넘기면 miss로 간주
+    - put(): 메모리에 쌓아두기만 하고 바로 리턴. background task가 batch로 기록함
+    - FastAPI lifespan에서 start() / stop()을 호출. start 전에는 아무 동작도 하지 않음
+    """
+
+    def __init__(self, config: Optional[StoreConfig] = None):
+        self.config = config if config is not None else load_config(StoreConfig, "store")
+        self.memory: Optional[TranslationMemory] = None
+        self._reader = BlockingCallExecutor(
+            "store_reader", ExecutorConfig(max_workers=self.config.read_workers, timeout=self.config.read_timeout)
+        )
+        self._writer = BlockingCallExecutor("store_writer", ExecutorConfig(max_workers=1, timeout=60.0))
+        self._pending_rows: dict[str, tuple] = {}
+        self._pending_touches: dict[str, int] = {}
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_compacted_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.read_timeouts = 0
+        self.written = 0
+        self.compacted = 0
+
+    @property
+    def started(self) -> bool:
+        return self._flush_task is not None
+
+    async def start(self):
+        if not self.config.enabled:
+            return
+        self.memory = await self._writer.run(TranslationMemory, self.config.path)
+        self._flush_event = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"Translation store opened: {self.config.path}")
+
+    async def stop(self):
+        if self._flush_task is None:
+            return
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        # 종료 중에 stop()이 취소되더라도 남은 항목은 끝까지 기록함
+        await asyncio.shield(self._flush())
+        self._reader.shutdown()
+        self._writer.shutdown()
+
+    async def get(self, key: CacheKey) -> Optional[str]:
+        if not self.started:
+            return None
+
+        key_hash = hash_key(key)
+        pending = self._pending_rows.get(key_hash)
+        if pending is not None:  # 아직 DB에 기록되지 않은 항목
+            self.hits += 1
+            return pending[6]
+
+        try:
+            translated_text = await self._reader.run(self.memory.get, key_hash)
+        except asyncio.TimeoutError:
+            self.read_timeouts += 1
+            return None
+        except sqlite3.Error as e:
+            logger.error(f"Translation store read failed: {e}")
+            return None
+
+        if translated_text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._pending_touches[key_hash] = self._pending_touches.get(key_hash, 0) + 1
+        return translated_text
+
+    def put(self, key: CacheKey, translated_text: Optional[str]):
+        if not self.started or translated_text is None:
+            return
+
+        key_hash = hash_key(key)
+        size = len(key.text.encode("utf-8")) + len(translated_text.encode("utf-8"))
+        self._pending_rows[key_hash] = (
+            key_hash,
+            key.backend,
+            key.src_lang,
+            key.tgt_lang,
+            key.glossary_version,
+            key.text,
+            translated_text,
+            size,
+        )
+        if len(self._pending_rows) >= self.config.flush_batch_size:
+            self._flush_event.set()
+
+    async def _flush(self):
+        if not self._pending_rows and not self._pending_touches:
+            return
+        rows, self._pending_rows = self._pending_rows, {}
+        touched, self._pending_touches = self._pending_touches, {}
+        try:
+            await self._writer.run(self.memory.write_batch, list(rows.values()), touched)
+            self.written += len(rows)
+        except asyncio.CancelledError:
+            # 기록되었는지 알 수 없으므로 되돌려서 다음 flush에서 다시 기록(같은 row는 덮어씀). 그 사이 새로 들어온 항목이 우선
+            self._pending_rows = {**rows, **self._pending_rows}
+            for key_hash, n_touches in touched.items():
+                self._pending_touches[key_hash] = self._pending_touches.get(key_hash, 0) + n_touches
+            raise
+        except Exception as e:
+            logger.error(f"Translation store write failed({len(rows)} rows dropped): {e}")
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.config.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self._flush()
+
+            if time.monotonic() - self._last_compacted_at > self.config.compact_interval:
+                self._last_compacted_at = time.monotonic()
+                try:
+                    self.compacted += await self._writer.run(self.memory.compact, self.config.max_bytes)
+                except Exception as e:
+                    logger.error(f"Translation store compaction failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.config.enabled,
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "read_timeouts": self.read_timeouts,
+            "pending_writes": len(self._pending_rows),
+            "written": self.written,
+            "compacted": self.compacted,
+        }
+
+
+translation_store = TranslationStore()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and prune the translation memory")
+    parser.add_argument("--path", default=translation_store.config.path)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show entry counts and sizes")
+
+    list_parser = subparsers.add_parser("list", help="Show recently used entries")
+    list_parser.add_argument("--limit", type=int, default=20)
+    list_parser.add_argument("--backend")
+
+    prune_parser = subparsers.add_parser("prune", help="Delete entries matching the conditions")
+    prune_parser.add_argument("--older-than-days", type=float)
+    prune_parser.add_argument("--backend")
+    prune_parser.add_argument("--tgt-lang")
+    prune_parser.add_argument("--all", action="store_true", help="Delete every entry")
+
+    compact_parser = subparsers.add_parser("compact", help="Shrink the store under --max-bytes")
+    compact_parser.add_argument("--max-bytes", type=int, default=translation_store.config.max_bytes)
+    compact_parser.add_argument("--vacuum", action="store_true", help="Also rebuild the DB file to release space")
+
+    args = parser.parse_args()
+    memory = TranslationMemory(args.path)
+
+    if args.command == "stats":
+        for name, value in memory.stats().items():
+            print(f"{name:<20}: {value}")
+
+    elif args.command == "list":
+        for backend, src_lang, tgt_lang, hits, last_used_at, src_text, translated_text in memory.list_recent(
+            limit=args.limit, backend=args.backend
+        ):
+            last_used = time.strftime("%y%m%d %H:%M:%S", time.localtime(last_used_at))
+            print(f"({last_used}) [{backend} {src_lang}->{tgt_lang}, hits={hits}] {src_text!r} -> {translated_text!r}")
+
+    elif args.command == "prune":
+        if not args.all and args.older_than_days is None and args.backend is None and args.tgt_lang is None:
+            parser.error("prune needs at least one condition, or --all")
+        n_deleted = memory.prune(older_than_days=args.older_than_days, backend=args.backend, tgt_lang=args.tgt_lang)
+        print(f"Deleted {n_deleted} entries")
+
+    elif args.command == "compact":
+        n_deleted = memory.compact(args.max_bytes, vacuum=args.vacuum)
+        print(f"Deleted {n_deleted} entries")
+
+
+if __name__ == "__main__":
+    main()
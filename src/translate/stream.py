@@ -0,0 +1,125 @@
+"""긴 text를 segment 단위로 번역하면서, 번역이 끝난 segment부터 바로 내보내는 streaming 번역
+- 이벤트 순서: start -> segment(완료된 순서. index로 원래 위치를 알 수 있음) ... -> end
+- 각 segment의 text에는 원문의 segment 뒤 공백/줄바꿈이 포함되어 있어, index 순서대로 이어붙이면 전체 번역문이 됨
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+import orjson
+
+from src.common.base import logger
+from src.common.config import load_config
+from src.common.metrics import FALLBACKS, timed_stage
+from src.common.models import StrEnum, TranslatorType
+from src.translate.translator import Translator
+
+
+class StreamFormat(StrEnum):
+    ndjson = "ndjson"
+    sse = "sse"
+
+
+STREAM_MEDIA_TYPES = {StreamFormat.ndjson: "application/x-ndjson", StreamFormat.sse: "text/event-stream"}
+
+
+@dataclass
+class StreamConfig:
+    """- segment_chars: 한 segment의 최대 글자 수. 작을수록 첫 번역문이 빨리 나오지만 요청 수가 늘어남"""
+
+    segment_chars: int = 600
+
+
+stream_config = load_config(StreamConfig, "stream")
+
+
+def format_event(event: dict, stream_format: StreamFormat) -> bytes:
+    data = orjson.dumps(event)
+    if stream_format == StreamFormat.sse:
+        return b"event: " + event["type"].encode() + b"\ndata: " + data + b"\n\n"
+    return data + b"\n"
+
+
+async def iter_translation_events(
+    translator: Translator,
+    translator_type: TranslatorType,
+    src_text: str,
+    tgt_lang: Optional[str] = None,
+    fallback_translator: Optional[Translator] = None,
+    src_lang: Optional[str] = None,
+) -> AsyncIterator[dict]:
+    """translator로 segment들을 동시에 번역하고, 끝나는 순서대로 이벤트(dict)를 yield
+    실패한 segment는 fallback_translator(Google)로 다시 번역함
+    src_lang: 이미 감지한 src_text의 언어. 주어지면 다시 감지하지 않음
+    """
+    src_text = translator.preprocess(src_text)
+    if not src_text:
+        yield {"type": "end", "n_segments": 0, "n_failed": 0, "status_msg": "❗ Empty text"}
+        return
+
+    detected_lang = src_lang
+    src_lang, resolved_tgt_lang, error_msg = await translator.resolve_langs(src_text, tgt_lang, detected_lang)
+    if error_msg is not None:
+        if fallback_translator is None:
+            yield {"type": "end", "n_segments": 0, "n_failed": 0, "status_msg": error_msg}
+            return
+        # main backend가 지원하지 않는 언어쌍이면 전체를 Google API로 번역
+        logger.error("%s API failed. Try Google API", translator_type)
+        translator, translator_type, fallback_translator = fallback_translator, TranslatorType.google, None
+        src_lang, resolved_tgt_lang, fallback_error_msg = await translator.resolve_langs(
+            src_text, tgt_lang, detected_lang
+        )
+        if fallback_error_msg is not None:
+            yield {"type": "end", "n_segments": 0, "n_failed": 0, "status_msg": error_msg}
+            return
+
+    chunks = translator.split_chunks(src_text, max_chars=stream_config.segment_chars)
+    yield {"type": "start", "n_segments": len(chunks), "src_lang": src_lang, "tgt_lang": resolved_tgt_lang}
+
+    fallback_langs_lock = asyncio.Lock()
+    fallback_langs: dict = {}
+
+    async def _translate_by_fallback(chunk: str) -> Optional[str]:
+        async with fallback_langs_lock:
+            if not fallback_langs:
+                fallback_langs["resolved"] = await fallback_translator.resolve_langs(src_text, tgt_lang, detected_lang)
+        fallback_src_lang, fallback_tgt_lang, fallback_error_msg = fallback_langs["resolved"]
+        if fallback_error_msg is not None:
+            return None
+        translated_chunk, _ = await fallback_translator.translate_chunk(chunk, fallback_src_lang, fallback_tgt_lang)
+        return translated_chunk
+
+    async def _translate(idx: int, chunk: str) -> dict:
+        event = {"type": "segment", "index": idx, "translator_type": translator_type}
+        translated_chunk, status_code = await translator.translate_chunk(chunk, src_lang, resolved_tgt_lang)
+        if translated_chunk is not None:
+            return {**event, "text": translated_chunk, "status": "ok", "status_msg": None}
+
+        status_msg = translator.__class__.error_code.convert_to_msg(status_code)
+        if fallback_translator is not None:
+            FALLBACKS.inc(translator_type, "failed")
+            with timed_stage("fallback"):
+                translated_chunk = await _translate_by_fallback(chunk)
+            if translated_chunk is not None:
+                return {
+                    **event,
+                    "text": translated_chunk,
+                    "status": "fallback",
+                    "status_msg": status_msg + "<br/>But translate it by Google API",
+                    "translator_type": TranslatorType.google,
+                }
+            status_msg = status_msg + "<br/>Google API also failed"
+        return {**event, "text": None, "status": "error", "status_msg": status_msg}
+
+    tasks = [asyncio.create_task(_translate(idx, chunk)) for idx, chunk in enumerate(chunks)]
+    n_failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            n_failed += event["status"] == "error"
+            yield event
+    finally:  # client가 연결을 끊은 경우 등. 남은 번역 요청을 취소
+        for task in tasks:
+            task.cancel()
+
+    yield {"type": "end", "n_segments": len(chunks), "n_failed": n_failed, "status_msg": None}
@@ -1,149 +1,587 @@
-import re
+import asyncio
+import logging
+import threading
+import time
 from abc import abstractmethod
-from functools import lru_cache
-from pathlib import Path
-from typing import Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import httpx
-from googletrans import Translator as GoogleTrans
 
-from src.common.base import gen_log_text, logger
-from src.common.models import APIErrorCode, UserOption
-from src.common.utils import load_obj
-from src.translate.utils import isKoreanIncluded
+from src.common.base import log_fields, logger
+from src.common.config import load_config
+from src.common.metrics import (
+    CACHE_LOOKUPS,
+    REQUEST_CHARS,
+    REUSED_CHARS,
+    UPSTREAM_CHARS,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_SECONDS,
+    timed_stage,
+)
+from src.common.models import APIErrorCode, TranslatorClientInfo, TranslatorType, UserOption
+from src.translate.breaker import CircuitBreaker, circuit_breakers, hash_api_key, parse_retry_after
+from src.translate.cache import CacheKey, normalize_text, translation_cache
+from src.translate.client import REQUEST_ERRORS, TIMEOUT_ERRORS, http_clients
+from src.translate.executor import google_executor
+from src.translate.glossary import Glossary, MaskedText, glossary_registry
+from src.translate.lang_detect import lang_detector
+from src.translate.lang_index import lang_index
+from src.translate.latency import backend_latency
+from src.translate.limiter import RateLimit, rate_limiters
+from src.translate.router import backend_router
+from src.translate.segment import pack_segments, split_sentences, split_trailing_space
+from src.translate.singleflight import translation_flights
+from src.translate.store import translation_store
 
-SUPPORT_LANG_DIR = Path("data/support_lang")
-with open(SUPPORT_LANG_DIR / "code_to_lang.tsv", "r") as file:
-    code_to_lang_dict = {line.split("\t")[0]: line.split("\t")[1].strip() for line in file}
+
+@dataclass
+class UpstreamConfig:
+    """backend API 주소. 부하 테스트 때는 mock server(benchmarks.mock_upstream)를 가리키도록 바꿈
+    - google_url: 비어 있으면 googletrans를 사용. 주소를 주면 Cloud Translation v2 형식의 HTTP API로 요청
+    """
+
+    papago_url: str = "https://openapi.naver.com/v1/papago/n2mt"
+    deepl_url: str = "https://api-free.deepl.com/v2/translate"
+    deepl_glossary_url: str = "https://api-free.deepl.com/v2/glossaries"
+    google_url: str = ""
+
+
+upstream_config = load_config(UpstreamConfig, "upstream")
+
+
+@dataclass
+class ReuseConfig:
+    """조금 고친 text를 다시 번역할 때, 이전에 번역한 문장은 다시 보내지 않도록 문장 단위로 번역/저장
+    cache에 없는 문장들은 한 번의 요청으로 보냄(DeepL은 text 배열, 나머지는 줄바꿈으로 이어서). 문장 하나씩 보내지 않음
+    문장을 줄바꿈으로 이어서 번역하므로 번역 품질이 달라질 수 있어 기본값은 꺼져 있음
+    - min_chars: 이보다 짧은 text는 문장으로 나누지 않고 한 번에 번역
+    - max_segments: 문장이 이보다 많으면 문장 단위로 나누지 않음
+    """
+
+    enabled: bool = False
+    min_chars: int = 200
+    max_segments: int = 64
+
+
+reuse_config = load_config(ReuseConfig, "reuse")
+LINE_SEPARATOR = "\n"  # 여러 문장을 한 번의 요청으로 보낼 때 문장 사이에 넣는 구분자
+
+if TYPE_CHECKING:
+    from googletrans import Translator as GoogleTrans
+
+_google_trans_local = threading.local()
+
+
+def get_google_trans() -> "GoogleTrans":
+    """googletrans.Translator는 thread-safe하지 않으므로 executor의 thread마다 하나씩 만들어 재사용
+    googletrans는 Google API를 처음 사용할 때 import함(Google을 쓰지 않는 worker의 시작 시간을 줄이기 위해)
+    """
+    google_trans = getattr(_google_trans_local, "translator", None)
+    if google_trans is None:
+        from googletrans import Translator as GoogleTrans
+
+        google_trans = GoogleTrans()
+        _google_trans_local.translator = google_trans
+    return google_trans
+
+
+def _google_detect(text: str) -> str:
+    return get_google_trans().detect(text).lang
+
+
+def _google_translate(text: str, src_lang: str, tgt_lang: str) -> str:
+    return get_google_trans().translate(text, src=src_lang, dest=tgt_lang).text
 
 
 class Translator:
     SERVICE_NAME: str
-    SUPPORT_SRC_LANG: list
-    SUPPORT_TGT_LANG: list
+    TRANSLATOR_TYPE: TranslatorType  # 지원 언어는 lang_index에서 이 값으로 찾음
     error_code: APIErrorCode
     REQUEST_URL: str = None
     MAX_CHAR_PER_REQ: int = None
+    # API key당 요청 속도, 동시 요청 수 제한(긴 text를 나눈 chunk들도 이 안에서 동시에 보냄). None이면 제한 없음
+    RATE_LIMIT: Optional[RateLimit] = None
 
     def __init__(
         self,
         user_option: Optional[UserOption],
-        term_en_list: list = None,
+        glossary: Optional[Glossary] = None,
+        client_info: Optional[TranslatorClientInfo] = None,
     ):
         """
         main_lang: 사용자는 원문 클릭 시, 번역되어 보이는 언어(target language).
             단 source_text가 main_lang인 경우는 아래 sub_lang이 target language으로 역할)
         sub_lang: source_text가 main_lang인 경우 target language
+        client_info: 사용할 API key. 없으면 user_option.translator_client_info(auto일 때는 translator_client_infos 중 하나)
         """
-        self.api_key = user_option.translator_client_info.api_key
-        self.secret_key = user_option.translator_client_info.secret_key
+        if client_info is None:
+            client_info = user_option.translator_client_info
+        self.api_key = client_info.api_key
+        self.secret_key = client_info.secret_key
 
         self.main_tgt_lang = user_option.main_tgt_lang
         self.sub_tgt_lang = user_option.sub_tgt_lang
-        # self.term_en_list = term_en_list
+        # 번역하지 않고 그대로 둘 용어들. 사용자 용어집이 있으면 base 용어집과 합친 것
+        self.glossary = glossary if glossary is not None else glossary_registry.get(user_option.user_defined_terms)
+        self.glossary_version = self.glossary.version  # 번역 결과에 영향을 주므로 cache key에 포함됨
+
+    @property
+    def limit_key(self) -> Optional[str]:
+        """rate limiter, circuit breaker, singleflight를 나누는 key. quota가 API key별이므로 기본은 api_key"""
+        return self.api_key
 
     @staticmethod
-    @lru_cache(maxsize=10)
-    def identify_lang(text: str, char_num_to_check: int = 30) -> str:
-        chars_prefix = text[:char_num_to_check]  # text.split()[:max_token_num]
+    async def identify_lang(text: str, char_num_to_check: int = 30) -> str:
+        """local detector(lang_detector)로 먼저 판단하고, confidence가 낮은 경우에만 Google detect를 사용"""
+        detected = lang_detector.detect(text)
+        if detected.confidence >= lang_detector.config.min_confidence or not lang_detector.config.remote_fallback:
+            return detected.lang if detected.lang is not None else "en"
 
-        isKorean = isKoreanIncluded(chars_prefix)
-        if isKorean:
-            lang = "ko"
-        else:
-            try:
-                google_translator = GoogleTrans()
-                lang = google_translator.detect(chars_prefix).lang
-            except Exception:
-                logger.error("'google_translator.detect' raise error. Just regard it as English")
-                lang = "en"
+        chars_prefix = text[:char_num_to_check]  # text.split()[:max_token_num]
+        try:
+            lang = await google_executor.run(_google_detect, chars_prefix)
+        except Exception:
+            lang = detected.lang if detected.lang is not None else "en"
+            logger.error(f"'google_translator.detect' raise error. Just regard it as '{lang}'")
 
         return lang
 
+    @classmethod
     def check_lang_is_supported_and_transform_if_needed(
         cls, src_lang: str, tgt_lang: str
     ) -> tuple[bool | str, bool | str]:
-        if src_lang not in cls.SUPPORT_SRC_LANG:
-            src_lang = src_lang.split("-")[0]
-            if src_lang not in cls.SUPPORT_SRC_LANG:
-                logger.warning(f"{cls.SERVICE_NAME} is not supported the source language: {src_lang}")
-                src_lang = False
-        if tgt_lang not in cls.SUPPORT_TGT_LANG:
-            tgt_lang = tgt_lang.split("-")[0]
-            if tgt_lang not in cls.SUPPORT_TGT_LANG:
-                logger.warning(f"{cls.SERVICE_NAME} is not supported the target language: {tgt_lang}")
-                tgt_lang = False
-
-        return src_lang, tgt_lang
+        """src_lang, tgt_lang을 backend에서 쓰는 code로 변환. 지원하지 않는 언어는 False"""
+        src_code, tgt_code = lang_index.resolve_pair(cls.TRANSLATOR_TYPE, src_lang, tgt_lang)
+        if src_code is None:
+            logger.warning(f"{cls.SERVICE_NAME} is not supported the source language: {src_lang}")
+        if tgt_code is None:
+            logger.warning(f"{cls.SERVICE_NAME} is not supported the target language: {tgt_lang}")
+        return src_code or False, tgt_code or False
 
     @classmethod
     def preprocess(cls, text: str) -> str:
-        """주어진 text가 MAX_CHAR_PER_REQ를 넘는 경우는
-        일단 MAX_CHAR_PER_REQ 길이만큼 만든 다음에
-        (기호가 쓰여져서) 문장이 끝나는 것으로 보이는 지점을 찾아 그 기준으로 나누고 뒷 부분은 버림
-        TODO: 문장 단위로 나눠서 여러번 호출 또는 batch로 호출하도록 수정
-        """
-        ELLIPSIS_SYMBOL = "..."
-
-        def _get_split_idx(s: str) -> int:
-            match = re.finditer(r"[.:;!?<>()\[\]]", s[::-1])
-
-            index = None
-            for m in match:
-                print(len(s), m.start())
-                index = len(s) - m.start()
-                break
-            return index
-
-        if cls.MAX_CHAR_PER_REQ is not None and len(text) > cls.MAX_CHAR_PER_REQ:
-            split_idx = _get_split_idx(text[: cls.MAX_CHAR_PER_REQ - len(ELLIPSIS_SYMBOL)])
-            text = text[:split_idx] + ELLIPSIS_SYMBOL
-            logger.warning(f"Since rext is longger than {cls.MAX_CHAR_PER_REQ}, only front part would be translated")
+        """MAX_CHAR_PER_REQ를 넘는 text는 자르지 않고, run()에서 split_chunks()로 나눠서 번역함"""
         return text.strip()
 
     @classmethod
     def postprocess(cls, text: str) -> str:
         return text.strip()
 
+    @classmethod
+    def split_chunks(cls, text: str, max_chars: Optional[int] = None) -> list[str]:
+        """text가 MAX_CHAR_PER_REQ(또는 더 작은 max_chars)를 넘으면 문장 단위로 나눈 뒤,
+        한 번의 요청에 들어갈 크기로 다시 묶음. chunk들을 그대로 이어붙이면 원래 text가 됨
+        """
+        if cls.MAX_CHAR_PER_REQ is not None:
+            max_chars = cls.MAX_CHAR_PER_REQ if max_chars is None else min(max_chars, cls.MAX_CHAR_PER_REQ)
+        if max_chars is None or len(text) <= max_chars:
+            return [text]
+        return pack_segments(split_sentences(text), max_chars)
+
     @abstractmethod
     async def translate(self, src_text: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
         return None, None
 
-    @lru_cache(maxsize=10)
-    async def run(self, src_text: str, tgt_lang: str = None) -> Tuple[Optional[str], Optional[str]]:
-        """translated_text, error_msg 를 리턴"""
-        src_text = self.preprocess(src_text)
-        logger.info(f"Text to translate: '{src_text}'")
-        if not src_text:
-            return "", "❗ Empty text"
+    async def post(self, url: str, n_chars: int = 0, **kwargs) -> Tuple[Optional[httpx.Response], int]:
+        return await self.request("POST", url, n_chars, **kwargs)
 
-        # 1. Detect src_lang and set tgt_lang
-        src_lang = Translator.identify_lang(src_text)
+    async def request(self, method: str, url: str, n_chars: int = 0, **kwargs) -> Tuple[Optional[httpx.Response], int]:
+        """backend API에 요청을 보내고 (response, status_code) 를 리턴
+        - 요청 latency는 backend_latency에 기록(hedged fallback의 대기 시간 계산에 사용)
+        - timeout은 504, 연결 실패 등 network 오류는 503으로 처리하고 response는 None
+        - 이 backend + API key의 circuit breaker가 open이면 요청을 보내지 않고 바로 (None, open된 이유의 status_code)
+        - API key의 RATE_LIMIT을 넘으면 잠시 기다리고, 그래도 보낼 수 없으면 요청을 보내지 않고 바로 (None, 429)
+        n_chars: 요청에 담긴 번역할 글자 수(RATE_LIMIT의 글자 수 제한에 사용)
+        """
+        breaker = circuit_breakers.get(self.SERVICE_NAME, self.limit_key) if circuit_breakers.config.enabled else None
+        if breaker is not None and not breaker.allow():
+            logger.warning(
+                "Circuit breaker %s is %s. Skip %s API request", breaker.name, breaker.state, self.SERVICE_NAME
+            )
+            return None, breaker.open_status_code or 503
+
+        limiter = rate_limiters.get(self.SERVICE_NAME, self.limit_key, self.RATE_LIMIT)
+        client = http_clients.get(self.SERVICE_NAME)
+        response = None
+        try:
+            if not await rate_limiters.acquire(limiter, n_chars):
+                logger.warning("Too many %s API requests for the API key. Skip request", self.SERVICE_NAME)
+                if breaker is not None:
+                    breaker.release_probe()
+                return None, 429
+
+            start = time.perf_counter()
+            try:
+                with timed_stage("upstream"):
+                    response = await client.request(method, url, **kwargs)
+                status_code = response.status_code
+            except TIMEOUT_ERRORS as e:
+                logger.error("%s API timeout: %r", self.SERVICE_NAME, e)
+                status_code = 504
+            except REQUEST_ERRORS as e:
+                logger.error("%s API request failed: %r", self.SERVICE_NAME, e)
+                status_code = 503
+            finally:
+                if limiter is not None:
+                    limiter.release()
+        except BaseException:  # hedged/race fallback에서 취소된 경우 등. 결과를 모르므로 latency, breaker에 반영하지 않음
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+
+        self.record_upstream(time.perf_counter() - start, status_code, n_chars)
+        if breaker is not None:
+            self.update_breaker(breaker, response, status_code)
+        return response, status_code
+
+    def record_upstream(self, seconds: float, status_code: Optional[int], n_chars: int):
+        """실제로 보낸 backend 요청의 latency, status code(APIErrorCode 분류 포함), 글자 수를 기록"""
+        backend_latency.record(self.SERVICE_NAME, seconds)
+        UPSTREAM_SECONDS.observe(seconds, self.SERVICE_NAME)
+        UPSTREAM_REQUESTS.inc(self.SERVICE_NAME, status_code, self.error_code.categorize(status_code))
+        UPSTREAM_CHARS.inc(self.SERVICE_NAME, amount=n_chars)
+
+    def update_breaker(self, breaker: CircuitBreaker, response: Optional[httpx.Response], status_code: int):
+        if self.is_quota_exceeded(response, status_code):
+            breaker.record_quota_exceeded(status_code, self.quota_reset_after())
+        elif status_code in self.error_code.rate_limit_exceeded:
+            retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+            breaker.record_rate_limited(status_code, retry_after)
+        elif status_code >= 500:
+            breaker.record_failure(status_code)
+        else:  # 인증 실패 등 나머지 4xx는 backend 장애가 아니므로 성공으로 처리
+            breaker.record_success()
+
+    def is_quota_exceeded(self, response: Optional[httpx.Response], status_code: int) -> bool:
+        return status_code in self.error_code.quota_exceeded and status_code not in self.error_code.rate_limit_exceeded
+
+    @classmethod
+    def quota_reset_after(cls) -> Optional[float]:
+        """quota가 초기화되기까지 남은 시간(초). 모르면 None(BreakerConfig.quota_duration 사용)"""
+        return None
+
+    def mask_terms(self, text: str, src_lang: str, tgt_lang: str) -> MaskedText:
+        if not self.glossary.applies_to(src_lang):
+            return MaskedText(text, [])
+        return self.glossary.mask(text)
+
+    def unmask_terms(self, translated_text: str, masked: MaskedText) -> Optional[str]:
+        restored_text = Glossary.unmask(translated_text, masked.terms)
+        if restored_text is None:
+            logger.warning(f"{self.SERVICE_NAME} API broke glossary placeholders: {translated_text}")
+        return restored_text
+
+    def make_cache_key(self, src_text: str, src_lang: str, tgt_lang: str) -> CacheKey:
+        return CacheKey(
+            backend=self.SERVICE_NAME,
+            src_lang=src_lang,
+            tgt_lang=tgt_lang,
+            text=normalize_text(src_text),
+            glossary_version=self.glossary_version,
+        )
+
+    async def resolve_langs(
+        self, src_text: str, tgt_lang: Optional[str] = None, src_lang: Optional[str] = None
+    ) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        """src_lang을 감지하고 tgt_lang을 정한 뒤, backend에서 쓰는 code로 변환
+        (src_lang, tgt_lang, error_msg) 를 리턴. 지원하지 않는 언어면 error_msg만 채워짐
+        src_lang: 이미 감지한 언어(ex. TranslationSession.select). 주어지면 다시 감지하지 않음
+        """
+        if src_lang is None:
+            with timed_stage("detect"):
+                src_lang = await Translator.identify_lang(src_text)
         if tgt_lang is None:
             tgt_lang = self.main_tgt_lang if src_lang != self.main_tgt_lang else self.sub_tgt_lang
 
         src_lang_orig, tgt_lang_orig = src_lang, tgt_lang
-        src_lang, tgt_lang = self.check_lang_is_supported_and_transform_if_needed(src_lang, tgt_lang)
+        with timed_stage("support_check"):
+            src_lang, tgt_lang = self.check_lang_is_supported_and_transform_if_needed(src_lang, tgt_lang)
         _msgs = []
         if not src_lang:
-            _msgs.append(f"source language('{code_to_lang_dict[src_lang_orig]}')")
+            _msgs.append(f"source language('{lang_index.language_name(src_lang_orig)}')")
         if not tgt_lang:
-            _msgs.append(f"target language('{code_to_lang_dict[tgt_lang_orig]}')")
+            _msgs.append(f"target language('{lang_index.language_name(tgt_lang_orig)}')")
         if _msgs:
             msg = " and ".join(_msgs)
-            return None, f"❗ {self.SERVICE_NAME} is not supported the {msg}"
+            return None, None, f"❗ {self.SERVICE_NAME} is not supported the {msg}"
 
-        # 2. Translate
-        translated_text, status_code = await self.translate(src_text=src_text, src_lang=src_lang, tgt_lang=tgt_lang)
+        return src_lang, tgt_lang, None
+
+    async def get_cached(self, cache_key: CacheKey) -> Optional[str]:
+        """cache -> translation store 순서로 이전 번역 결과를 찾음"""
+        translated_text = translation_cache.get(cache_key)
         if translated_text is not None:
-            translated_text = self.postprocess(translated_text)
-            logger.info(f"Translated text: {translated_text}")
-            return translated_text, None
+            CACHE_LOOKUPS.inc("cache_hit")
+            return translated_text
+        translated_text = await translation_store.get(cache_key)
+        if translated_text is not None:
+            CACHE_LOOKUPS.inc("store_hit")
+            translation_cache.put(cache_key, translated_text)
         else:
+            CACHE_LOOKUPS.inc("miss")
+        return translated_text
+
+    def put_cached(self, cache_key: CacheKey, translated_text: str):
+        translation_cache.put(cache_key, translated_text)
+        translation_store.put(cache_key, translated_text)
+
+    async def translate_chunk(self, chunk: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
+        """chunk 하나를 cache -> translation store -> backend API 순서로 찾아서 번역
+        chunk 뒤쪽의 공백(줄바꿈)은 번역 결과 뒤에 그대로 붙여서 리턴
+        """
+        chunk, trailing_space = split_trailing_space(chunk)
+        if not chunk:
+            return trailing_space, None
+
+        cache_key = self.make_cache_key(chunk, src_lang, tgt_lang)
+        translated_text = await self.get_cached(cache_key)
+        if translated_text is not None:
+            return translated_text + trailing_space, None
+
+        translated_text, status_code = await self.fetch_shared(chunk, src_lang, tgt_lang, cache_key)
+        if translated_text is None:
+            return None, status_code
+        return translated_text + trailing_space, None
+
+    async def fetch_shared(
+        self, chunk: str, src_lang: str, tgt_lang: str, cache_key: CacheKey
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """fetch()와 같지만, 같은 chunk를 동시에 번역하는 요청들은 backend 요청 하나를 공유
+        quota가 API key별이므로 key도 구분함
+        """
+        flight_key = (cache_key, hash_api_key(self.limit_key))
+        return await translation_flights.do(flight_key, lambda: self.fetch(chunk, src_lang, tgt_lang, cache_key))
+
+    async def fetch_many(
+        self, src_texts: list[str], src_lang: str, tgt_lang: str, cache_keys: list[CacheKey]
+    ) -> Optional[list[Tuple[Optional[str], Optional[int]]]]:
+        """cache에 없는 여러 문장(한 text의 문장들)을 번역하고 결과를 문장별로 cache에 저장
+        문장마다 요청을 보내지 않도록 줄바꿈으로 이어서 MAX_CHAR_PER_REQ 단위로 보내고, 번역 결과를 줄 단위로 다시 나눔
+        번역 결과의 줄 수가 맞지 않거나 요청 수가 RATE_LIMIT의 burst를 넘는 등 문장별로 나눌 수 없으면 None
+        한 번의 요청에 여러 text를 보낼 수 있는 backend는 override 함
+        """
+        if not src_texts:
+            return []
+        if len(src_texts) == 1:
+            return [await self.fetch_shared(src_texts[0], src_lang, tgt_lang, cache_keys[0])]
+        if any(LINE_SEPARATOR in src_text for src_text in src_texts):
+            return None
+
+        groups, current, current_chars = [], [], 0
+        for idx, src_text in enumerate(src_texts):
+            n_chars = len(src_text) + len(LINE_SEPARATOR)
+            if current and self.MAX_CHAR_PER_REQ is not None and current_chars + n_chars > self.MAX_CHAR_PER_REQ:
+                groups.append(current)
+                current, current_chars = [], 0
+            current.append(idx)
+            current_chars += n_chars
+        groups.append(current)
+        if self.RATE_LIMIT is not None and len(groups) > self.RATE_LIMIT.burst:
+            return None
+
+        async def _fetch_group(indices: list[int]) -> Optional[list[Tuple[Optional[str], Optional[int]]]]:
+            joined_text = LINE_SEPARATOR.join(src_texts[idx] for idx in indices)
+            translated_text, status_code = await self.translate_masked(joined_text, src_lang, tgt_lang)
+            if translated_text is None:
+                return [(None, status_code)] * len(indices)
+            lines = [line for line in translated_text.split(LINE_SEPARATOR) if line.strip()]
+            if len(lines) != len(indices):
+                logger.warning(f"{self.SERVICE_NAME} API returned {len(lines)} lines for {len(indices)} sentences")
+                return None
+
+            results = []
+            for idx, line in zip(indices, lines):
+                line = self.postprocess(line)
+                self.put_cached(cache_keys[idx], line)
+                results.append((line, None))
+            return results
+
+        group_results = await asyncio.gather(*(_fetch_group(indices) for indices in groups))
+        if any(results is None for results in group_results):
+            return None
+        return [result for results in group_results for result in results]
+
+    async def translate_masked(self, chunk: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
+        """chunk를 backend API로 번역. glossary 용어는 placeholder로 바꿔서 보내고 번역 후 되돌림"""
+        masked = self.mask_terms(chunk, src_lang, tgt_lang)
+        start = time.perf_counter()
+        translated_text, status_code = await self.translate(src_text=masked.text, src_lang=src_lang, tgt_lang=tgt_lang)
+        backend_router.record(
+            self.TRANSLATOR_TYPE,
+            src_lang,
+            tgt_lang,
+            len(chunk),
+            time.perf_counter() - start,
+            success=translated_text is not None,
+        )
+        if translated_text is not None and masked.terms:
+            restored_text = self.unmask_terms(translated_text, masked)
+            if restored_text is None:  # placeholder가 깨진 경우 용어 보호 없이 다시 번역
+                translated_text, status_code = await self.translate(
+                    src_text=chunk, src_lang=src_lang, tgt_lang=tgt_lang
+                )
+            else:
+                translated_text = restored_text
+        return translated_text, status_code
+
+    async def fetch(
+        self, chunk: str, src_lang: str, tgt_lang: str, cache_key: CacheKey
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """cache에 없는 chunk를 backend API로 번역하고 결과를 cache에 저장"""
+        translated_text, status_code = await self.translate_masked(chunk, src_lang, tgt_lang)
+        if translated_text is None:
+            return None, status_code
+
+        translated_text = self.postprocess(translated_text)
+        self.put_cached(cache_key, translated_text)
+        return translated_text, None
+
+    def split_reusable_segments(self, text: str) -> Optional[list[str]]:
+        """text를 문장 단위로 번역/저장할 때의 문장들. 문장 단위로 번역하지 않을 text면 None
+        각 문장이 한 번의 요청에 들어가야 하고, 문장이 2개 이상 max_segments 이하여야 함
+        """
+        if not reuse_config.enabled or len(text) < reuse_config.min_chars:
+            return None
+        segments = split_sentences(text)
+        if not 1 < len(segments) <= reuse_config.max_segments:
+            return None
+        if self.MAX_CHAR_PER_REQ is not None and any(len(segment) > self.MAX_CHAR_PER_REQ for segment in segments):
+            return None
+        return segments
+
+    async def translate_segments(
+        self, segments: list[str], src_lang: str, tgt_lang: str
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """문장마다 cache -> translation store에서 이전 번역을 찾고, 없는(새로 쓰거나 고친) 문장만 backend로 보낸 뒤
+        순서대로 이어붙임. 이전 번역을 다시 사용한 글자 수는 REUSED_CHARS에 기록
+        """
+        parts = [split_trailing_space(segment) for segment in segments]
+        cache_keys = {sentence: self.make_cache_key(sentence, src_lang, tgt_lang) for sentence, _ in parts if sentence}
+        sentences = list(cache_keys)  # 같은 문장이 여러 번 있으면 한 번만 찾고 번역
+        cached_texts = await asyncio.gather(*(self.get_cached(cache_keys[sentence]) for sentence in sentences))
+        translations = {
+            sentence: cached_text for sentence, cached_text in zip(sentences, cached_texts) if cached_text is not None
+        }
+        reused_chars = sum(len(sentence) for sentence, _ in parts if sentence in translations)
+
+        missed = [sentence for sentence in sentences if sentence not in translations]
+        if translations and missed:
+            logger.info(
+                "Reuse %d/%d sentences and translate %d sentences", len(translations), len(sentences), len(missed)
+            )
+        results = await self.fetch_many(missed, src_lang, tgt_lang, [cache_keys[sentence] for sentence in missed])
+        if results is None:  # 문장별 번역으로 나눌 수 없으면 문장 단위 저장 없이 text 전체를 번역
+            return await self.translate_chunks("".join(segments), src_lang, tgt_lang)
+        for sentence, (translated_text, status_code) in zip(missed, results):
+            if translated_text is None:
+                return None, status_code
+            translations[sentence] = translated_text
+        # text 전체 번역으로 넘어가거나 실패한 경우에는 다시 사용한 것이 아니므로, 결과를 만들 수 있을 때만 기록
+        REUSED_CHARS.inc(self.SERVICE_NAME, amount=reused_chars)
+
+        translated_parts = [
+            translations[sentence] + trailing_space if sentence else trailing_space
+            for sentence, trailing_space in parts
+        ]
+        with timed_stage("postprocess"):
+            translated_text = self.postprocess("".join(translated_parts))
+        return translated_text, None
+
+    async def translate_text(self, src_text: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
+        """ReuseConfig 조건에 맞는 text는 문장 단위로 번역해서 고친 문장만 다시 번역함(translate_segments)
+        나머지는 translate_chunks()로 번역
+        """
+        segments = self.split_reusable_segments(src_text)
+        if segments is not None:
+            return await self.translate_segments(segments, src_lang, tgt_lang)
+        return await self.translate_chunks(src_text, src_lang, tgt_lang)
+
+    async def translate_chunks(
+        self, src_text: str, src_lang: str, tgt_lang: str
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """긴 text는 chunk로 나눠서 동시에 번역한 뒤 순서대로 이어붙임
+        chunk 중 하나라도 실패하면 (None, 실패한 status_code)를 리턴
+        """
+        chunks = self.split_chunks(src_text)
+        if len(chunks) > 1:
+            logger.info("Text is longer than %d, so translate it in %d chunks", self.MAX_CHAR_PER_REQ, len(chunks))
+        results = await asyncio.gather(*(self.translate_chunk(chunk, src_lang, tgt_lang) for chunk in chunks))
+
+        for translated_chunk, status_code in results:
+            if translated_chunk is None:
+                return None, status_code
+        with timed_stage("postprocess"):
+            translated_text = self.postprocess("".join(translated_chunk for translated_chunk, _ in results))
+        return translated_text, None
+
+    async def translate_many(
+        self, src_texts: list[str], src_lang: str, tgt_lang: str
+    ) -> list[Tuple[Optional[str], Optional[int]]]:
+        """같은 언어쌍의 여러 text를 번역. 기본 동작은 text마다 동시에 요청(fan-out)
+        한 번의 요청에 여러 text를 보낼 수 있는 backend는 override 함
+        """
+        return await asyncio.gather(*(self.translate_text(src_text, src_lang, tgt_lang) for src_text in src_texts))
+
+    async def run(
+        self, src_text: str, tgt_lang: str = None, src_lang: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """translated_text, error_msg 를 리턴. src_lang은 resolve_langs() 참고"""
+        with timed_stage("preprocess"):
+            src_text = self.preprocess(src_text)
+        logger.info("Text to translate: '%s'", src_text)
+        if not src_text:
+            return "", "❗ Empty text"
+        REQUEST_CHARS.inc(self.SERVICE_NAME, amount=len(src_text))
+
+        # 1. Detect src_lang and set tgt_lang
+        src_lang, tgt_lang, error_msg = await self.resolve_langs(src_text, tgt_lang, src_lang)
+        if error_msg is not None:
+            return None, error_msg
+
+        # 2. Translate
+        translated_text, status_code = await self.translate_text(src_text, src_lang, tgt_lang)
+        if translated_text is None:
             error_msg = self.__class__.error_code.convert_to_msg(status_code)
-            logger.error(f"{error_msg}")
+            logger.error("%s", error_msg)
             return None, error_msg
 
+        logger.info("Translated text: %s", translated_text)
+        return translated_text, None
+
+    async def run_batch(self, src_texts: list[str], tgt_lang: str = None) -> list[Tuple[Optional[str], Optional[str]]]:
+        """여러 text를 한 번에 번역. 입력 순서대로 (translated_text, error_msg) 를 리턴
+        - 같은 text는 한 번만 번역하고, 언어쌍이 같은 text끼리 묶어서 translate_many()로 보냄
+        """
+        with timed_stage("preprocess"):
+            src_texts = [self.preprocess(src_text) for src_text in src_texts]
+        unique_texts = list(dict.fromkeys(src_text for src_text in src_texts if src_text))
+        REQUEST_CHARS.inc(self.SERVICE_NAME, amount=sum(len(src_text) for src_text in unique_texts))
+        logger.info("Texts to translate: %d (%d unique)", len(src_texts), len(unique_texts))
+
+        results: dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        groups: dict[tuple[str, str], list[str]] = {}
+        resolved = await asyncio.gather(*(self.resolve_langs(src_text, tgt_lang) for src_text in unique_texts))
+        for src_text, (src_lang, resolved_tgt_lang, error_msg) in zip(unique_texts, resolved):
+            if error_msg is not None:
+                results[src_text] = (None, error_msg)
+            else:
+                groups.setdefault((src_lang, resolved_tgt_lang), []).append(src_text)
+
+        group_results = await asyncio.gather(
+            *(self.translate_many(group_texts, *lang_pair) for lang_pair, group_texts in groups.items())
+        )
+        for group_texts, translated in zip(groups.values(), group_results):
+            for src_text, (translated_text, status_code) in zip(group_texts, translated):
+                if translated_text is None:
+                    results[src_text] = (None, self.__class__.error_code.convert_to_msg(status_code))
+                else:
+                    results[src_text] = (translated_text, None)
+
+        return [results[src_text] if src_text else ("", "❗ Empty text") for src_text in src_texts]
+
 
 class PapagoTranslator(Translator):
     """
@@ -153,12 +591,30 @@ class PapagoTranslator(Translator):
     """
 
     SERVICE_NAME = "Papago"
-    SUPPORT_SRC_LANG: list = load_obj(SUPPORT_LANG_DIR / "papago_src_lang.txt")
-    SUPPORT_TGT_LANG: list = load_obj(SUPPORT_LANG_DIR / "papago_tgt_lang.txt")
+    TRANSLATOR_TYPE = TranslatorType.papago
     error_code = APIErrorCode(service_name=SERVICE_NAME, auth_failed=401, rate_limit_exceeded=429, quota_exceeded=429)
-    REQUEST_URL = "https://openapi.naver.com/v1/papago/n2mt"
+    REQUEST_URL = upstream_config.papago_url
     MAX_CHAR_PER_REQ = 5000
     # MAX_CHAR_PER_DAY = 10000
+    # 일일 글자 수 한도는 key(사용 요금제)마다 달라서 여기서 제한하지 않고, quota 초과 응답으로 circuit breaker가 처리
+    RATE_LIMIT = RateLimit(requests_per_sec=10, burst=10, max_concurrency=4)
+
+    QUOTA_ERROR_CODE = "010"  # 일일 사용 한도 초과. 초당 요청 수 초과와 같은 429로 옴
+    QUOTA_RESET_TZ = timezone(timedelta(hours=9))  # 일일 사용량은 한국 시간 자정에 초기화됨
+
+    def is_quota_exceeded(self, response: Optional[httpx.Response], status_code: int) -> bool:
+        if status_code not in self.error_code.quota_exceeded or response is None:
+            return False
+        try:
+            return response.json().get("errorCode") == self.QUOTA_ERROR_CODE
+        except ValueError:
+            return False
+
+    @classmethod
+    def quota_reset_after(cls) -> Optional[float]:
+        now = datetime.now(cls.QUOTA_RESET_TZ)
+        next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (next_midnight - now).total_seconds()
 
     async def translate(self, src_text: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
         header = {
@@ -167,18 +623,19 @@ class PapagoTranslator(Translator):
             "X-Naver-Client-Secret": self.secret_key,
         }
         data = {"text": src_text, "source": src_lang, "target": tgt_lang}
-        logger.debug(gen_log_text(data))
+        log_fields(logging.DEBUG, "Papago API request", **data)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(PapagoTranslator.REQUEST_URL, headers=header, data=data)
-            status_code = response.status_code
+        response, status_code = await self.post(
+            PapagoTranslator.REQUEST_URL, n_chars=len(src_text), headers=header, data=data
+        )
 
         if status_code == 200:
             t_data = response.json()
             translated_text = t_data["message"]["result"]["translatedText"]
             return translated_text, status_code
         else:
-            logger.error(gen_log_text(response.__dict__))
+            if response is not None:
+                log_fields(logging.ERROR, "Papago API error", status_code=status_code, body=response.text)
             return None, status_code
 
 
@@ -190,24 +647,64 @@ class GoogleTranslator(Translator):
     """
 
     SERVICE_NAME = "Google"
-    SUPPORT_SRC_LANG: list = load_obj(SUPPORT_LANG_DIR / "google_src_lang.txt")
-    SUPPORT_TGT_LANG: list = load_obj(SUPPORT_LANG_DIR / "google_tgt_lang.txt")
+    TRANSLATOR_TYPE = TranslatorType.google
+    REQUEST_URL = upstream_config.google_url or None
     MAX_CHAR_PER_REQ = 15000
-    error_code = APIErrorCode(service_name=SERVICE_NAME)
+    # 비공식 API라 key 없이 서버 IP 단위로 제한되므로, 모든 사용자가 limiter 하나(limit_key None)를 같이 씀
+    RATE_LIMIT = RateLimit(requests_per_sec=5, burst=10, max_concurrency=4)
+    error_code = APIErrorCode(service_name=SERVICE_NAME, rate_limit_exceeded=429)
 
-    translator = GoogleTrans()
+    @property
+    def limit_key(self) -> Optional[str]:
+        """fallback으로 쓰일 때 api_key는 사용자의 Papago/DeepL key이므로, 사용자와 상관없이 None 하나로 묶음"""
+        return None
 
     async def translate(self, src_text: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
+        if self.REQUEST_URL is not None:
+            return await self.translate_by_http(src_text, src_lang, tgt_lang)
+
+        limiter = rate_limiters.get(self.SERVICE_NAME, self.limit_key, self.RATE_LIMIT)
+        if not await rate_limiters.acquire(limiter, len(src_text)):
+            logger.warning("Too many %s API requests. Skip request", self.SERVICE_NAME)
+            return None, 429
+
+        start = time.perf_counter()
+        status_code = 200  # googletrans는 status code를 알려주지 않으므로, metrics에는 성공을 200으로 기록
         try:
-            response = self.__class__.translator.translate(src_text, src=src_lang, dest=tgt_lang)
-            # response.pronunciation: "oneul-eun wol-yoil-ibnida",
-            return response.text, None
+            with timed_stage("upstream"):
+                translated_text = await google_executor.run(_google_translate, src_text, src_lang, tgt_lang)
+            return translated_text, None
+
+        except asyncio.TimeoutError:
+            status_code = 504
+            return None, status_code
 
         except Exception as e:
             logger.error(e)
             status_code = 400
             return None, status_code
 
+        finally:
+            if limiter is not None:
+                limiter.release()
+            self.record_upstream(time.perf_counter() - start, status_code, len(src_text))
+
+    async def translate_by_http(
+        self, src_text: str, src_lang: str, tgt_lang: str
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """googletrans 대신 REQUEST_URL(Cloud Translation v2 basic 형식)로 번역. mock server에서 사용
+        - https://cloud.google.com/translate/docs/reference/rest/v2/translate
+        """
+        params = {"key": self.api_key} if self.api_key else None
+        data = {"q": src_text, "source": src_lang, "target": tgt_lang, "format": "text"}
+        response, status_code = await self.post(self.REQUEST_URL, n_chars=len(src_text), params=params, json=data)
+        if status_code == 200:
+            return response.json()["data"]["translations"][0]["translatedText"], status_code
+
+        if response is not None:
+            log_fields(logging.ERROR, "Google API error", status_code=status_code, body=response.text)
+        return None, status_code
+
 
 class DeepLTranslator(Translator):
     """
@@ -216,33 +713,312 @@ class DeepLTranslator(Translator):
     """
 
     SERVICE_NAME = "DeepL"
-    SUPPORT_SRC_LANG: list = load_obj(SUPPORT_LANG_DIR / "deepl_src_lang.txt")
-    SUPPORT_TGT_LANG: list = load_obj(SUPPORT_LANG_DIR / "deepl_tgt_lang.txt")
+    TRANSLATOR_TYPE = TranslatorType.deepl
     MAX_CHAR_PER_REQ = None
-    REQUEST_URL = "https://api-free.deepl.com/v2/translate"
+    REQUEST_URL = upstream_config.deepl_url
+    GLOSSARY_URL = upstream_config.deepl_glossary_url
     error_code = APIErrorCode(
         service_name=SERVICE_NAME, auth_failed=[401, 403], rate_limit_exceeded=429, quota_exceeded=456
     )
 
-    async def translate(self, src_text: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
-        header = {
+    # DeepL은 초당 요청 수를 공개하지 않음. 429가 나지 않는 범위로 보수적으로 잡음
+    RATE_LIMIT = RateLimit(requests_per_sec=10, burst=20, max_concurrency=4)
+
+    MAX_TEXTS_PER_REQ = 50  # DeepL은 한 요청에 text를 50개까지 보낼 수 있음
+    MAX_BYTES_PER_REQ = 128 * 1024  # 요청 body 전체 크기 제한
+    MAX_NATIVE_GLOSSARIES = 1024
+    NATIVE_GLOSSARY_PREFIX = "spot-"  # 이 server가 만든 DeepL glossary의 이름. 다른 이름의 glossary는 건드리지 않음
+
+    # (API key hash, glossary version, src_lang, tgt_lang) -> (DeepL glossary_id, API key)
+    # 지원하지 않는 언어쌍 등 등록에 실패하면 glossary_id가 None. LRU에서 빠지면 DeepL에서도 지움(API key가 필요)
+    _native_glossaries: OrderedDict[tuple[str, str, str, str], tuple[Optional[str], str]] = OrderedDict()
+    _delete_tasks: set[asyncio.Task] = set()  # 번역 요청을 기다리게 하지 않도록 background로 지우는 중인 glossary
+
+    def __init__(
+        self,
+        user_option: Optional[UserOption],
+        glossary: Optional[Glossary] = None,
+        client_info: Optional[TranslatorClientInfo] = None,
+    ):
+        super().__init__(user_option, glossary, client_info)
+        self._glossary_ids: dict[tuple[str, str], str] = {}  # 이 translator에서 사용할 (src_lang, tgt_lang) -> glossary_id
+
+    def get_header(self) -> dict:
+        return {
             "Authorization": "DeepL-Auth-Key " + self.api_key,
             "Content-Type": "application/json",
         }
-        data = {"text": [src_text], "source_lang": src_lang, "target_lang": tgt_lang}
-        logger.debug(gen_log_text(data))
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(DeepLTranslator.REQUEST_URL, headers=header, json=data)
-            status_code = response.status_code
+    async def prepare_glossary(self, src_lang: str, tgt_lang: str):
+        """용어집을 DeepL glossary로 등록(API key, 용어집 version, 언어쌍마다 한 번)하고, 이후 요청에서 glossary_id를 사용
+        등록된 언어쌍은 placeholder 대신 DeepL glossary로 용어를 보호함. 등록하지 못하면 placeholder 방식을 그대로 사용
+        """
+        if (src_lang, tgt_lang) in self._glossary_ids:
+            return
+        if not glossary_registry.config.deepl_native or not self.glossary.applies_to(src_lang):
+            return
+
+        key = (hash_api_key(self.api_key), self.glossary.version, src_lang, tgt_lang)
+        if key in DeepLTranslator._native_glossaries:
+            DeepLTranslator._native_glossaries.move_to_end(key)
+            glossary_id, _ = DeepLTranslator._native_glossaries[key]
+        else:
+            glossary_id, status_code = await translation_flights.do(
+                ("deepl_glossary", *key), lambda: self.find_or_create_native_glossary(src_lang, tgt_lang)
+            )
+            # 일시적인 오류(5xx, timeout, rate limit)는 다음 요청에서 다시 시도
+            if glossary_id is not None or (status_code < 500 and status_code != 429):
+                DeepLTranslator._native_glossaries[key] = (glossary_id, self.api_key)
+                while len(DeepLTranslator._native_glossaries) > self.MAX_NATIVE_GLOSSARIES:
+                    _, (evicted_id, evicted_api_key) = DeepLTranslator._native_glossaries.popitem(last=False)
+                    if evicted_id is not None:
+                        self.schedule_delete_native_glossary(evicted_api_key, evicted_id)
+
+        if glossary_id is not None:
+            self._glossary_ids[(src_lang, tgt_lang)] = glossary_id
+
+    def native_glossary_name(self, src_lang: str, tgt_lang: str) -> str:
+        """용어집 내용(version은 용어 목록의 hash)과 언어쌍이 같으면 같은 이름
+        재시작 후나 다른 worker, 같은 API key를 쓰는 다른 사용자도 같은 용어 목록이면 같은 glossary를 찾아서 사용함
+        """
+        return f"{self.NATIVE_GLOSSARY_PREFIX}{self.glossary.version}-{src_lang}-{tgt_lang}"
+
+    async def find_or_create_native_glossary(self, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], int]:
+        """이 API key의 DeepL glossary 중 같은 이름이 있으면 다시 사용하고(여러 개면 가장 먼저 만든 것), 없으면 만듦
+        이름이 다른 glossary는 같은 API key를 쓰는 다른 사용자(다른 용어 목록)가 사용 중일 수 있으므로 지우지 않음
+        glossary는 LRU에서 빠질 때만 지우고, 다른 곳에서 지운 glossary로 요청하면 translate_texts()가 다시 만들어서 재시도
+        - https://www.deepl.com/docs-api/glossaries/list-glossaries
+        """
+        name = self.native_glossary_name(src_lang, tgt_lang)
+        response, status_code = await self.request("GET", DeepLTranslator.GLOSSARY_URL, headers=self.get_header())
+        if status_code != 200:
+            logger.warning(f"Fail to list DeepL glossaries: {status_code}")
+            return None, status_code
+
+        lang_pair = (src_lang.split("-")[0].lower(), tgt_lang.split("-")[0].lower())
+        glossary_id = None
+        for glossary in sorted(response.json().get("glossaries", []), key=lambda g: g.get("creation_time", "")):
+            if glossary.get("name") != name:
+                continue
+            if (glossary.get("source_lang", "").lower(), glossary.get("target_lang", "").lower()) == lang_pair:
+                glossary_id = glossary["glossary_id"]
+                break
+
+        if glossary_id is not None:
+            logger.info(f"Reuse DeepL glossary {glossary_id} ({src_lang}->{tgt_lang})")
+            return glossary_id, status_code
+        return await self.create_native_glossary(src_lang, tgt_lang)
+
+    async def create_native_glossary(self, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], int]:
+        """용어를 그대로 두도록(용어 -> 같은 용어) DeepL glossary를 만들고 (glossary_id, status_code) 를 리턴
+        - https://www.deepl.com/docs-api/glossaries/create-glossary
+        """
+        entries = "\n".join(f"{term}\t{term}" for term in self.glossary.matcher.terms if "\t" not in term)
+        data = {
+            "name": self.native_glossary_name(src_lang, tgt_lang),
+            "source_lang": src_lang.split("-")[0],
+            "target_lang": tgt_lang.split("-")[0],
+            "entries": entries,
+            "entries_format": "tsv",
+        }
+        response, status_code = await self.post(DeepLTranslator.GLOSSARY_URL, headers=self.get_header(), json=data)
+        if status_code in (200, 201):
+            glossary_id = response.json()["glossary_id"]
+            logger.info(f"Create DeepL glossary {glossary_id} ({src_lang}->{tgt_lang}, {len(self.glossary)} terms)")
+            return glossary_id, status_code
+
+        logger.warning(f"Fail to create DeepL glossary ({src_lang}->{tgt_lang}): {status_code}")
+        return None, status_code
+
+    @classmethod
+    def schedule_delete_native_glossary(cls, api_key: str, glossary_id: str):
+        task = asyncio.create_task(cls.delete_native_glossary(api_key, glossary_id))
+        cls._delete_tasks.add(task)
+        task.add_done_callback(cls._delete_tasks.discard)
+
+    @classmethod
+    async def delete_native_glossary(cls, api_key: str, glossary_id: str):
+        """LRU에서 빠지거나 더 이상 쓰지 않는 glossary를 DeepL에서 지움. 실패해도 번역에는 영향 없으므로 log만 남김
+        다른 사용자의 API key로도 호출되므로 rate limiter, circuit breaker를 거치지 않고 바로 보냄
+        - https://www.deepl.com/docs-api/glossaries/delete-glossary
+        """
+        client = http_clients.get(cls.SERVICE_NAME)
+        try:
+            response = await client.request(
+                "DELETE", f"{cls.GLOSSARY_URL}/{glossary_id}", headers={"Authorization": "DeepL-Auth-Key " + api_key}
+            )
+        except REQUEST_ERRORS as e:
+            logger.warning(f"Fail to delete DeepL glossary {glossary_id}: {e!r}")
+            return
+        if response.status_code in (200, 204, 404):
+            logger.info(f"Delete DeepL glossary {glossary_id}")
+        else:
+            logger.warning(f"Fail to delete DeepL glossary {glossary_id}: {response.status_code}")
+
+    def forget_glossary(self, src_lang: str, tgt_lang: str):
+        """DeepL에서 glossary가 지워진 경우 등. 다음 요청에서 다시 등록하도록 함"""
+        self._glossary_ids.pop((src_lang, tgt_lang), None)
+        key = (hash_api_key(self.api_key), self.glossary.version, src_lang, tgt_lang)
+        DeepLTranslator._native_glossaries.pop(key, None)
+
+    def mask_terms(self, text: str, src_lang: str, tgt_lang: str) -> MaskedText:
+        if (src_lang, tgt_lang) in self._glossary_ids:  # DeepL glossary가 용어를 처리함
+            return MaskedText(text, [])
+        return super().mask_terms(text, src_lang, tgt_lang)
+
+    async def fetch(
+        self, chunk: str, src_lang: str, tgt_lang: str, cache_key: CacheKey
+    ) -> Tuple[Optional[str], Optional[int]]:
+        await self.prepare_glossary(src_lang, tgt_lang)
+        return await super().fetch(chunk, src_lang, tgt_lang, cache_key)
+
+    async def translate_texts(
+        self, src_texts: list[str], src_lang: str, tgt_lang: str, retry_glossary: bool = True
+    ) -> Tuple[Optional[list[str]], Optional[int]]:
+        """DeepL의 text 배열 API로 여러 text를 한 번에 번역
+        glossary가 DeepL에서 지워져서 404가 나면, glossary를 다시 찾거나 만들어서 한 번 더 보냄
+        (용어는 glossary가 보호하므로 placeholder로 바꾸지 않은 text임. 다시 만들지 못하면 glossary 없이 보냄)
+        """
+        data = {"text": src_texts, "source_lang": src_lang, "target_lang": tgt_lang}
+        glossary_id = self._glossary_ids.get((src_lang, tgt_lang))
+        if glossary_id is not None:
+            data["glossary_id"] = glossary_id
+        log_fields(logging.DEBUG, "DeepL API request", **data)
+
+        response, status_code = await self.post(
+            DeepLTranslator.REQUEST_URL,
+            n_chars=sum(len(src_text) for src_text in src_texts),
+            headers=self.get_header(),
+            json=data,
+        )
 
         if status_code == 200:
             resp_data = response.json()
             logger.debug(resp_data)
             # {'translations': [{'detected_source_language': 'EN', 'text': '이동'}]}
-            translated_text = resp_data["translations"][0]["text"]
-            return translated_text, None
+            translated_texts = [translation["text"] for translation in resp_data["translations"]]
+            return translated_texts, None
 
         else:
-            logger.error(gen_log_text(response.__dict__))
+            if response is not None:
+                log_fields(logging.ERROR, "DeepL API error", status_code=status_code, body=response.text)
+            if status_code == 404 and glossary_id is not None:
+                self.forget_glossary(src_lang, tgt_lang)
+                if retry_glossary:
+                    logger.warning(f"DeepL glossary {glossary_id} is not found. Retry with a new glossary")
+                    await self.prepare_glossary(src_lang, tgt_lang)
+                    return await self.translate_texts(src_texts, src_lang, tgt_lang, retry_glossary=False)
             return None, status_code
+
+    async def translate(self, src_text: str, src_lang: str, tgt_lang: str) -> Tuple[Optional[str], Optional[int]]:
+        translated_texts, status_code = await self.translate_texts([src_text], src_lang, tgt_lang)
+        if translated_texts is None:
+            return None, status_code
+        return translated_texts[0], None
+
+    @classmethod
+    def pack_requests(cls, src_texts: list[str]) -> list[list[str]]:
+        """MAX_TEXTS_PER_REQ, MAX_BYTES_PER_REQ를 넘지 않도록 text들을 요청 단위로 묶음"""
+        requests, current, current_bytes = [], [], 0
+        for src_text in src_texts:
+            n_bytes = len(src_text.encode("utf-8")) + 8  # JSON 따옴표, 쉼표 등
+            if current and (len(current) >= cls.MAX_TEXTS_PER_REQ or current_bytes + n_bytes > cls.MAX_BYTES_PER_REQ):
+                requests.append(current)
+                current, current_bytes = [], 0
+            current.append(src_text)
+            current_bytes += n_bytes
+        if current:
+            requests.append(current)
+        return requests
+
+    async def translate_many(
+        self, src_texts: list[str], src_lang: str, tgt_lang: str
+    ) -> list[Tuple[Optional[str], Optional[int]]]:
+        """cache에 없는 text들만 모아서 가능한 적은 수의 요청으로 보냄"""
+        results: list[Optional[Tuple[Optional[str], Optional[int]]]] = [None] * len(src_texts)
+        cache_keys = [self.make_cache_key(src_text, src_lang, tgt_lang) for src_text in src_texts]
+        cached_texts = await asyncio.gather(*(self.get_cached(cache_key) for cache_key in cache_keys))
+
+        missed_indices = []
+        for idx, cached_text in enumerate(cached_texts):
+            if cached_text is not None:
+                results[idx] = (cached_text, None)
+            else:
+                missed_indices.append(idx)
+
+        fetched = await self.fetch_many(
+            [src_texts[idx] for idx in missed_indices], src_lang, tgt_lang, [cache_keys[idx] for idx in missed_indices]
+        )
+        for idx, result in zip(missed_indices, fetched):
+            results[idx] = result
+        return results
+
+    async def fetch_many(
+        self, src_texts: list[str], src_lang: str, tgt_lang: str, cache_keys: list[CacheKey]
+    ) -> list[Tuple[Optional[str], Optional[int]]]:
+        """여러 text를 가능한 적은 수의 요청으로 보냄"""
+        results: list[Optional[Tuple[Optional[str], Optional[int]]]] = [None] * len(src_texts)
+        if not src_texts:
+            return results
+        await self.prepare_glossary(src_lang, tgt_lang)
+        masked_texts = [self.mask_terms(src_text, src_lang, tgt_lang) for src_text in src_texts]
+
+        async def _translate_request(indices: list[int]):
+            start = time.perf_counter()
+            translated_texts, status_code = await self.translate_texts(
+                [masked_texts[idx].text for idx in indices], src_lang, tgt_lang
+            )
+            backend_router.record(
+                self.TRANSLATOR_TYPE,
+                src_lang,
+                tgt_lang,
+                sum(len(src_texts[idx]) for idx in indices),
+                time.perf_counter() - start,
+                success=translated_texts is not None,
+            )
+            if translated_texts is not None:
+                translated_texts = [
+                    self.unmask_terms(translated_text, masked_texts[idx])
+                    for idx, translated_text in zip(indices, translated_texts)
+                ]
+                # placeholder가 깨진 text들만 용어 보호 없이 다시 번역
+                broken = [i for i, translated_text in enumerate(translated_texts) if translated_text is None]
+                if broken:
+                    retried_texts, status_code = await self.translate_texts(
+                        [src_texts[indices[i]] for i in broken], src_lang, tgt_lang
+                    )
+                    for i, retried_text in zip(broken, retried_texts or [None] * len(broken)):
+                        translated_texts[i] = retried_text
+
+            for i, idx in enumerate(indices):
+                if translated_texts is None or translated_texts[i] is None:
+                    results[idx] = (None, status_code)
+                else:
+                    translated_text = self.postprocess(translated_texts[i])
+                    self.put_cached(cache_keys[idx], translated_text)
+                    results[idx] = (translated_text, None)
+
+        # pack_requests는 text 기준으로 묶으므로, 같은 방식으로 index를 나눔
+        requests, start = [], 0
+        for request_texts in self.pack_requests([masked.text for masked in masked_texts]):
+            requests.append(list(range(start, start + len(request_texts))))
+            start += len(request_texts)
+        await asyncio.gather(*(_translate_request(indices) for indices in requests))
+
+        return results
+
+
+TRANSLATOR_CLASSES: dict[TranslatorType, type[Translator]] = {
+    TranslatorType.papago: PapagoTranslator,
+    TranslatorType.google: GoogleTranslator,
+    TranslatorType.deepl: DeepLTranslator,
+}
+
+
+def create_translator(
+    translator_type: TranslatorType, user_option: UserOption, client_info: Optional[TranslatorClientInfo] = None
+) -> Translator:
+    """translator_type의 Translator. auto는 요청마다 backend가 정해지므로 TranslationSession에서 처리"""
+    if translator_type not in TRANSLATOR_CLASSES:
+        raise ValueError(f"Can't create a translator for {translator_type}")
+    return TRANSLATOR_CLASSES[translator_type](user_option, client_info=client_info)
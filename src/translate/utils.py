@@ -1,22 +1,104 @@
+"""문자 체계(Unicode script) 판별 유틸
+- 언어 감지(src.translate.lang_detect)처럼 매 요청마다 호출되므로, 글자마다 Python 코드로 범위를 비교하지 않고
+    미리 만들어둔 BMP(U+0000 ~ U+FFFF) 전체 table과 str.translate()로 C 수준에서 한 번에 처리함
+"""
+import re
+from collections import Counter
+from typing import Optional
+
+# (start, end(inclusive), script). start 기준으로 정렬되어 있어야 함
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, "Latin"),
+    (0x0061, 0x007A, "Latin"),
+    (0x00C0, 0x024F, "Latin"),
+    (0x0370, 0x03FF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0530, 0x058F, "Armenian"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0750, 0x077F, "Arabic"),
+    (0x0780, 0x07BF, "Thaana"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0D80, 0x0DFF, "Sinhala"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x0E80, 0x0EFF, "Lao"),
+    (0x1000, 0x109F, "Myanmar"),
+    (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"),
+    (0x1200, 0x139F, "Ethiopic"),
+    (0x1780, 0x17FF, "Khmer"),
+    (0x1800, 0x18AF, "Mongolian"),
+    (0x1E00, 0x1EFF, "Latin"),
+    (0x1F00, 0x1FFF, "Greek"),
+    (0x3040, 0x309F, "Hiragana"),
+    (0x30A0, 0x30FF, "Katakana"),
+    (0x3130, 0x318F, "Hangul"),
+    (0x31F0, 0x31FF, "Katakana"),
+    (0x3400, 0x4DBF, "Han"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xA960, 0xA97F, "Hangul"),
+    (0xABC0, 0xABFF, "MeeteiMayek"),
+    (0xAC00, 0xD7AF, "Hangul"),
+    (0xD7B0, 0xD7FF, "Hangul"),
+    (0xF900, 0xFAFF, "Han"),
+    (0xFB1D, 0xFB4F, "Hebrew"),
+    (0xFB50, 0xFDFF, "Arabic"),
+    (0xFE70, 0xFEFF, "Arabic"),
+    (0xFF66, 0xFF9F, "Katakana"),
+]
+
+SCRIPTS = sorted({script for _, _, script in SCRIPT_RANGES})
+
+
+def _build_script_table() -> str:
+    """code point -> script id(1부터, 문자 하나) 인 길이 0x10000의 문자열. 어느 script에도 속하지 않으면 '\\0'
+    str.translate()의 table로 쓰면 BMP 밖의 문자(emoji 등)는 IndexError로 그대로 남음
+    """
+    table = ["\0"] * 0x10000
+    for start, end, script in SCRIPT_RANGES:
+        script_char = chr(SCRIPTS.index(script) + 1)
+        for code_point in range(start, end + 1):
+            table[code_point] = script_char
+    return "".join(table)
+
+
+_SCRIPT_TABLE = _build_script_table()
+_ID_TO_SCRIPT = {chr(idx + 1): script for idx, script in enumerate(SCRIPTS)}
+_ASCII_LETTER_PATTERN = re.compile(r"[A-Za-z]+")
+_HANGUL_PATTERN = re.compile(r"[\u1100-\u11ff\u3130-\u318f\ua960-\ua97f\uac00-\ud7af\ud7b0-\ud7ff]")
+
+
+def script_of(char: str) -> Optional[str]:
+    code_point = ord(char)
+    if code_point >= len(_SCRIPT_TABLE):
+        return None
+    return _ID_TO_SCRIPT.get(_SCRIPT_TABLE[code_point])
+
+
+def count_scripts(text: str, max_chars: Optional[int] = None) -> Counter:
+    """text(또는 앞쪽 max_chars 글자)의 문자들을 문자 체계(script)별로 센 결과. 숫자, 기호, 공백 등은 세지 않음"""
+    if max_chars is not None:
+        text = text[:max_chars]
+
+    if text.isascii():  # 가장 흔한 경우(영어). ASCII에서 script가 있는 문자는 Latin 알파벳뿐
+        n_letters = sum(map(len, _ASCII_LETTER_PATTERN.findall(text)))
+        return Counter({"Latin": n_letters}) if n_letters else Counter()
+
+    counts = Counter(text.translate(_SCRIPT_TABLE))
+    return Counter({_ID_TO_SCRIPT[char]: n for char, n in counts.items() if char in _ID_TO_SCRIPT})
+
+
 def isKoreanIncluded(text):
     """
     Check whether the text have korean unicode or not
     https://arisri.tistory.com/267
     """
-
-    for i in text:
-        if (
-            ord(i) > int("0x1100", 16)
-            and ord(i) < int("0x11ff", 16)
-            or ord(i) > int("0x3131", 16)
-            and ord(i) < int("0x318e", 16)
-            or ord(i) > int("0xa960", 16)
-            and ord(i) < int("0xa97c", 16)
-            or ord(i) > int("0xac00", 16)
-            and ord(i) < int("0xd7a3", 16)
-            or ord(i) > int("0xd7b0", 16)
-            and ord(i) < int("0xd7fb", 16)
-        ):
-            return True
-
-    return False
+    return _HANGUL_PATTERN.search(text) is not None
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.common.admission import AdmissionConfig, AdmissionController, AdmissionRejected
+
+
+def test_admits_up_to_max_in_flight_and_queues_the_rest():
+    async def main():
+        controller = AdmissionController(AdmissionConfig(max_in_flight=2, max_queue=4, max_wait=1.0))
+        order = []
+        release = asyncio.Event()
+
+        async def request(idx: int):
+            async with controller.admit():
+                order.append(idx)
+                await release.wait()
+
+        tasks = [asyncio.create_task(request(idx)) for idx in range(4)]
+        await asyncio.sleep(0.01)
+        health = controller.health()
+        release.set()
+        await asyncio.gather(*tasks)
+        return order, health, controller.stats()
+
+    order, health, stats = asyncio.run(main())
+    assert order == [0, 1, 2, 3]
+    assert (health["in_flight"], health["waiting"]) == (2, 2)
+    assert (stats["admitted"], stats["queued"], stats["in_flight"]) == (4, 2, 0)
+
+
+def test_rejects_early_when_queue_is_full():
+    async def main():
+        controller = AdmissionController(AdmissionConfig(max_in_flight=1, max_queue=1, max_wait=1.0))
+        await controller.acquire()
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire()
+        controller.release()
+        await waiting
+        controller.release()
+        return exc_info.value, controller.stats()
+
+    rejected, stats = asyncio.run(main())
+    assert rejected.reason == "overloaded"
+    assert stats["rejected_early"] == 1
+
+
+def test_rejects_early_when_expected_wait_is_longer_than_client_timeout():
+    async def main():
+        controller = AdmissionController(AdmissionConfig(max_in_flight=1, max_queue=10, max_wait=3.0))
+        controller.avg_service_time = 2.0
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire(max_wait=1.0)
+        return exc_info.value
+
+    rejected = asyncio.run(main())
+    assert rejected.retry_after == 2.0
+    assert rejected.retry_after_header == "2"
+
+
+def test_rejects_after_waiting_until_deadline():
+    async def main():
+        controller = AdmissionController(AdmissionConfig(max_in_flight=1, max_queue=10, max_wait=0.05))
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire()
+        return exc_info.value, controller.stats()
+
+    rejected, stats = asyncio.run(main())
+    assert rejected.reason == "queue timeout"
+    assert (stats["rejected_timeout"], stats["waiting"]) == (1, 0)
+
+
+def test_release_updates_average_service_time():
+    controller = AdmissionController(AdmissionConfig(ewma_alpha=0.5))
+    controller.in_flight = 2
+    controller.release(1.0)
+    controller.release(3.0)
+    assert controller.avg_service_time == 2.0
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+from src.common import models
+
+USER_OPTION = {
+    "main_tgt_lang": "ko",
+    "sub_tgt_lang": "en",
+    "translator_client_info": {"translator_type": "papago", "api_key": "batch-key", "secret_key": "secret"},
+}
+
+
+def post_batch(app, src_texts: list[str]) -> httpx.Response:
+    async def main():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            body = {"batch_request": {"src_texts": src_texts}, "user_option": USER_OPTION}
+            return await client.post("/translate/batch", json=body)
+
+    return asyncio.run(main())
+
+
+def test_segments_keep_input_order_and_status(api, upstream_clients):
+    response = post_batch(api, ["Hello world.", "", "Good bye.", "Hello world."])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["text"] for result in results] == ["HELLO WORLD.", "", "GOOD BYE.", "HELLO WORLD."]
+    assert [result["status"] for result in results] == ["ok", "empty", "ok", "ok"]
+    assert {result["translator_type"] for result in results} == {"papago"}
+    # 같은 text는 한 번만 번역
+    assert upstream_clients["Papago"].requests == ["Hello world.", "Good bye."]
+
+
+def test_failed_segments_fall_back_to_google(api, upstream_clients):
+    upstream_clients["Papago"].status_code = 500
+    response = post_batch(api, ["Hello world.", ""])
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert (first["text"], first["status"], first["translator_type"]) == ("HELLO WORLD.", "fallback", "google")
+    assert second["status"] == "empty"
+
+    upstream_clients["Google"].status_code = 500
+    response = post_batch(api, ["Hello again."])
+    assert response.status_code == 503
+    assert response.json()["results"][0]["status"] == "error"
+
+
+def test_rejects_too_large_batch(api, upstream_clients, monkeypatch):
+    monkeypatch.setattr(models.batch_config, "max_items", 2)
+    monkeypatch.setattr(models.batch_config, "max_chars", 10)
+    assert post_batch(api, ["a", "b", "c"]).status_code == 422
+    assert post_batch(api, ["Hello", "world!"]).status_code == 422
+    assert post_batch(api, ["Hello", "world"]).status_code == 200
+    assert upstream_clients["Papago"].requests == ["Hello", "world"]
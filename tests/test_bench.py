@@ -0,0 +1,62 @@
+import asyncio
+import itertools
+
+import httpx
+
+from benchmarks import bench_load, mock_upstream
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 11)]
+    assert bench_load.percentile(values, 0.5) == 5.0
+    assert bench_load.percentile(values, 0.95) == 10.0
+    assert bench_load.percentile(values, 0.0) == 1.0
+    assert bench_load.percentile([float(value) for value in range(1, 31)], 0.1) == 3.0
+    assert bench_load.percentile([], 0.5) != bench_load.percentile([], 0.5)  # nan
+
+
+def test_parse_args_and_body():
+    args = bench_load.parse_args(["--backend", "auto", "--concurrency", "1,16", "--cache-hit-ratio", "0.5"])
+    assert (args.backend, args.concurrency, args.cache_hit_ratio, args.spawn) == ("auto", [1, 16], 0.5, False)
+    body = bench_load.build_body("auto", "Hello.")
+    assert body["translate_request"] == {"src_text": "Hello."}
+    assert [info["translator_type"] for info in body["user_option"]["translator_client_infos"]] == ["papago", "deepl"]
+
+
+def test_run_level_counts_requests_and_status_codes(api, upstream_clients):
+    args = bench_load.parse_args(["--duration", "0.2", "--cache-hit-ratio", "0.5"])
+
+    async def main():
+        async with httpx.AsyncClient(app=api, base_url="http://test") as client:
+            return await bench_load.run_level(client, args, 2, itertools.count())
+
+    result = asyncio.run(main())
+    assert result["requests"] > 0
+    assert result["status_codes"] == {"200": result["requests"]}
+    assert result["errors"] == 0
+    assert result["p50_ms"] <= result["p99_ms"] <= result["max_ms"]
+    # 절반은 같은 text를 보내므로 cache hit
+    assert len(upstream_clients["Papago"].requests) <= result["requests"] // 2 + 2
+
+
+def test_mock_upstream_translates_and_injects_errors(monkeypatch):
+    monkeypatch.setattr(mock_upstream.config, "latency_dist", "fixed")
+    monkeypatch.setattr(mock_upstream.config, "latency_ms", 0.0)
+
+    async def main():
+        async with httpx.AsyncClient(app=mock_upstream.app, base_url="http://mock") as client:
+            headers = {"X-Naver-Client-Id": "id", "X-Naver-Client-Secret": "secret"}
+            papago = await client.post(
+                "/v1/papago/n2mt", data={"source": "en", "target": "ko", "text": "Hello"}, headers=headers
+            )
+            unauthorized = await client.post("/v1/papago/n2mt", data={"text": "Hello"})
+            monkeypatch.setattr(mock_upstream.config, "quota_rate", 1.0)
+            deepl = await client.post(
+                "/v2/translate", json={"text": ["Hello"]}, headers={"Authorization": "DeepL-Auth-Key key"}
+            )
+            return papago, unauthorized, deepl
+
+    papago, unauthorized, deepl = asyncio.run(main())
+    assert papago.json()["message"]["result"]["translatedText"] == "[ko] Hello"
+    assert unauthorized.status_code == 401
+    assert deepl.status_code == 456
@@ -0,0 +1,121 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.translate.breaker import BreakerConfig, BreakerRegistry, BreakerState, CircuitBreaker, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    return CircuitBreaker("Papago:test", BreakerConfig(**kwargs))
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = make_breaker(failure_threshold=3, open_duration=10.0)
+    breaker.record_failure(500)
+    breaker.record_failure(502)
+    breaker.record_success()  # 연속이 아니면 다시 셈
+    breaker.record_failure(500)
+    breaker.record_failure(500)
+    assert breaker.state == BreakerState.closed and breaker.allow()
+
+    breaker.record_failure(504)
+    assert breaker.state == BreakerState.open
+    assert breaker.open_status_code == 504
+    assert breaker.is_blocked()
+    assert not breaker.allow()
+
+
+def test_half_open_allows_one_probe_and_closes_on_success(clock):
+    breaker = make_breaker(failure_threshold=1, open_duration=10.0)
+    breaker.record_failure(500)
+    clock.now += 10.0
+    assert not breaker.is_blocked()
+    assert breaker.allow()
+    assert breaker.state == BreakerState.half_open
+    assert not breaker.allow()  # probe가 끝나기 전에는 다른 요청을 보내지 않음
+
+    breaker.record_success()
+    assert breaker.state == BreakerState.closed
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_doubles_open_duration_up_to_max(clock):
+    breaker = make_breaker(failure_threshold=1, open_duration=10.0, max_open_duration=30.0)
+    breaker.record_failure(500)
+    for expected_duration in (20.0, 30.0, 30.0):
+        clock.now = breaker.open_until
+        assert breaker.allow()
+        breaker.record_failure(500)
+        assert breaker.state == BreakerState.open
+        assert breaker.open_until - clock.now == expected_duration
+
+
+def test_released_probe_lets_next_request_try(clock):
+    breaker = make_breaker(failure_threshold=1, open_duration=1.0)
+    breaker.record_failure(500)
+    clock.now += 1.0
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+def test_rate_limited_opens_for_retry_after(clock):
+    breaker = make_breaker(rate_limit_duration=5.0)
+    breaker.record_rate_limited(429, 2.0)
+    assert (breaker.state, breaker.reason) == (BreakerState.open, "rate_limit")
+    clock.now += 1.9
+    assert breaker.is_blocked()
+    clock.now += 0.1
+    assert not breaker.is_blocked()
+
+    breaker.record_rate_limited(429, None)
+    assert breaker.open_until - clock.now == 5.0
+
+
+def test_quota_exceeded_opens_until_reset(clock):
+    breaker = make_breaker(quota_duration=3600.0)
+    breaker.record_quota_exceeded(456, None)
+    assert (breaker.reason, breaker.open_status_code) == ("quota", 456)
+    assert breaker.open_until - clock.now == 3600.0
+
+
+def test_registry_is_per_backend_and_api_key():
+    registry = BreakerRegistry(BreakerConfig(max_breakers=2))
+    breaker = registry.get("Papago", "key-a")
+    assert registry.get("Papago", "key-a") is breaker
+    assert registry.get("Papago", "key-b") is not breaker
+    assert registry.get("DeepL", "key-a") is not breaker
+    assert "key-a" not in breaker.name
+    assert registry.stats()["breakers"] == 2
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("120", 120.0), (" 3 ", 3.0), ("0", 0.0), (None, None), ("", None), ("soon", None), ("-1", None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=90)
+    assert 85 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 90
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
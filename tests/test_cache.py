@@ -0,0 +1,70 @@
+import time
+
+from src.translate.cache import CacheConfig, CacheKey, TranslationCache, normalize_text
+
+
+def make_key(text: str) -> CacheKey:
+    return CacheKey("Papago", "en", "ko", text)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TranslationCache(CacheConfig(ttl=60.0))
+    cache.put(make_key("hello"), "안녕")
+
+    now[0] += 59.0
+    assert cache.get(make_key("hello")) == "안녕"
+    now[0] += 2.0
+    assert cache.get(make_key("hello")) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.n_bytes == 0
+
+
+def test_put_again_refreshes_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TranslationCache(CacheConfig(ttl=60.0))
+    cache.put(make_key("hello"), "안녕")
+    now[0] += 50.0
+    cache.put(make_key("hello"), "안녕하세요")
+    now[0] += 50.0
+    assert cache.get(make_key("hello")) == "안녕하세요"
+
+
+def test_evicts_least_recently_used_over_max_bytes():
+    size = TranslationCache.estimate_size(make_key("text 0"), "value 0")
+    cache = TranslationCache(CacheConfig(max_bytes=size * 3))
+    for idx in range(3):
+        cache.put(make_key(f"text {idx}"), f"value {idx}")
+    assert cache.get(make_key("text 0")) == "value 0"  # text 1이 가장 오래 사용되지 않은 항목이 됨
+
+    cache.put(make_key("text 3"), "value 3")
+    assert cache.get(make_key("text 1")) is None
+    assert [cache.get(make_key(f"text {idx}")) for idx in (0, 2, 3)] == ["value 0", "value 2", "value 3"]
+    assert cache.n_bytes <= cache.config.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+
+def test_bytes_account_for_value_size():
+    cache = TranslationCache(CacheConfig(max_bytes=10_000))
+    cache.put(make_key("short"), "s")
+    cache.put(make_key("long"), "l" * 5_000)
+    assert cache.n_bytes > 5_000
+    cache.put(make_key("long 2"), "l" * 5_000)  # 둘 다 들어갈 수 없으므로 오래된 것부터 제거
+    assert cache.get(make_key("long")) is None
+    assert cache.get(make_key("short")) is None
+    assert cache.get(make_key("long 2")) is not None
+
+
+def test_does_not_store_failures_or_entries_larger_than_max_bytes():
+    cache = TranslationCache(CacheConfig(max_bytes=1_000))
+    cache.put(make_key("failed"), None)
+    cache.put(make_key("huge"), "x" * 2_000)
+    assert cache.stats()["entries"] == 0
+    assert cache.n_bytes == 0
+
+
+def test_normalize_text():
+    assert normalize_text("  Hello   world \n  next\tline ") == "Hello world\nnext line"
+    assert normalize_text("e\u0301") == "\u00e9"
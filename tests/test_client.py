@@ -0,0 +1,34 @@
+import asyncio
+
+import httpx
+
+from src.translate.client import HTTPClientConfig, HTTPClientRegistry, _build_client_kwargs
+
+
+def test_one_client_per_backend_is_reused_until_closed():
+    async def main():
+        registry = HTTPClientRegistry(HTTPClientConfig(http2=False))
+        registry.start()
+        papago = registry.get("Papago")
+        assert registry.get("Papago") is papago
+        assert registry.get("DeepL") is not papago
+        stats = registry.stats()
+        await registry.aclose()
+        return stats, registry.stats()
+
+    stats, closed_stats = asyncio.run(main())
+    assert stats["started"]
+    assert {name: client["requests"] for name, client in stats["clients"].items()} == {"Papago": 2, "DeepL": 1}
+    assert not closed_stats["started"]
+    assert closed_stats["clients"] == {}
+
+
+def test_client_kwargs_follow_config():
+    config = HTTPClientConfig(max_connections=7, max_keepalive_connections=3, connect_timeout=1.5, http2=False)
+    kwargs = _build_client_kwargs(config)
+    assert kwargs["http2"] is False
+    assert kwargs["timeout"] == httpx.Timeout((1.5, config.read_timeout, config.write_timeout, config.pool_timeout))
+    if hasattr(httpx, "Limits"):
+        assert (kwargs["limits"].max_connections, kwargs["limits"].max_keepalive_connections) == (7, 3)
+    else:
+        assert (kwargs["pool_limits"].max_connections, kwargs["pool_limits"].max_keepalive) == (7, 3)
@@ -0,0 +1,64 @@
+import asyncio
+
+from src.common.models import TranslatorClientInfo, TranslatorType, UserOption
+from src.translate.glossary import Glossary
+from src.translate.translator import DeepLTranslator
+
+
+def make_translator(terms: list[str]) -> DeepLTranslator:
+    client_info = TranslatorClientInfo(TranslatorType.deepl, api_key="shared-deepl-key")
+    return DeepLTranslator(UserOption("ko", "en"), glossary=Glossary(terms), client_info=client_info)
+
+
+def test_users_sharing_a_key_keep_each_others_glossaries(deepl_client):
+    async def main():
+        first, second = make_translator(["BLEU"]), make_translator(["Keras"])
+        await first.prepare_glossary("en", "ko")
+        await second.prepare_glossary("en", "ko")
+        # 같은 용어 목록이면 이미 만든 glossary를 찾아서 사용
+        DeepLTranslator._native_glossaries.clear()
+        third = make_translator(["BLEU"])
+        await third.prepare_glossary("en", "ko")
+        return first, second, third
+
+    first, second, third = asyncio.run(main())
+    assert len(deepl_client.glossaries) == 2
+    assert deepl_client.deleted == []
+    assert first._glossary_ids[("en", "ko")] != second._glossary_ids[("en", "ko")]
+    assert third._glossary_ids == first._glossary_ids
+
+
+def test_deleted_glossary_is_recreated_and_request_retried(deepl_client):
+    async def main():
+        translator = make_translator(["BLEU"])
+        await translator.prepare_glossary("en", "ko")
+        deepl_client.glossaries.clear()  # 다른 worker가 지움
+        return await translator.translate("BLEU is a metric.", "en", "ko"), translator
+
+    (translated_text, status_code), translator = asyncio.run(main())
+    assert (translated_text, status_code) == ("BLEU IS A METRIC.", None)
+    first_id, retried_id = (request.get("glossary_id") for request in deepl_client.translate_requests)
+    assert first_id != retried_id
+    assert retried_id in deepl_client.glossaries
+    assert translator._glossary_ids[("en", "ko")] == retried_id
+
+
+def test_evicted_glossary_is_deleted_in_background(deepl_client, monkeypatch):
+    monkeypatch.setattr(DeepLTranslator, "MAX_NATIVE_GLOSSARIES", 1)
+
+    async def main():
+        deepl_client.allow_delete.clear()
+        await make_translator(["BLEU"]).prepare_glossary("en", "ko")
+        evicted_id = next(iter(deepl_client.glossaries))
+        # 지우는 요청이 끝나지 않아도 번역 요청은 기다리지 않음
+        await asyncio.wait_for(make_translator(["Keras"]).prepare_glossary("en", "ko"), timeout=1.0)
+        await deepl_client.delete_started.wait()
+        assert deepl_client.deleted == []
+        deepl_client.allow_delete.set()
+        await asyncio.gather(*DeepLTranslator._delete_tasks)
+        return evicted_id
+
+    evicted_id = asyncio.run(main())
+    assert deepl_client.deleted == [evicted_id]
+    assert len(deepl_client.glossaries) == 1
+    assert not DeepLTranslator._delete_tasks
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.translate.executor import BlockingCallExecutor, ExecutorConfig
+
+
+def blocking_call(seconds: float) -> int:
+    time.sleep(seconds)
+    return threading.get_ident()
+
+
+def test_blocking_call_runs_off_the_event_loop():
+    executor = BlockingCallExecutor("test", ExecutorConfig(max_workers=2))
+
+    async def ticker(ticks: list):
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        ticks = []
+        task = asyncio.create_task(ticker(ticks))
+        thread_id = await executor.run(blocking_call, 0.1)
+        task.cancel()
+        return thread_id, ticks
+
+    thread_id, ticks = asyncio.run(main())
+    executor.shutdown()
+    assert thread_id != threading.get_ident()
+    assert len(ticks) >= 5  # blocking 호출 중에도 event loop가 다른 coroutine을 실행함
+    assert executor.stats()["calls"] == 1
+
+
+def test_timeout_and_error_are_counted():
+    executor = BlockingCallExecutor("test", ExecutorConfig(max_workers=1, max_pending=1))
+
+    def fail():
+        raise ValueError("googletrans failed")
+
+    async def main():
+        # max_pending을 넘은 호출은 자리가 날 때까지 기다리다가 timeout
+        running = asyncio.create_task(executor.run(blocking_call, 0.2, timeout=1.0))
+        await asyncio.sleep(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(blocking_call, 0.0, timeout=0.05)
+        await running
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+
+    asyncio.run(main())
+    executor.shutdown()
+    stats = executor.stats()
+    assert (stats["calls"], stats["timeouts"], stats["errors"], stats["in_flight"]) == (3, 1, 1, 0)
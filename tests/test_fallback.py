@@ -0,0 +1,93 @@
+import asyncio
+from typing import Optional
+
+from src.common.models import TranslatorType
+from src.translate.fallback import FallbackConfig, FallbackMode, FallbackPolicy
+from src.translate.latency import LatencyTracker
+
+
+class FakeTranslator:
+    """delay(초) 뒤에 text를 대문자로 번역. fail이면 error_msg를 리턴"""
+
+    SERVICE_NAME = "Papago"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.n_started = 0
+        self.n_cancelled = 0
+
+    async def run(self, src_text: str, tgt_lang: Optional[str] = None, src_lang: Optional[str] = None):
+        self.n_started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.n_cancelled += 1
+            raise
+        if self.fail:
+            return None, "API failed"
+        return src_text.upper(), None
+
+
+def make_policy(mode: FallbackMode, **kwargs) -> FallbackPolicy:
+    return FallbackPolicy(FallbackConfig(mode=mode, **kwargs), latency_tracker=LatencyTracker())
+
+
+def run_policy(policy: FallbackPolicy, main: FakeTranslator, google: FakeTranslator):
+    return asyncio.run(policy.run(main, TranslatorType.papago, "hello", "ko", fallback_translator=google))
+
+
+def test_sequential_tries_google_only_after_main_fails():
+    policy = make_policy(FallbackMode.sequential)
+    google = FakeTranslator()
+    assert run_policy(policy, FakeTranslator(), google) == ("HELLO", None, TranslatorType.papago)
+    assert google.n_started == 0
+
+    result = run_policy(policy, FakeTranslator(fail=True), google)
+    assert result == ("HELLO", "API failed<br/>But translate it by Google API", TranslatorType.google)
+
+    result = run_policy(policy, FakeTranslator(fail=True), FakeTranslator(fail=True))
+    assert result == (None, "API failed<br/>Google API also failed", TranslatorType.google)
+    stats = policy.stats()
+    assert (stats["requests"], stats["fallbacks"], stats["failed"]) == (3, 2, 1)
+    assert stats["served_by"] == {TranslatorType.papago: 1, TranslatorType.google: 1}
+
+
+def test_hedged_sends_google_when_main_is_slower_than_delay():
+    policy = make_policy(FallbackMode.hedged, hedge_default_delay=0.05)
+    main, google = FakeTranslator(delay=1.0), FakeTranslator()
+    assert run_policy(policy, main, google) == ("HELLO", None, TranslatorType.google)
+    assert main.n_cancelled == 1
+    assert policy.stats()["hedges"] == 1
+
+    # delay 안에 main backend가 응답하면 Google API 요청을 보내지 않음
+    google = FakeTranslator()
+    assert run_policy(policy, FakeTranslator(delay=0.01), google) == ("HELLO", None, TranslatorType.papago)
+    assert google.n_started == 0
+
+
+def test_race_uses_the_first_success_and_cancels_the_other():
+    policy = make_policy(FallbackMode.race)
+    main, google = FakeTranslator(delay=0.01), FakeTranslator(delay=1.0)
+    assert run_policy(policy, main, google) == ("HELLO", None, TranslatorType.papago)
+    assert (google.n_started, google.n_cancelled) == (1, 1)
+
+    # 먼저 끝난 쪽이 실패하면 나머지 결과를 기다림
+    main, google = FakeTranslator(fail=True), FakeTranslator(delay=0.05)
+    assert run_policy(policy, main, google) == (
+        "HELLO",
+        "API failed<br/>But translate it by Google API",
+        TranslatorType.google,
+    )
+
+
+def test_hedge_delay_follows_latency_percentile_within_bounds():
+    policy = make_policy(FallbackMode.hedged, hedge_min_delay=0.1, hedge_max_delay=3.0, min_samples=10)
+    translator = FakeTranslator()
+    assert policy.hedge_delay(translator) == policy.config.hedge_default_delay
+    for _ in range(10):
+        policy.latency_tracker.record(translator.SERVICE_NAME, 0.5)
+    assert 0.5 <= policy.hedge_delay(translator) < 0.5 * 1.25
+    for _ in range(100):
+        policy.latency_tracker.record(translator.SERVICE_NAME, 10.0)
+    assert policy.hedge_delay(translator) == 3.0
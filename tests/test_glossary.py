@@ -0,0 +1,86 @@
+from src.translate.glossary import Glossary, GlossaryConfig, GlossaryRegistry, TermMatcher
+
+
+def found_terms(matcher: TermMatcher, text: str) -> list[str]:
+    return [text[start:end] for start, end in matcher.find(text)]
+
+
+def test_find_respects_word_boundaries():
+    matcher = TermMatcher(["mask", "GAN"])
+    text = "mask masks unmask mask_id GANs GAN, (mask)"
+    assert found_terms(matcher, text) == ["mask", "GAN", "mask"]
+
+
+def test_find_prefers_earlier_then_longer_match():
+    matcher = TermMatcher(["self-attention", "self-attention masks", "attention masks", "masks"])
+    assert found_terms(matcher, "Use self-attention masks here") == ["self-attention masks"]
+    assert found_terms(matcher, "attention masks and masks") == ["attention masks", "masks"]
+
+
+def test_find_overlapping_terms_through_fail_links():
+    matcher = TermMatcher(["he", "she", "his", "hers"])
+    assert found_terms(matcher, "ushers she his") == ["she", "his"]
+
+
+def test_find_case():
+    """대문자가 들어간 용어는 대소문자가 같아야 하고, 소문자 용어는 구분하지 않음"""
+    matcher = TermMatcher(["BLEU", "transformer"])
+    assert found_terms(matcher, "bleu BLEU Bleu Transformer TRANSFORMER transformer") == [
+        "BLEU",
+        "Transformer",
+        "TRANSFORMER",
+        "transformer",
+    ]
+
+
+def test_find_keeps_offsets_when_lowercasing_changes_length():
+    matcher = TermMatcher(["model"])
+    text = "İstanbul model"
+    assert matcher.find(text) == [(9, 14)]
+
+
+def test_find_without_terms():
+    assert TermMatcher([" ", ""]).find("anything") == []
+
+
+def test_mask_and_unmask_round_trip():
+    glossary = Glossary(["Transformer", "BLEU"])
+    masked = glossary.mask("Transformer beats RNN in BLEU. Transformer is fast.")
+    assert masked.text == "[#0] beats RNN in [#1]. [#0] is fast."
+    assert masked.terms == ["Transformer", "BLEU"]
+
+    translated = "[#0]는 [ # 1 ]에서 RNN을 이긴다. [#0]는 빠르다."
+    assert Glossary.unmask(translated, masked.terms) == "Transformer는 BLEU에서 RNN을 이긴다. Transformer는 빠르다."
+
+
+def test_unmask_fails_when_a_placeholder_is_dropped():
+    assert Glossary.unmask("[#0]만 남음", ["Transformer", "BLEU"]) is None
+
+
+def test_unmask_leaves_unknown_placeholders():
+    assert Glossary.unmask("[#0] [#5]", ["BLEU"]) == "BLEU [#5]"
+
+
+def test_mask_skips_text_that_already_has_placeholders():
+    glossary = Glossary(["BLEU"])
+    masked = glossary.mask("See [#0] for BLEU")
+    assert masked.text == "See [#0] for BLEU"
+    assert masked.terms == []
+
+
+def test_applies_to_src_langs():
+    glossary = Glossary(["BLEU"], src_langs=["en"])
+    assert glossary.applies_to("en")
+    assert not glossary.applies_to("ko")
+    assert not Glossary([]).applies_to("en")
+
+
+def test_registry_reuses_glossary_for_same_user_terms(tmp_path):
+    (tmp_path / "terms.txt").write_text("BLEU\n")
+    registry = GlossaryRegistry(GlossaryConfig(term_dir=str(tmp_path), term_files="terms.txt"))
+    glossary = registry.get(["Keras", "PyTorch"])
+    assert registry.get([" PyTorch", "Keras", "Keras"]) is glossary
+    assert set(glossary.matcher.terms) == {"BLEU", "Keras", "PyTorch"}
+    assert glossary.version != registry.base.version
+    assert registry.get([]) is registry.base
+    assert registry.n_compiles == 1
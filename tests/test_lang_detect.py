@@ -0,0 +1,45 @@
+import pytest
+
+from src.translate.lang_detect import LangDetectConfig, LangDetector
+
+detector = LangDetector(config=LangDetectConfig())
+MIN_CONFIDENCE = LangDetectConfig.min_confidence
+
+
+@pytest.mark.parametrize(
+    "text, lang",
+    [
+        ("안녕하세요. Transformer 모델입니다.", "ko"),
+        ("東京は日本の首都です。", "ja"),
+        ("Привет! Что это такое? Где ты живёшь?", "ru"),
+        ("I would like to book a table for two people tonight, please.", "en"),
+        ("Je voudrais réserver une table pour deux personnes ce soir.", "fr"),
+        ("Ich möchte heute Abend einen Tisch für zwei Personen reservieren.", "de"),
+        ("这是一个关于机器翻译的问题，我们会在后面说明。", "zh-CN"),
+        ("這是一個關於機器翻譯的問題，我們會在後面說明。", "zh-TW"),
+    ],
+)
+def test_confident_detection(text, lang):
+    result = detector.detect(text)
+    assert result.lang == lang
+    assert result.confidence >= MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "OK",  # 너무 짧은 Latin 문자 text
+        "Thanks",
+        "東京",  # 일본어일 수도 있는 짧은 한자
+        "東京大学",
+        "qwxz vbnm kjhg trew plmk zxcv",  # 모델에 있는 어떤 언어의 단어도 아님
+    ],
+)
+def test_short_or_out_of_model_text_is_not_confident(text):
+    assert detector.detect(text).confidence < MIN_CONFIDENCE
+
+
+def test_text_without_letters():
+    result = detector.detect("1234 !!! ...")
+    assert result.lang is None
+    assert result.confidence == 0.0
@@ -0,0 +1,59 @@
+from src.common.models import TranslatorType
+from src.translate.lang_index import LanguageIndex, lang_index, normalize_code
+
+
+def make_index() -> LanguageIndex:
+    support_langs = {
+        TranslatorType.papago: (["ko", "en", "zh-CN", "zh-TW"], ["ko", "en", "zh-CN", "zh-TW"]),
+        TranslatorType.deepl: (["EN", "NB", "ZH"], ["EN-US", "NB", "ZH"]),
+    }
+    lang_names = {"ko": "Korean", "en": "English", "zh-TW": "Chinese (Traditional)", "no": "Norwegian", "he": "Hebrew"}
+    return LanguageIndex(support_langs, lang_names)
+
+
+def test_resolve_normalizes_spellings_to_backend_codes():
+    index = make_index()
+    assert normalize_code(" EN_us ") == "en-us"
+    assert index.resolve(TranslatorType.papago, "src", "EN_us") == "en"
+    assert index.resolve(TranslatorType.papago, "src", "zh-Hant") == "zh-TW"
+    assert index.resolve(TranslatorType.papago, "tgt", "zh_hk") == "zh-TW"
+    assert index.resolve(TranslatorType.deepl, "src", "zh-TW") == "ZH"
+    assert index.resolve(TranslatorType.deepl, "tgt", "no") == "NB"
+    assert index.resolve(TranslatorType.deepl, "src", "ko") is None
+
+
+def test_unknown_spellings_are_resolved_on_demand_and_capped():
+    index = make_index()
+    table = index._table(TranslatorType.papago, "src")
+    assert "en-au" not in table
+    assert index.resolve(TranslatorType.papago, "src", "en-AU") == "en"
+    assert table["en-au"] == "en"
+
+    index.MAX_CODES = len(table)
+    assert index.resolve(TranslatorType.papago, "src", "ko-KP") == "ko"
+    assert "ko-kp" not in table
+
+
+def test_backend_support_lookup():
+    index = make_index()
+    assert index.supports(TranslatorType.papago, "en", "ko")
+    assert not index.supports(TranslatorType.deepl, "en", "ko")
+    assert index.supported_backends("en-GB", "zh-Hant") == [TranslatorType.papago, TranslatorType.deepl]
+    assert index.best_backend("en", "zh-TW", preferred=[TranslatorType.deepl, TranslatorType.papago]) == (
+        TranslatorType.deepl
+    )
+    assert index.best_backend("ko", "no") is None
+
+
+def test_canonical_code_and_language_name():
+    index = make_index()
+    assert index.canonical("IW") == "he"
+    assert index.canonical("zh_hant") == "zh-TW"
+    assert index.canonical("xx-YY") == "xx-yy"
+    assert index.language_name("ZH-HK") == "Chinese (Traditional)"
+    assert index.language_name("xx") == "xx"
+
+
+def test_index_from_data_files():
+    assert lang_index.resolve_pair(TranslatorType.papago, "en-US", "ko") == ("en", "ko")
+    assert TranslatorType.google in lang_index.supported_backends("en", "ko")
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from src.common.models import TranslatorClientInfo, TranslatorType, UserOption
+from src.translate.limiter import (
+    KeyRateLimiter,
+    RateLimit,
+    RateLimiterConfig,
+    RequestGroup,
+    rate_limiters,
+    start_request_group,
+)
+from src.translate.translator import GoogleTranslator, PapagoTranslator
+
+
+def test_rejects_when_token_is_not_ready_before_deadline():
+    async def main():
+        limiter = KeyRateLimiter(RateLimit(requests_per_sec=1, burst=1, max_concurrency=4), max_queue=8)
+        assert await limiter.acquire(0, max_wait=0.01)
+        limiter.release()
+        assert not await limiter.acquire(0, max_wait=0.01)
+        return limiter.stats()
+
+    stats = asyncio.run(main())
+    assert stats["rejected"] == 1
+
+
+def test_rejects_when_queue_is_full():
+    async def main():
+        limiter = KeyRateLimiter(RateLimit(requests_per_sec=100, burst=1, max_concurrency=1), max_queue=1)
+        assert await limiter.acquire(0, max_wait=1.0)
+        waiting = asyncio.create_task(limiter.acquire(0, max_wait=1.0))
+        await asyncio.sleep(0)
+        rejected = await limiter.acquire(0, max_wait=1.0)
+        limiter.release()
+        admitted = await waiting
+        limiter.release()
+        return rejected, admitted
+
+    assert asyncio.run(main()) == (False, True)
+
+
+def test_group_takes_one_queue_slot_and_waits_for_its_own_fan_out():
+    rate_limit = RateLimit(requests_per_sec=200, burst=2, max_concurrency=2)
+
+    async def request(limiter, group):
+        if not await limiter.acquire(0, max_wait=0.05, group=group, max_group_wait=5.0):
+            return False
+        await asyncio.sleep(0.001)
+        limiter.release()
+        return True
+
+    async def main():
+        limiter = KeyRateLimiter(rate_limit, max_queue=2)
+        group = RequestGroup(time.monotonic())
+        results = await asyncio.gather(*(request(limiter, group) for _ in range(30)))
+        return results, limiter.stats()
+
+    results, stats = asyncio.run(main())
+    assert all(results)
+    assert stats["rejected"] == 0
+
+
+def test_long_papago_text_is_not_rejected_by_its_own_chunks(upstream_clients, monkeypatch):
+    """chunk 수가 burst + max_queue 보다 많고, 모두 보내는 데 max_wait보다 오래 걸리는 text"""
+    client = upstream_clients[PapagoTranslator.SERVICE_NAME]
+    client.delay = 0.001
+    monkeypatch.setattr(rate_limiters, "config", RateLimiterConfig(max_wait=0.05, max_queue=4, max_group_wait=5.0))
+    monkeypatch.setattr(PapagoTranslator, "RATE_LIMIT", RateLimit(requests_per_sec=200, burst=2, max_concurrency=2))
+    monkeypatch.setattr(PapagoTranslator, "MAX_CHAR_PER_REQ", 50)
+
+    client_info = TranslatorClientInfo(TranslatorType.papago, api_key="long-text-key", secret_key="secret")
+    translator = PapagoTranslator(UserOption(main_tgt_lang="ko", sub_tgt_lang="en"), client_info=client_info)
+    src_text = " ".join(f"This is the sentence number {i} of a long text." for i in range(40))
+
+    async def main():
+        start_request_group()
+        return await translator.translate_text(src_text, "en", "ko")
+
+    translated_text, status_code = asyncio.run(main())
+    assert status_code is None
+    assert translated_text == src_text.upper()
+    assert len(client.requests) == 40
+
+
+def test_google_fallback_shares_one_limiter_across_user_keys(upstream_clients, monkeypatch):
+    """fallback Google의 api_key는 사용자의 Papago/DeepL key이지만, Google 제한은 서버 IP 단위이므로 한 bucket을 같이 씀"""
+    monkeypatch.setattr(rate_limiters, "_limiters", OrderedDict())
+
+    user_option = UserOption(main_tgt_lang="ko", sub_tgt_lang="en")
+    translators = [
+        GoogleTranslator(user_option, client_info=TranslatorClientInfo(TranslatorType.papago, api_key=api_key))
+        for api_key in ("user-a-key", "user-b-key")
+    ]
+
+    async def main():
+        return [
+            await translator.translate_text(f"shared bucket {i}", "en", "ko")
+            for i, translator in enumerate(translators)
+        ]
+
+    assert asyncio.run(main()) == [("SHARED BUCKET 0", None), ("SHARED BUCKET 1", None)]
+    stats = rate_limiters.stats()
+    assert stats["limiters"] == 1
+    assert stats["admitted"] == 2
@@ -0,0 +1,63 @@
+import logging
+import queue
+
+import orjson
+
+from src.common.base import log_fields
+from src.common.log import DroppingQueueHandler, JsonFormatter, TextFormatter
+
+
+class CountingArg:
+    """문자열로 바뀐 횟수를 세는 log argument"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.n_formatted = 0
+
+    def __str__(self):
+        self.n_formatted += 1
+        return self.text
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    test_logger = logging.getLogger(name)
+    test_logger.handlers = [handler]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    return test_logger
+
+
+def test_queue_handler_leaves_message_formatting_to_listener():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    test_logger = make_logger("test_log.queue", handler)
+    arg = CountingArg("x" * 50)
+
+    test_logger.info("Text to translate: '%s'", arg)
+    test_logger.info("Dropped because the queue is full: %s", arg)
+    assert arg.n_formatted == 0
+    assert handler.stats()["dropped"] == 1
+
+    record = handler.queue.get_nowait()
+    formatter = TextFormatter("[%(levelname)s] %(message)s", datefmt="%y%m%d", max_len=20)
+    assert formatter.format(record) == "[INFO] Text to translate: '...(+51 chars)"
+    assert arg.n_formatted == 1
+
+
+def test_json_formatter_truncates_message_and_fields():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "Translated text: %s", ("y" * 30,), None)
+    record.fields = {"body": "z" * 30, "status_code": 500}
+    data = orjson.loads(JsonFormatter(max_len=10).format(record))
+    assert data["message"] == "Translated...(+37 chars)"
+    assert data["fields"] == {"body": "zzzzzzzzzz...(+20 chars)", "status_code": 500}
+
+
+def test_log_fields_skips_disabled_levels(monkeypatch):
+    handler = DroppingQueueHandler(queue.Queue())
+    monkeypatch.setattr("src.common.base.logger", make_logger("test_log.fields", handler))
+    logging.getLogger("test_log.fields").setLevel(logging.INFO)
+
+    log_fields(logging.DEBUG, "Papago request", text="skipped")
+    log_fields(logging.ERROR, "Papago API error", status_code=500)
+    record = handler.queue.get_nowait()
+    assert handler.queue.empty()
+    assert (record.getMessage(), record.fields) == ("Papago API error", {"status_code": 500})
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.common.metrics import Counter, Histogram, MetricsRegistry, start_request_timing, timed_stage
+
+USER_OPTION = {
+    "main_tgt_lang": "ko",
+    "sub_tgt_lang": "en",
+    "translator_client_info": {"translator_type": "papago", "api_key": "metrics-key", "secret_key": "secret"},
+}
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    counter = Counter("spot_test_total", "Test counter", ("backend",))
+    counter.inc("papago")
+    counter.inc("papago", amount=2)
+    counter.inc('dee"pl')
+    assert counter.render() == [
+        "# HELP spot_test_total Test counter",
+        "# TYPE spot_test_total counter",
+        'spot_test_total{backend="dee\\"pl"} 1',
+        'spot_test_total{backend="papago"} 3',
+    ]
+
+    histogram = Histogram("spot_test_seconds", "Test histogram", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.render()[2:] == [
+        'spot_test_seconds_bucket{le="0.1"} 1',
+        'spot_test_seconds_bucket{le="1"} 2',
+        'spot_test_seconds_bucket{le="+Inf"} 3',
+        "spot_test_seconds_sum 5.55",
+        "spot_test_seconds_count 3",
+    ]
+
+    registry = MetricsRegistry()
+    registry.counter("spot_test_total", "Test counter")
+    with pytest.raises(ValueError):
+        registry.histogram("spot_test_total", "Duplicated")
+
+
+def test_timed_stage_sums_stages_of_the_current_request():
+    async def fallback():
+        with timed_stage("fallback"):
+            await asyncio.sleep(0)
+
+    async def main():
+        timings = start_request_timing()
+        with timed_stage("upstream"):
+            await asyncio.sleep(0.01)
+        # 요청에서 만든 task도 같은 timings에 기록
+        await asyncio.create_task(fallback())
+        with timed_stage("upstream"):
+            pass
+        return timings
+
+    timings = asyncio.run(main())
+    assert list(timings) == ["upstream", "fallback"]
+    assert timings["upstream"] >= 0.01
+
+
+def test_translate_response_has_server_timing_and_metrics(api):
+    async def main():
+        async with httpx.AsyncClient(app=api, base_url="http://test") as client:
+            body = {"translate_request": {"src_text": "Hello metrics."}, "user_option": USER_OPTION}
+            response = await client.post("/translate", json=body)
+            return response, await client.get("/metrics")
+
+    response, metrics = asyncio.run(main())
+    assert response.status_code == 200
+    stages = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert "upstream" in stages and stages[-1] == "total"
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'spot_request_duration_seconds_count{path="/translate",status_code="200"}' in metrics.text
+    assert 'spot_upstream_requests_total{backend="Papago",status_code="200",category="ok"}' in metrics.text
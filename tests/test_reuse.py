@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.common.metrics import REUSED_CHARS
+from src.common.models import TranslatorClientInfo, TranslatorType, UserOption
+from src.translate import translator as translator_module
+from src.translate.cache import translation_cache
+from src.translate.glossary import Glossary
+from src.translate.translator import PapagoTranslator
+
+PARAGRAPH = (
+    "The first sentence is here. The second one follows it.\n\n"
+    "A new paragraph starts. It ends with a question? Yes.  "
+    "The first sentence is here."
+)
+
+
+@pytest.fixture
+def reuse(monkeypatch):
+    monkeypatch.setattr(translator_module.reuse_config, "enabled", True)
+    monkeypatch.setattr(translator_module.reuse_config, "min_chars", 50)
+    translation_cache.clear()
+    yield
+    translation_cache.clear()
+
+
+def make_translator() -> PapagoTranslator:
+    client_info = TranslatorClientInfo(TranslatorType.papago, api_key="reuse-key", secret_key="secret")
+    user_option = UserOption(main_tgt_lang="ko", sub_tgt_lang="en")
+    return PapagoTranslator(user_option, glossary=Glossary([]), client_info=client_info)
+
+
+def test_split_reusable_segments(reuse, monkeypatch):
+    translator = make_translator()
+    segments = translator.split_reusable_segments(PARAGRAPH)
+    assert "".join(segments) == PARAGRAPH
+    assert len(segments) == 6
+
+    assert translator.split_reusable_segments("Too short. Text.") is None
+    assert translator.split_reusable_segments("One long sentence without a boundary " * 3) is None
+    monkeypatch.setattr(translator_module.reuse_config, "max_segments", 5)
+    assert translator.split_reusable_segments(PARAGRAPH) is None
+    monkeypatch.setattr(translator_module.reuse_config, "enabled", False)
+    assert translator.split_reusable_segments(PARAGRAPH) is None
+
+
+def test_translate_text_stitches_sentences_and_resends_only_edited_ones(reuse, upstream_clients):
+    client = upstream_clients[PapagoTranslator.SERVICE_NAME]
+    translator = make_translator()
+
+    translated_text, status_code = asyncio.run(translator.translate_text(PARAGRAPH, "en", "ko"))
+    assert status_code is None
+    assert translated_text == PARAGRAPH.upper()
+    # 문장들을 한 번의 요청으로 보내고, 같은 문장은 한 번만 보냄
+    assert len(client.requests) == 1
+    assert client.requests[0].split("\n") == [
+        "The first sentence is here.",
+        "The second one follows it.",
+        "A new paragraph starts.",
+        "It ends with a question?",
+        "Yes.",
+    ]
+
+    edited = PARAGRAPH.replace("The second one follows it.", "The second one was edited.")
+    translated_text, _ = asyncio.run(translator.translate_text(edited, "en", "ko"))
+    assert translated_text == edited.upper()
+    assert client.requests[1:] == ["The second one was edited."]
+
+
+def test_translate_text_falls_back_to_chunks_when_lines_do_not_match(reuse, upstream_clients):
+    client = upstream_clients[PapagoTranslator.SERVICE_NAME]
+    client.drop_lines = True
+    translator = make_translator()
+
+    translated_text, status_code = asyncio.run(translator.translate_text(PARAGRAPH, "en", "ko"))
+    assert status_code is None
+    assert len(client.requests) == 2
+    assert client.requests[1] == PARAGRAPH
+    assert translated_text == PARAGRAPH.upper()
+
+
+def test_reused_chars_are_not_counted_when_falling_back_to_chunks(reuse, upstream_clients):
+    client = upstream_clients[PapagoTranslator.SERVICE_NAME]
+    translator = make_translator()
+    asyncio.run(translator.translate_text(PARAGRAPH, "en", "ko"))
+
+    edited = PARAGRAPH.replace("The second one follows it.", "The second one was edited.").replace("Yes.", "No.")
+    client.drop_lines = True
+    reused_chars = REUSED_CHARS.get(translator.SERVICE_NAME)
+    translated_text, status_code = asyncio.run(translator.translate_text(edited, "en", "ko"))
+    assert status_code is None
+    assert translated_text == edited.upper()
+    assert client.requests[-1] == edited
+    assert REUSED_CHARS.get(translator.SERVICE_NAME) == reused_chars
+
+    asyncio.run(translator.translate_text(PARAGRAPH.replace("Yes.", "No."), "en", "ko"))
+    assert REUSED_CHARS.get(translator.SERVICE_NAME) > reused_chars
@@ -0,0 +1,94 @@
+import asyncio
+
+from src.common.models import TranslatorType, UserOption
+from src.translate import session as session_module
+from src.translate.breaker import circuit_breakers
+from src.translate.lang_index import lang_index
+from src.translate.router import BackendRouter, RouterConfig
+from src.translate.session import TranslationSession
+
+PAPAGO, DEEPL, GOOGLE = TranslatorType.papago, TranslatorType.deepl, TranslatorType.google
+
+
+def make_router(**kwargs) -> BackendRouter:
+    return BackendRouter(RouterConfig(explore_rate=0.0, **kwargs), seed=0)
+
+
+def warm_up(router: BackendRouter, backend: TranslatorType, seconds: float, success: bool = True, n: int = 3):
+    for _ in range(n):
+        router.record(backend, "en", "ko", 50, seconds, success)
+
+
+def test_backends_without_samples_are_tried_first():
+    router = make_router(min_samples=3)
+    warm_up(router, PAPAGO, 0.1)
+    assert router.choose({PAPAGO: 5000, DEEPL: 5000}, "en", "ko", 50) == DEEPL
+    assert router.choose({}, "en", "ko", 50) is None
+
+
+def test_chooses_lowest_expected_cost():
+    router = make_router(min_samples=3)
+    warm_up(router, PAPAGO, 0.2)
+    warm_up(router, DEEPL, 0.5)
+    assert router.choose({PAPAGO: 5000, DEEPL: 5000}, "en", "ko", 50) == PAPAGO
+
+    # 실패가 많으면 빠르더라도 예상 비용이 커짐
+    warm_up(router, PAPAGO, 0.2, success=False, n=10)
+    assert router.choose({PAPAGO: 5000, DEEPL: 5000}, "en", "ko", 50) == DEEPL
+    assert router.stats()["chosen"] == {"papago": 1, "deepl": 1}
+
+
+def test_language_pair_stats_are_recorded_by_canonical_code():
+    router = make_router(min_samples=3)
+    warm_up(router, PAPAGO, 0.2)
+    warm_up(router, DEEPL, 0.5)
+    for _ in range(3):
+        router.record(DEEPL, "EN-US", "KO", 50, 0.05, True)
+    # en -> ko 표본은 DeepL이 빠르지만, 다른 언어쌍은 backend 전체 EWMA로 판단
+    assert router.choose({PAPAGO: 5000, DEEPL: 5000}, "en-us", "ko", 50) == DEEPL
+    assert router.choose({PAPAGO: 5000, DEEPL: 5000}, "ja", "ko", 50) == PAPAGO
+
+
+def test_long_text_prefers_backends_that_need_fewer_chunks():
+    router = make_router(min_samples=1)
+    warm_up(router, PAPAGO, 0.1)
+    warm_up(router, GOOGLE, 1.0)
+    assert router.choose({PAPAGO: 5000, GOOGLE: 15000}, "en", "ko", 12000) == GOOGLE
+    assert router.choose({PAPAGO: 5000, GOOGLE: 15000}, "en", "ko", 3000) == PAPAGO
+
+
+def test_explore_picks_other_candidates():
+    router = BackendRouter(RouterConfig(min_samples=1, explore_rate=1.0), seed=0)
+    warm_up(router, PAPAGO, 0.1)
+    warm_up(router, DEEPL, 1.0)
+    assert router.choose({PAPAGO: 5000, DEEPL: 5000}, "en", "ko", 50) == DEEPL
+    assert router.stats()["explored"] == 1
+
+
+def test_auto_session_skips_blocked_and_unsupported_backends(api, monkeypatch):
+    monkeypatch.setattr(session_module, "backend_router", make_router(min_samples=0))
+    user_option = UserOption.from_dict(
+        {
+            "main_tgt_lang": "ko",
+            "sub_tgt_lang": "en",
+            "translator_client_info": {"translator_type": "auto"},
+            "translator_client_infos": [
+                {"translator_type": "papago", "api_key": "router-papago-key", "secret_key": "secret"},
+                {"translator_type": "deepl", "api_key": "router-deepl-key"},
+            ],
+        }
+    )
+    session = TranslationSession(user_option)
+    assert set(session.translators) == {PAPAGO, DEEPL, GOOGLE}
+
+    async def select(tgt_lang: str):
+        return await session.select("Hello world.", tgt_lang)
+
+    # 비용이 같으면 먼저 등록된 backend. Papago는 en -> id를 지원하지 않음
+    assert lang_index.supported_backends("en", "id") == [GOOGLE, DEEPL]
+    assert asyncio.run(select("ko")) == (PAPAGO, "en")
+    assert asyncio.run(select("id")) == (DEEPL, "en")
+
+    deepl = session.translators[DEEPL]
+    circuit_breakers.get(deepl.SERVICE_NAME, deepl.api_key).open("test", 503, duration=60.0)
+    assert asyncio.run(select("id")) == (GOOGLE, "en")
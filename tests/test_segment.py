@@ -0,0 +1,61 @@
+import pytest
+
+from src.translate.segment import pack_segments, split_sentences, split_trailing_space
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Hello world. How are you? Fine!", ["Hello world. ", "How are you? ", "Fine!"]),
+        ("Dr. Smith met Mr. Kim at 3 p.m. Then they left.", ["Dr. Smith met Mr. Kim at 3 p.m. ", "Then they left."]),
+        ("See e.g. Fig. 3 for details. It is clear.", ["See e.g. Fig. 3 for details. ", "It is clear."]),
+        ("J. K. Rowling wrote it. Read it.", ["J. K. Rowling wrote it. ", "Read it."]),
+        ("Pi is 3.14 and v1.2.3 is out. Next one.", ["Pi is 3.14 and v1.2.3 is out. ", "Next one."]),
+        (
+            "Go to https://example.com/a.b?c=d. Then mail me@example.co.kr. Done.",
+            ["Go to https://example.com/a.b?c=d. ", "Then mail me@example.co.kr. ", "Done."],
+        ),
+        ('He asked "why?" Then he left.', ['He asked "why?" ', "Then he left."]),
+        ("What? he said. Ok.", ["What? he said. ", "Ok."]),
+        ("첫 문장입니다。두 번째！세 번째", ["첫 문장입니다。", "두 번째！", "세 번째"]),
+        ("line one\nline two\n\nline three", ["line one\n", "line two\n\n", "line three"]),
+        ("No boundary here", ["No boundary here"]),
+        ("", []),
+    ],
+)
+def test_split_sentences(text, expected):
+    sentences = split_sentences(text)
+    assert sentences == expected
+    assert "".join(sentences) == text
+
+
+def test_split_sentences_does_not_split_inside_markup():
+    text = '<a title="Done. Really.">link</a> text. Next.'
+    assert split_sentences(text) == ['<a title="Done. Really.">link</a> text. ', "Next."]
+
+
+def test_pack_segments_keeps_order_and_size():
+    sentences = split_sentences(" ".join(f"Sentence number {i} is here." for i in range(50)))
+    chunks = pack_segments(sentences, max_chars=100)
+    assert "".join(chunks) == "".join(sentences)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    # 다음 chunk의 첫 문장까지 넣으면 max_chars를 넘어야 함(최대한 채워서 묶음)
+    for chunk, next_chunk in zip(chunks, chunks[1:]):
+        assert len(chunk) + len(split_sentences(next_chunk)[0]) > 100
+
+
+def test_pack_segments_splits_a_long_sentence_at_spaces():
+    words = ["word"] * 30
+    chunks = pack_segments([" ".join(words)], max_chars=22)
+    assert "".join(chunks) == " ".join(words)
+    assert all(len(chunk) <= 22 for chunk in chunks)
+    assert all(chunk.startswith("word") for chunk in chunks)
+
+
+def test_pack_segments_cuts_a_long_word_at_max_chars():
+    assert pack_segments(["a" * 25], max_chars=10) == ["a" * 10, "a" * 10, "a" * 5]
+
+
+def test_split_trailing_space():
+    assert split_trailing_space("Hello. \n") == ("Hello.", " \n")
+    assert split_trailing_space("  ") == ("", "  ")
@@ -0,0 +1,88 @@
+import asyncio
+
+from src.translate.singleflight import SingleFlight, SingleFlightConfig
+
+
+def make_func(calls: list, release: asyncio.Event, result="done"):
+    async def func():
+        calls.append(1)
+        await release.wait()
+        return result
+
+    return func
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flights, calls, release = SingleFlight(SingleFlightConfig()), [], asyncio.Event()
+        tasks = [asyncio.create_task(flights.do("key", make_func(calls, release))) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks), calls, flights.stats()
+
+    results, calls, stats = asyncio.run(main())
+    assert results == ["done"] * 3
+    assert len(calls) == 1
+    assert (stats["leaders"], stats["coalesced"], stats["in_flight"]) == (1, 2, 0)
+
+
+def test_cancelling_one_waiter_keeps_the_shared_execution():
+    async def main():
+        flights, calls, release = SingleFlight(SingleFlightConfig()), [], asyncio.Event()
+        leader = asyncio.create_task(flights.do("key", make_func(calls, release)))
+        follower = asyncio.create_task(flights.do("key", make_func(calls, release)))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leader, await follower, calls, flights.stats()
+
+    leader, result, calls, stats = asyncio.run(main())
+    assert leader.cancelled()
+    assert result == "done"
+    assert len(calls) == 1
+    assert stats["cancelled"] == 0
+
+
+def test_cancelling_all_waiters_cancels_the_execution_and_forgets_the_key():
+    async def main():
+        flights, calls, release = SingleFlight(SingleFlightConfig()), [], asyncio.Event()
+        waiters = [asyncio.create_task(flights.do("key", make_func(calls, release))) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert flights.stats()["in_flight"] == 0
+
+        # 취소 중인 실행에 붙지 않고 새로 실행함
+        release.set()
+        result = await flights.do("key", make_func(calls, release, "again"))
+        return result, calls, flights.stats()
+
+    result, calls, stats = asyncio.run(main())
+    assert result == "again"
+    assert len(calls) == 2
+    assert (stats["leaders"], stats["cancelled"]) == (2, 1)
+
+
+def test_exception_is_raised_to_every_waiter():
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("upstream")
+
+    async def main():
+        flights = SingleFlight(SingleFlightConfig())
+        return await asyncio.gather(*(flights.do("key", fail) for _ in range(2)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_disabled_runs_every_call():
+    async def main():
+        flights, calls, release = SingleFlight(SingleFlightConfig(enabled=False)), [], asyncio.Event()
+        release.set()
+        await asyncio.gather(*(flights.do("key", make_func(calls, release)) for _ in range(3)))
+        return calls
+
+    assert len(asyncio.run(main())) == 3
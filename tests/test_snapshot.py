@@ -0,0 +1,71 @@
+import pytest
+
+from src.translate import snapshot as snapshot_module
+from src.translate.snapshot import DataSnapshot, SnapshotConfig, fingerprint, write_snapshot
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch) -> SnapshotConfig:
+    data_dir = tmp_path / "data"
+    (data_dir / "term_set").mkdir(parents=True)
+    (data_dir / "term_set" / "terms.txt").write_text("BLEU\n", encoding="utf-8")
+    sections = {"term_sets": {"terms.txt": ["BLEU"]}, "numbers": [1, 2, 3]}
+    monkeypatch.setattr(snapshot_module, "build_snapshot", lambda config: sections)
+    config = SnapshotConfig(path=str(data_dir / "snapshot.pickle"), data_dir=str(data_dir))
+    write_snapshot(config)
+    return config
+
+
+def test_sections_are_read_on_first_get(config):
+    snapshot = DataSnapshot(config)
+    assert snapshot.stats()["status"] == "not loaded"
+    assert snapshot.get("numbers") == [1, 2, 3]
+    assert snapshot.stats()["status"] == "loaded"
+    assert snapshot.stats()["sections"] == ["numbers", "term_sets"]
+    assert snapshot.get("term_sets") == {"terms.txt": ["BLEU"]}
+
+
+def test_unknown_section_does_not_close_the_file(config):
+    snapshot = DataSnapshot(config)
+    assert snapshot.get("unknown") is None
+    assert snapshot.get("numbers") == [1, 2, 3]
+    assert snapshot.get("term_sets") == {"terms.txt": ["BLEU"]}
+
+
+def test_snapshot_is_ignored_when_data_files_change(config, tmp_path):
+    data_dir = tmp_path / "data"
+    before = fingerprint(data_dir, exclude=data_dir / "snapshot.pickle")
+    (data_dir / "term_set" / "terms.txt").write_text("BLEU\nKeras\n", encoding="utf-8")
+    assert fingerprint(data_dir, exclude=data_dir / "snapshot.pickle") != before
+
+    snapshot = DataSnapshot(config)
+    assert snapshot.get("numbers") is None
+    assert snapshot.status == "stale"
+
+    # 새 파일이 추가되거나 파일 이름이 바뀌어도 다시 만들어야 함
+    write_snapshot(config)
+    assert DataSnapshot(config).get("numbers") == [1, 2, 3]
+    (data_dir / "term_set" / "terms.txt").rename(data_dir / "term_set" / "renamed.txt")
+    assert DataSnapshot(config).get("numbers") is None
+
+
+def test_snapshot_is_ignored_when_format_changes_or_file_is_broken(config, monkeypatch):
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_FORMAT", snapshot_module.SNAPSHOT_FORMAT + 1)
+    snapshot = DataSnapshot(config)
+    assert snapshot.get("numbers") is None
+    assert snapshot.status == "outdated format"
+
+    with open(config.path, "wb") as file:
+        file.write(b"broken")
+    snapshot = DataSnapshot(config)
+    assert snapshot.get("numbers") is None
+    assert snapshot.status == "invalid"
+
+
+def test_missing_or_disabled_snapshot(tmp_path):
+    snapshot = DataSnapshot(SnapshotConfig(path=str(tmp_path / "missing.pickle"), data_dir=str(tmp_path)))
+    assert snapshot.get("numbers") is None
+    assert snapshot.status == "missing"
+    snapshot = DataSnapshot(SnapshotConfig(enabled=False))
+    assert snapshot.get("numbers") is None
+    assert snapshot.status == "disabled"
@@ -0,0 +1,36 @@
+import asyncio
+import sqlite3
+import time
+
+from src.translate.cache import CacheKey
+from src.translate.store import StoreConfig, TranslationMemory, TranslationStore, hash_key
+
+
+def test_stop_keeps_rows_of_a_cancelled_flush(tmp_path):
+    """stop()이 진행 중인 flush를 취소해도 그 flush가 꺼내간 항목은 마지막 flush에서 기록됨"""
+    path = str(tmp_path / "translation_memory.sqlite3")
+    key = CacheKey("Papago", "en", "ko", "Hello")
+
+    async def main():
+        store = TranslationStore(StoreConfig(path=path, flush_interval=60.0))
+        await store.start()
+        write_batch = store.memory.write_batch
+        calls = []
+
+        def slow_failing_first_write(rows, touched):
+            calls.append(len(rows))
+            if len(calls) == 1:  # 취소된 뒤에 끝나는 write. 기록되지 않음
+                time.sleep(0.2)
+                raise sqlite3.OperationalError("database is locked")
+            write_batch(rows, touched)
+
+        store.memory.write_batch = slow_failing_first_write
+        store.put(key, "안녕하세요")
+        store._flush_event.set()
+        await asyncio.sleep(0.05)
+        await store.stop()
+        return calls
+
+    calls = asyncio.run(main())
+    assert calls == [1, 1]
+    assert TranslationMemory(path).get(hash_key(key)) == "안녕하세요"
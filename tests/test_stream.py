@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+import orjson
+
+from src.translate import stream
+
+USER_OPTION = {
+    "main_tgt_lang": "ko",
+    "sub_tgt_lang": "en",
+    "translator_client_info": {"translator_type": "papago", "api_key": "stream-key", "secret_key": "secret"},
+}
+SRC_TEXT = "The first sentence is here. The second one follows it.\nA third sentence ends the text."
+
+
+def post_stream(app, src_text: str = SRC_TEXT, query: str = "", headers: dict = None) -> httpx.Response:
+    async def main():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            body = {"translate_request": {"src_text": src_text}, "user_option": USER_OPTION}
+            return await client.post(f"/translate/stream{query}", json=body, headers=headers)
+
+    return asyncio.run(main())
+
+
+def test_ndjson_events_start_with_start_and_end_with_end(api, upstream_clients, monkeypatch):
+    monkeypatch.setattr(stream.stream_config, "segment_chars", 30)
+    response = post_stream(api)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [orjson.loads(line) for line in response.text.splitlines()]
+
+    start, *segments, end = events
+    assert start == {"type": "start", "n_segments": 4, "src_lang": "en", "tgt_lang": "ko"}
+    assert end == {"type": "end", "n_segments": 4, "n_failed": 0, "status_msg": None}
+    assert {event["type"] for event in segments} == {"segment"}
+    assert sorted(event["index"] for event in segments) == [0, 1, 2, 3]
+    # index 순서대로 이어붙이면 전체 번역문
+    assert "".join(event["text"] for event in sorted(segments, key=lambda event: event["index"])) == SRC_TEXT.upper()
+    assert len(upstream_clients["Papago"].requests) == 4
+
+
+def test_sse_by_accept_header_and_failed_segments_fall_back(api, upstream_clients, monkeypatch):
+    monkeypatch.setattr(stream.stream_config, "segment_chars", 30)
+    upstream_clients["Papago"].status_code = 500
+    response = post_stream(api, headers={"accept": "text/event-stream"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    messages = response.text.strip().split("\n\n")
+    assert messages[0].startswith("event: start\ndata: ") and messages[-1].startswith("event: end\ndata: ")
+    segments = [orjson.loads(message.split("data: ", 1)[1]) for message in messages[1:-1]]
+    assert {(event["status"], event["translator_type"]) for event in segments} == {("fallback", "google")}
+    assert orjson.loads(messages[-1].split("data: ", 1)[1])["n_failed"] == 0
+
+    upstream_clients["Google"].status_code = 500
+    end = orjson.loads(
+        post_stream(api, "Nothing is translated. Both backends fail.", "?format=ndjson").text.splitlines()[-1]
+    )
+    assert (end["n_segments"], end["n_failed"]) == (2, 2)
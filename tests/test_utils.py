@@ -0,0 +1,51 @@
+from collections import Counter
+
+from src.translate.utils import SCRIPT_RANGES, count_scripts, isKoreanIncluded, script_of
+
+SAMPLES = [
+    "Hello, world! 123",
+    "안녕하세요. Hello 世界",
+    "こんにちは、カタカナ。漢字",
+    "Привет, мир! Γειά σου",
+    "مرحبا بالعالم שלום",
+    "Café déjà vu 😀 \U00020000",
+    "",
+]
+
+
+def count_scripts_by_ranges(text: str) -> Counter:
+    counts = Counter()
+    for char in text:
+        for start, end, script in SCRIPT_RANGES:
+            if start <= ord(char) <= end:
+                counts[script] += 1
+                break
+    return counts
+
+
+def test_count_scripts_matches_range_lookup():
+    for text in SAMPLES:
+        assert count_scripts(text) == count_scripts_by_ranges(text), text
+    assert count_scripts("안녕하세요. Hello", max_chars=5) == Counter({"Hangul": 5})
+
+
+def test_script_of():
+    assert [script_of(char) for char in "aé가あア漢Жא1 😀"] == [
+        "Latin",
+        "Latin",
+        "Hangul",
+        "Hiragana",
+        "Katakana",
+        "Han",
+        "Cyrillic",
+        "Hebrew",
+        None,
+        None,
+        None,
+    ]
+
+
+def test_is_korean_included():
+    assert isKoreanIncluded("Spot 번역기")
+    assert isKoreanIncluded("ㅋㅋ")
+    assert not isKoreanIncluded("Spot translator 日本語")
@@ -0,0 +1,81 @@
+import asyncio
+
+from src.translate.session import WebSocketSession
+
+USER_OPTION = {
+    "main_tgt_lang": "ko",
+    "sub_tgt_lang": "en",
+    "translator_client_info": {"translator_type": "papago", "api_key": "ws-key", "secret_key": "secret"},
+}
+
+
+class FakeWebSocket:
+    """WebSocketSession이 보낸 message를 받는 client 쪽"""
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.session = WebSocketSession(self.messages.put)
+
+    async def request(self, message: dict) -> dict:
+        await self.session.handle(message)
+        return await asyncio.wait_for(self.messages.get(), timeout=1.0)
+
+
+def test_translate_results_and_validation_errors(api):
+    async def main():
+        ws = FakeWebSocket()
+        assert await ws.request({"type": "translate", "id": 1, "src_text": "Hello."}) == {
+            "type": "error",
+            "id": 1,
+            "msg": "Send 'auth' message first",
+        }
+        assert await ws.request({"type": "auth", "user_option": USER_OPTION}) == {
+            "type": "ready",
+            "translator_type": "papago",
+        }
+        assert (await ws.request({"type": "auth", "user_option": {}}))["msg"].startswith("Invalid user_option")
+        assert (await ws.request({"type": "translate", "src_text": "Hello."}))["msg"] == (
+            "'id' and 'src_text' are required"
+        )
+        assert (await ws.request({"type": "translate", "id": True, "src_text": "Hello."}))["msg"] == (
+            "'id' must be a string or an integer"
+        )
+        assert (await ws.request({"type": "translate", "id": 2, "src_text": 3}))["msg"] == (
+            "'src_text', 'tgt_lang' must be strings"
+        )
+        assert await ws.request({"type": "ping"}) == {"type": "pong"}
+        assert await ws.request({"type": "unknown"}) == {"type": "error", "msg": "Unknown message type: unknown"}
+        return await ws.request({"type": "translate", "id": "a", "src_text": "Hello."})
+
+    result = asyncio.run(main())
+    assert (result["type"], result["id"], result["text"], result["status_code"]) == ("result", "a", "HELLO.", 200)
+
+
+def test_cancel_is_acknowledged(api, upstream_clients):
+    upstream_clients["Papago"].delay = 0.5
+
+    async def main():
+        ws = FakeWebSocket()
+        await ws.request({"type": "auth", "user_option": USER_OPTION})
+        await ws.session.handle({"type": "translate", "id": 7, "src_text": "Slow text."})
+        await asyncio.sleep(0.01)
+        assert await ws.request({"type": "cancel", "id": 7}) == {"type": "cancelled", "id": 7}
+        assert await ws.request({"type": "cancel", "id": 7}) == {
+            "type": "error",
+            "id": 7,
+            "msg": "Unknown or finished request id",
+        }
+        assert await ws.request({"type": "cancel", "id": [7]}) == {
+            "type": "error",
+            "id": None,
+            "msg": "'id' must be a string or an integer",
+        }
+
+        # 취소한 id는 바로 다시 사용할 수 있음
+        upstream_clients["Papago"].delay = 0.0
+        result = await ws.request({"type": "translate", "id": 7, "src_text": "Fast text."})
+        assert ws.messages.empty()
+        return result
+
+    result = asyncio.run(main())
+    assert (result["type"], result["id"], result["text"]) == ("result", 7, "FAST TEXT.")